@@ -1,5 +1,6 @@
 from typing import Dict, Optional
 from datetime import datetime
+import asyncio
 import logging
 from pathlib import Path
 
@@ -27,6 +28,7 @@ class JupziBot:
         self.services: Dict[str, object] = {}
         self._is_running = False
         self._start_time: Optional[datetime] = None
+        self._expiry_task: Optional[asyncio.Task] = None
 
     def initialize_services(self) -> None:
         """Initialize all required services for the bot."""
@@ -40,11 +42,43 @@ class JupziBot:
             self.services['telegram'] = TelegramService(self.config)
             self.services['poll'] = PollService(self.config)
             
+            # Answers to native polls are recorded by the poll service
+            self.services['telegram'].set_poll_service(self.services['poll'])
+            
             logger.info("All services initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize services: {str(e)}")
             raise
 
+    def schedule_jobs(self) -> None:
+        """
+        Schedule the recurring jobs that drive the services.
+        
+        Raises:
+            RuntimeError: If called outside of the bot's event loop
+        """
+        from app.core.scheduler.jobs import CalendarSyncJob, PollExpiryJob
+
+        # The jobs drive the Telegram bot, which lives on this loop
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            raise RuntimeError("Jobs must be scheduled from the bot's event loop") from None
+        self.scheduler.set_event_loop(loop)
+
+        # The job reschedules itself with the interval the poll suggests
+        calendar_sync = CalendarSyncJob(self.services['calendar'], self.scheduler)
+        self.scheduler.add_interval_job(
+            calendar_sync.job_id,
+            calendar_sync.execute,
+            self.services['calendar'].get_poll_interval()
+        )
+        
+        # Polls are closed at their deadline by a task on the loop
+        poll_expiry = PollExpiryJob(self.services['poll'], self.services['telegram'])
+        self._expiry_task = loop.create_task(poll_expiry.run())
+        logger.info("Jobs scheduled")
+
     def start(self) -> None:
         """Start the bot and all its components."""
         try:
@@ -58,6 +92,7 @@ class JupziBot:
             # Initialize and start services
             self.initialize_services()
             self.scheduler.start()
+            self.schedule_jobs()
             
             logger.info("JupziBot started successfully")
         except Exception as e:
@@ -71,8 +106,15 @@ class JupziBot:
             logger.info("Stopping JupziBot...")
             self._is_running = False
             
+            if self._expiry_task is not None:
+                self._expiry_task.cancel()
+                self._expiry_task = None
+            
             # Stop scheduler and save state
             self.scheduler.stop()
+            if 'poll' in self.services:
+                # Writes the votes still buffered in memory
+                self.services['poll'].cleanup()
             self.state_manager.save_state()
             
             logger.info("JupziBot stopped successfully")
@@ -0,0 +1,145 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urljoin
+import logging
+
+import httpx
+
+from app.core.calendar.dav_xml import DavResource, MultistatusParser, calendar_query, free_busy_query
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.freebusy import BusyPeriod, parse_busy_periods
+from app.core.calendar.recurrence import expand_resource
+
+logger = logging.getLogger(__name__)
+
+class AsyncCalDAVClient:
+    """
+    Non-blocking CalDAV client for a single calendar.
+
+    REPORT queries go through httpx and the multistatus response is parsed
+    while it streams in, so calendar I/O never blocks the event loop.
+    """
+    def __init__(
+        self,
+        calendar_url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 30.0,
+        max_connections: int = 4,
+        keepalive_expiry: float = 600.0
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            calendar_url: URL of the calendar collection
+            username: CalDAV username
+            password: CalDAV password
+            timeout: Request timeout in seconds
+            max_connections: Maximum number of pooled HTTP connections
+            keepalive_expiry: Seconds an idle keep-alive connection is kept
+        """
+        self.calendar_url = calendar_url
+        auth = httpx.BasicAuth(username, password) if username else None
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._client = httpx.AsyncClient(auth=auth, timeout=timeout, limits=limits)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connections."""
+        await self._client.aclose()
+
+    async def report(self, body: bytes, depth: str = '1') -> AsyncIterator[DavResource]:
+        """
+        Issue a REPORT request and stream the resources of the response.
+
+        Args:
+            body: XML request body
+            depth: Value of the Depth header
+
+        Yields:
+            DavResource: Each response element as soon as it is parsed
+        """
+        parser = MultistatusParser()
+        headers = {'Content-Type': 'application/xml; charset=utf-8', 'Depth': depth}
+
+        async with self._client.stream('REPORT', self.calendar_url, content=body, headers=headers) as response:
+            if response.status_code != 207:
+                await response.aread()
+                raise httpx.HTTPStatusError(
+                    f"REPORT failed with status {response.status_code}",
+                    request=response.request,
+                    response=response
+                )
+            async for chunk in response.aiter_bytes():
+                for resource in parser.feed(chunk):
+                    yield resource._replace(href=urljoin(self.calendar_url, resource.href))
+        for resource in parser.close():
+            yield resource._replace(href=urljoin(self.calendar_url, resource.href))
+
+    async def search(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """
+        Get all event occurrences in a time period.
+
+        Recurring events are expanded locally, like in the calendar mirror.
+
+        Args:
+            start: Start of the period
+            end: End of the period
+
+        Returns:
+            List of event records, one per occurrence
+        """
+        return [event async for event in self.iter_search(start, end)]
+
+    async def iter_search(self, start: datetime, end: datetime) -> AsyncIterator[EventRecord]:
+        """
+        Stream all event occurrences in a time period.
+
+        Every resource is expanded as soon as it is parsed from the
+        response, so memory use does not depend on the size of the period.
+
+        Args:
+            start: Start of the period
+            end: End of the period
+
+        Yields:
+            EventRecord: One record per occurrence, in no particular order
+        """
+        async for resource in self.report(calendar_query(start, end)):
+            if resource.status >= 300 or not resource.calendar_data:
+                continue
+            try:
+                for event in expand_resource(resource.calendar_data, start, end, resource.etag):
+                    yield event
+            except Exception as e:
+                logger.error(f"Error expanding event {resource.href}: {e}")
+
+    async def free_busy(self, start: datetime, end: datetime) -> List[BusyPeriod]:
+        """
+        Get the busy periods in a time period with a free-busy-query REPORT.
+
+        Args:
+            start: Start of the period, its timezone is used as local timezone
+            end: End of the period
+
+        Returns:
+            List of (start, end) tuples as local datetimes
+
+        Raises:
+            httpx.HTTPStatusError: If the server does not answer with free-busy data
+        """
+        headers = {'Content-Type': 'application/xml; charset=utf-8', 'Depth': '1'}
+        response = await self._client.request(
+            'REPORT', self.calendar_url, content=free_busy_query(start, end), headers=headers
+        )
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(
+                f"free-busy-query failed with status {response.status_code}",
+                request=response.request,
+                response=response
+            )
+        return parse_busy_periods(response.text, start.tzinfo)
@@ -0,0 +1,241 @@
+from typing import Callable, Dict, Optional, Tuple
+import hashlib
+import logging
+import threading
+import time
+
+import caldav
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, Optional[str]]
+
+class _PooledClient:
+    """A DAV client together with its bookkeeping."""
+    __slots__ = ('client', 'secret', 'last_used', 'last_checked', 'checkouts', 'retired')
+
+    def __init__(self, client: caldav.DAVClient, secret: str, now: float):
+        self.client = client
+        self.secret = secret
+        self.last_used = now
+        self.last_checked = now
+        self.checkouts = 0
+        self.retired = False
+
+class DAVClientPool:
+    """
+    Pool of persistent DAV clients keyed by (url, username).
+
+    Each client keeps its HTTP session, so TLS handshakes and
+    authentication happen once per server instead of once per fetch.
+    Clients are checked out with get_client and handed back with
+    release_client. Clients idle for longer than idle_timeout since
+    their last release are closed, and a client that has been idle for
+    health_check_interval is probed with an OPTIONS request before it is
+    handed out again. Checked-out clients are never closed under their
+    user; the probe runs outside the pool lock, so a slow server does not
+    hold up checkouts of other clients.
+    """
+    def __init__(
+        self,
+        max_connections: int = 4,
+        idle_timeout: float = 600.0,
+        health_check_interval: float = 60.0,
+        factory: Callable[..., caldav.DAVClient] = caldav.DAVClient,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_connections: Maximum number of HTTP connections per client
+            idle_timeout: Seconds after which an unused client is closed
+            health_check_interval: Seconds of inactivity after which a client
+                is checked before reuse
+            factory: Creates a new DAV client
+            clock: Monotonic time source
+        """
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._factory = factory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._clients: Dict[PoolKey, _PooledClient] = {}
+        self._entries: Dict[int, _PooledClient] = {}
+        self._stats = {'created': 0, 'reused': 0, 'evicted': 0, 'unhealthy': 0}
+
+    def get_client(self, url: str, username: Optional[str], password: Optional[str]) -> caldav.DAVClient:
+        """
+        Check out a pooled client for a server, creating it if needed.
+
+        Args:
+            url: Server URL
+            username: CalDAV username
+            password: CalDAV password
+
+        Returns:
+            caldav.DAVClient: A client with a persistent session, to be
+            handed back with release_client
+        """
+        key = (url, username)
+        secret = hashlib.sha256((password or '').encode('utf-8')).hexdigest()
+
+        with self._lock:
+            now = self._clock()
+            self._evict_idle(now)
+
+            entry = self._clients.get(key)
+            if entry is not None and entry.secret != secret:
+                self._discard(self._clients.pop(key))
+                entry = None
+
+            probe = False
+            if entry is None:
+                entry = _PooledClient(self._create(url, username, password), secret, now)
+                self._clients[key] = entry
+                self._entries[id(entry.client)] = entry
+                self._stats['created'] += 1
+            else:
+                probe = not entry.checkouts and now - entry.last_used >= self.health_check_interval
+                if not probe:
+                    self._stats['reused'] += 1
+            # Checked out before the probe, so eviction leaves it alone
+            entry.checkouts += 1
+
+        if not probe:
+            return entry.client
+
+        healthy = self._is_healthy(entry.client, url)
+        with self._lock:
+            if healthy:
+                entry.last_checked = self._clock()
+                self._stats['reused'] += 1
+                return entry.client
+            self._stats['unhealthy'] += 1
+            entry.checkouts -= 1
+            if self._clients.get(key) is entry:
+                del self._clients[key]
+            self._discard(entry)
+        return self.get_client(url, username, password)
+
+    def release_client(self, client: caldav.DAVClient) -> None:
+        """
+        Hand a checked-out client back to the pool.
+
+        Its idle time starts now; a client replaced while it was checked
+        out is closed once its last user has released it.
+
+        Args:
+            client: A client returned by get_client
+        """
+        with self._lock:
+            entry = self._entries.get(id(client))
+            if entry is None or not entry.checkouts:
+                return
+            entry.checkouts -= 1
+            entry.last_used = self._clock()
+            if entry.retired and not entry.checkouts:
+                self._discard(entry)
+
+    def evict_idle(self) -> int:
+        """
+        Close all clients that have been idle for too long.
+
+        Returns:
+            Number of closed clients
+        """
+        with self._lock:
+            return self._evict_idle(self._clock())
+
+    def close_all(self) -> None:
+        """Close every pooled client."""
+        with self._lock:
+            for entry in self._entries.values():
+                self._close(entry)
+            self._clients.clear()
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get counts of created, reused, evicted and unhealthy clients."""
+        with self._lock:
+            return dict(self._stats, clients=len(self._clients))
+
+    def _create(self, url: str, username: Optional[str], password: Optional[str]) -> caldav.DAVClient:
+        """Create a client and bound its connection pool."""
+        client = self._factory(url=url, username=username, password=password)
+        session = getattr(client, 'session', None)
+        if session is not None:
+            try:
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.max_connections,
+                    pool_block=True
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+            except Exception as e:
+                # Sessions of other HTTP libraries manage their own pools
+                logger.debug(f"Could not limit DAV connection pool: {e}")
+        return client
+
+    def _evict_idle(self, now: float) -> int:
+        idle = [
+            key for key, entry in self._clients.items()
+            if not entry.checkouts and now - entry.last_used >= self.idle_timeout
+        ]
+        for key in idle:
+            self._discard(self._clients.pop(key))
+        self._stats['evicted'] += len(idle)
+        return len(idle)
+
+    @staticmethod
+    def _is_healthy(client: caldav.DAVClient, url: str) -> bool:
+        try:
+            response = client.options(url)
+            return response.status < 500
+        except Exception as e:
+            logger.warning(f"DAV health check failed for {url}: {e}")
+            return False
+
+    def _discard(self, entry: _PooledClient) -> None:
+        """Close a client dropped from the pool, or once its users are done with it."""
+        if entry.checkouts:
+            entry.retired = True
+            return
+        self._entries.pop(id(entry.client), None)
+        self._close(entry)
+
+    @staticmethod
+    def _close(entry: _PooledClient) -> None:
+        try:
+            entry.client.close()
+        except Exception as e:
+            logger.debug(f"Error closing DAV client: {e}")
+
+# Shared pool used by all services and jobs
+_pool = DAVClientPool()
+
+def get_dav_pool() -> DAVClientPool:
+    """
+    Get the shared DAV client pool.
+
+    Returns:
+        DAVClientPool: The process-wide pool
+    """
+    return _pool
+
+def configure_dav_pool(max_connections: int, idle_timeout: float, health_check_interval: float) -> None:
+    """
+    Configure the shared DAV client pool.
+
+    Args:
+        max_connections: Maximum number of HTTP connections per client
+        idle_timeout: Seconds after which an unused client is closed
+        health_check_interval: Seconds of inactivity after which a client
+            is checked before reuse
+    """
+    _pool.max_connections = max_connections
+    _pool.idle_timeout = idle_timeout
+    _pool.health_check_interval = health_check_interval
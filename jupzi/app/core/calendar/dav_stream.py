@@ -0,0 +1,91 @@
+from typing import Iterator, Optional
+from urllib.parse import urljoin
+import logging
+
+import caldav
+from caldav.lib.error import PropfindError, ReportError
+
+from app.core.calendar.dav_xml import DavResource, MultistatusParser
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+def stream_multistatus(
+    client: caldav.DAVClient,
+    method: str,
+    url: str,
+    body: bytes,
+    depth: Optional[str] = '1',
+    parser: Optional[MultistatusParser] = None
+) -> Iterator[DavResource]:
+    """
+    Issue a WebDAV request through a DAV client's session and stream the
+    multistatus response.
+
+    The response body is read in chunks and fed to an incremental parser,
+    so no XML tree or object list is built for the whole multistatus and
+    memory use stays flat regardless of the number of resources.
+
+    Args:
+        client: DAV client whose HTTP session and credentials are used
+        method: REPORT or PROPFIND
+        url: URL of the calendar collection
+        body: XML request body
+        depth: Value of the Depth header, None to leave it out
+        parser: Parser to use, pass one to read its sync_token afterwards
+
+    Yields:
+        DavResource: Each response element as soon as it is parsed
+
+    Raises:
+        ReportError: If the server does not answer a REPORT with a multistatus
+        PropfindError: If the server does not answer a PROPFIND with a multistatus
+    """
+    parser = parser or MultistatusParser()
+    headers = dict(client.headers)
+    headers['Content-Type'] = 'application/xml; charset=utf-8'
+    if depth is not None:
+        headers['Depth'] = depth
+    auth = client.auth or ((client.username, client.password) if client.username else None)
+
+    response = client.session.request(
+        method,
+        url,
+        data=body,
+        headers=headers,
+        auth=auth,
+        timeout=client.timeout,
+        verify=client.ssl_verify_cert,
+        stream=True
+    )
+    try:
+        if response.status_code != 207:
+            error = PropfindError if method == 'PROPFIND' else ReportError
+            raise error(url, f"{method} failed with status {response.status_code}")
+        for chunk in response.iter_content(CHUNK_SIZE):
+            for resource in parser.feed(chunk):
+                yield resource._replace(href=urljoin(url, resource.href))
+        for resource in parser.close():
+            yield resource._replace(href=urljoin(url, resource.href))
+    finally:
+        response.close()
+
+def stream_report(
+    client: caldav.DAVClient,
+    url: str,
+    body: bytes,
+    depth: Optional[str] = '1',
+    parser: Optional[MultistatusParser] = None
+) -> Iterator[DavResource]:
+    """Issue a REPORT and stream its response, see stream_multistatus."""
+    return stream_multistatus(client, 'REPORT', url, body, depth, parser)
+
+def stream_propfind(
+    client: caldav.DAVClient,
+    url: str,
+    body: bytes,
+    depth: Optional[str] = '1'
+) -> Iterator[DavResource]:
+    """Issue a PROPFIND and stream its response, see stream_multistatus."""
+    return stream_multistatus(client, 'PROPFIND', url, body, depth)
@@ -0,0 +1,203 @@
+"""
+WebDAV/CalDAV request bodies and incremental multistatus parsing.
+"""
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, NamedTuple, Optional
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+DAV_NS = "DAV:"
+CALDAV_NS = "urn:ietf:params:xml:ns:caldav"
+
+RESPONSE = f"{{{DAV_NS}}}response"
+HREF = f"{{{DAV_NS}}}href"
+STATUS = f"{{{DAV_NS}}}status"
+PROPSTAT = f"{{{DAV_NS}}}propstat"
+GETETAG = f"{{{DAV_NS}}}getetag"
+SYNC_TOKEN = f"{{{DAV_NS}}}sync-token"
+CALENDAR_DATA = f"{{{CALDAV_NS}}}calendar-data"
+
+class DavResource(NamedTuple):
+    """One <response> element of a multistatus document."""
+    href: str
+    etag: Optional[str]
+    calendar_data: Optional[str]
+    status: int
+
+def format_utc(dt: datetime) -> str:
+    """
+    Format a datetime as a CalDAV UTC timestamp.
+
+    Args:
+        dt: Datetime to format, naive datetimes are taken as UTC
+
+    Returns:
+        str: Timestamp like 20261019T000000Z
+    """
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime('%Y%m%dT%H%M%SZ')
+
+def calendar_query(start: datetime, end: datetime, calendar_data: bool = True) -> bytes:
+    """
+    Build a calendar-query REPORT body for all events overlapping a period.
+
+    Args:
+        start: Start of the period
+        end: End of the period
+        calendar_data: Whether to request the event bodies or only etags
+
+    Returns:
+        bytes: The XML request body
+    """
+    data = '<C:calendar-data/>' if calendar_data else ''
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<C:calendar-query xmlns:D="{DAV_NS}" xmlns:C="{CALDAV_NS}">'
+        f'<D:prop><D:getetag/>{data}</D:prop>'
+        '<C:filter><C:comp-filter name="VCALENDAR"><C:comp-filter name="VEVENT">'
+        f'<C:time-range start="{format_utc(start)}" end="{format_utc(end)}"/>'
+        '</C:comp-filter></C:comp-filter></C:filter>'
+        '</C:calendar-query>'
+    ).encode('utf-8')
+
+def sync_collection(sync_token: Optional[str], calendar_data: bool = True) -> bytes:
+    """
+    Build a sync-collection REPORT body (RFC 6578).
+
+    Args:
+        sync_token: Token of the last sync, None for a full listing
+        calendar_data: Whether to request the bodies of changed resources
+
+    Returns:
+        bytes: The XML request body
+    """
+    data = '<C:calendar-data/>' if calendar_data else ''
+    token = escape(sync_token) if sync_token else ''
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<D:sync-collection xmlns:D="{DAV_NS}" xmlns:C="{CALDAV_NS}">'
+        f'<D:sync-token>{token}</D:sync-token>'
+        '<D:sync-level>1</D:sync-level>'
+        f'<D:prop><D:getetag/>{data}</D:prop>'
+        '</D:sync-collection>'
+    ).encode('utf-8')
+
+def propfind_etags() -> bytes:
+    """
+    Build a PROPFIND body listing the etag of every member of a collection.
+
+    Returns:
+        bytes: The XML request body
+    """
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<D:propfind xmlns:D="{DAV_NS}"><D:prop><D:getetag/></D:prop></D:propfind>'
+    ).encode('utf-8')
+
+def calendar_multiget(hrefs: Iterable[str]) -> bytes:
+    """
+    Build a calendar-multiget REPORT body fetching several resources at once.
+
+    Args:
+        hrefs: URLs or paths of the resources
+
+    Returns:
+        bytes: The XML request body
+    """
+    elements = ''.join(f'<D:href>{escape(urlsplit(href).path)}</D:href>' for href in hrefs)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<C:calendar-multiget xmlns:D="{DAV_NS}" xmlns:C="{CALDAV_NS}">'
+        f'<D:prop><D:getetag/><C:calendar-data/></D:prop>{elements}'
+        '</C:calendar-multiget>'
+    ).encode('utf-8')
+
+def free_busy_query(start: datetime, end: datetime) -> bytes:
+    """
+    Build a free-busy-query REPORT body for a period.
+
+    Args:
+        start: Start of the period
+        end: End of the period
+
+    Returns:
+        bytes: The XML request body
+    """
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<C:free-busy-query xmlns:C="{CALDAV_NS}">'
+        f'<C:time-range start="{format_utc(start)}" end="{format_utc(end)}"/>'
+        '</C:free-busy-query>'
+    ).encode('utf-8')
+
+def _status_code(status_line: Optional[str]) -> Optional[int]:
+    """Extract the code from a status line like 'HTTP/1.1 404 Not Found'."""
+    if not status_line:
+        return None
+    parts = status_line.split()
+    if len(parts) >= 2 and parts[1].isdigit():
+        return int(parts[1])
+    return None
+
+class MultistatusParser:
+    """
+    Incremental parser for multistatus responses.
+
+    Bytes are fed as they arrive from the network and every <response>
+    element is yielded and released as soon as it is complete, so memory
+    use does not grow with the size of the document.
+    """
+    def __init__(self):
+        self._parser = ElementTree.XMLPullParser(events=('end',))
+        self.sync_token: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> Iterator[DavResource]:
+        """
+        Feed a chunk of the response body.
+
+        Args:
+            chunk: Next bytes of the document
+
+        Yields:
+            DavResource: Every response completed by this chunk
+        """
+        self._parser.feed(chunk)
+        yield from self._read_events()
+
+    def close(self) -> Iterator[DavResource]:
+        """
+        Finish parsing.
+
+        Yields:
+            DavResource: Any responses completed at the end of the document
+        """
+        self._parser.close()
+        yield from self._read_events()
+
+    def _read_events(self) -> Iterator[DavResource]:
+        for _, element in self._parser.read_events():
+            if element.tag == RESPONSE:
+                yield self._parse_response(element)
+                element.clear()
+            elif element.tag == SYNC_TOKEN:
+                self.sync_token = (element.text or '').strip()
+
+    def _parse_response(self, element: ElementTree.Element) -> DavResource:
+        href = (element.findtext(HREF) or '').strip()
+        status = _status_code(element.findtext(STATUS))
+        etag = None
+        calendar_data = None
+
+        for propstat in element.iter(PROPSTAT):
+            code = _status_code(propstat.findtext(STATUS))
+            if status is None:
+                status = code
+            if code is not None and code >= 300:
+                continue
+            status = code or status
+            etag = propstat.findtext(f'.//{GETETAG}') or etag
+            calendar_data = propstat.findtext(f'.//{CALENDAR_DATA}') or calendar_data
+
+        return DavResource(href, etag, calendar_data, status or 200)
@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta, tzinfo
+from typing import Optional, Union
+
+import icalendar
+
+from app.core.calendar.timezones import localize
+
+DateOrDateTime = Union[date, datetime]
+
+def _to_local(value: DateOrDateTime, tz: tzinfo) -> DateOrDateTime:
+    """Convert a datetime to the local timezone, dates are left alone."""
+    if not isinstance(value, datetime):
+        return value
+    # Floating times are interpreted as local time
+    return localize(value, tz)
+
+class EventRecord:
+    """
+    Compact, normalized calendar event occurrence.
+
+    Built once per fetched occurrence so formatting, sorting and free-day
+    computation never walk the iCalendar tree or convert timezones again.
+    For all-day events start and end are dates (end exclusive), otherwise
+    they are datetimes in the local timezone. recurrence_id and etag
+    identify the rendered version of an occurrence.
+    """
+    __slots__ = (
+        'uid', 'start', 'end', 'all_day', 'title', 'description', 'smoking_free',
+        'recurrence_id', 'etag'
+    )
+
+    def __init__(
+        self,
+        uid: str,
+        start: DateOrDateTime,
+        end: DateOrDateTime,
+        all_day: bool,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        smoking_free: bool = False,
+        recurrence_id: Optional[DateOrDateTime] = None,
+        etag: Optional[str] = None
+    ):
+        self.uid = uid
+        self.start = start
+        self.end = end
+        self.all_day = all_day
+        self.title = title
+        self.description = description
+        self.smoking_free = smoking_free
+        self.recurrence_id = recurrence_id
+        self.etag = etag
+
+    @classmethod
+    def from_component(cls, component: icalendar.Event, tz: tzinfo, etag: Optional[str] = None) -> 'EventRecord':
+        """
+        Build a record from a single VEVENT occurrence.
+
+        Args:
+            component: The VEVENT component
+            tz: Local timezone
+            etag: Etag of the resource the occurrence belongs to
+
+        Returns:
+            EventRecord: The normalized event
+        """
+        start = component.decoded('DTSTART')
+        all_day = not isinstance(start, datetime)
+
+        if 'DTEND' in component:
+            end = component.decoded('DTEND')
+        elif 'DURATION' in component:
+            end = start + component.decoded('DURATION')
+        else:
+            end = start + timedelta(days=1) if all_day else start
+        if all_day and isinstance(end, datetime):
+            end = end.date()
+
+        title = str(component['SUMMARY']) if 'SUMMARY' in component else None
+        description = str(component['DESCRIPTION']) if 'DESCRIPTION' in component else None
+
+        return cls(
+            uid=str(component.get('UID', '')),
+            start=_to_local(start, tz),
+            end=_to_local(end, tz),
+            all_day=all_day,
+            title=title,
+            description=description,
+            smoking_free=bool(title) and 'rauchfrei' in title.lower(),
+            recurrence_id=component.decoded('RECURRENCE-ID') if 'RECURRENCE-ID' in component else None,
+            etag=etag
+        )
+
+    def __repr__(self):
+        return f"<EventRecord(uid='{self.uid}', start='{self.start}', title='{self.title}')>"
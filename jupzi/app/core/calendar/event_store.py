@@ -0,0 +1,118 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import count
+from operator import attrgetter
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+def event_key(event: Any) -> Hashable:
+    """
+    Key an event by its id, or by the event itself while it has none.
+
+    Events that were not saved yet have no id; keying them by identity
+    keeps them apart instead of letting each replace the last.
+    """
+    return event if event.id is None else event.id
+
+class EventStore:
+    """
+    Indexed in-memory store for calendar events.
+
+    Events are kept in a dict keyed by id for O(1) lookups and in an array
+    sorted by start time, so range queries cost O(log n + k).
+    """
+    def __init__(
+        self,
+        key: Callable[[Any], Hashable] = event_key,
+        start: Callable[[Any], datetime] = attrgetter('start_time')
+    ):
+        """
+        Initialize the event store.
+
+        Args:
+            key: Returns the unique id of an event
+            start: Returns the start time of an event
+        """
+        self._key = key
+        self._start = start
+        self._events: Dict[Hashable, Tuple[Any, Tuple]] = {}
+        # Sorted (start, sequence, id) entries; the sequence keeps the
+        # order total without ever comparing ids or events.
+        self._index: List[Tuple] = []
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __contains__(self, event_id: Hashable) -> bool:
+        return event_id in self._events
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over all events in start time order."""
+        for _, _, event_id in self._index:
+            yield self._events[event_id][0]
+
+    def add(self, event: Any) -> None:
+        """
+        Add an event, replacing any event with the same id.
+
+        Args:
+            event: Event to add
+        """
+        event_id = self._key(event)
+        if event_id in self._events:
+            self.remove(event_id)
+
+        entry = (self._start(event), next(self._sequence), event_id)
+        insort(self._index, entry)
+        self._events[event_id] = (event, entry)
+
+    def remove(self, event_id: Hashable) -> Optional[Any]:
+        """
+        Remove an event by id.
+
+        Args:
+            event_id: ID of the event to remove
+
+        Returns:
+            The removed event, or None if it was not stored
+        """
+        stored = self._events.pop(event_id, None)
+        if stored is None:
+            return None
+
+        event, entry = stored
+        del self._index[bisect_left(self._index, entry)]
+        return event
+
+    def get(self, event_id: Hashable) -> Optional[Any]:
+        """
+        Get an event by id.
+
+        Args:
+            event_id: ID of the event to retrieve
+
+        Returns:
+            The event if found, None otherwise
+        """
+        stored = self._events.get(event_id)
+        return stored[0] if stored else None
+
+    def clear(self) -> None:
+        """Remove all events."""
+        self._events.clear()
+        self._index = []
+
+    def starting_between(self, start: datetime, end: datetime) -> List[Any]:
+        """
+        Get all events starting within a time period.
+
+        Args:
+            start: Start of the period (inclusive)
+            end: End of the period (inclusive)
+
+        Returns:
+            Events ordered by start time
+        """
+        lo = bisect_left(self._index, (start,))
+        hi = bisect_right(self._index, (end, float('inf')))
+        return [self._events[event_id][0] for _, _, event_id in self._index[lo:hi]]
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta, tzinfo
+from typing import List, Tuple
+
+import icalendar
+
+from app.core.calendar.timezones import localize_many
+
+BusyPeriod = Tuple[datetime, datetime]
+
+# FBTYPE values that block a day; a missing FBTYPE means BUSY (RFC 5545)
+BUSY_TYPES = {'BUSY', 'BUSY-UNAVAILABLE', 'BUSY-TENTATIVE'}
+
+def parse_busy_periods(ical_data: str, tz: tzinfo) -> List[BusyPeriod]:
+    """
+    Read the busy periods from a free-busy-query response.
+
+    Args:
+        ical_data: VCALENDAR with one or more VFREEBUSY components
+        tz: Local timezone the periods are converted to
+
+    Returns:
+        List of (start, end) tuples as local datetimes
+    """
+    calendar = icalendar.Calendar.from_ical(ical_data)
+    bounds = []
+    for component in calendar.walk('VFREEBUSY'):
+        values = component.get('FREEBUSY', [])
+        if not isinstance(values, list):
+            values = [values]
+        for value in values:
+            if value.params.get('FBTYPE', 'BUSY').upper() not in BUSY_TYPES:
+                continue
+            start, end = value.dt
+            if isinstance(end, timedelta):
+                end = start + end
+            bounds.extend((start, end))
+    # All periods of the window are converted together
+    local = localize_many(bounds, tz)
+    return list(zip(local[::2], local[1::2]))
@@ -0,0 +1,81 @@
+import asyncio
+import heapq
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, Iterator, List, Sequence, TypeVar
+
+from app.core.calendar.event_record import EventRecord
+
+Source = TypeVar('Source')
+StartKey = Callable[[EventRecord], datetime]
+
+def merge_by_start(streams: Iterable[Iterable[EventRecord]], key: StartKey) -> Iterator[EventRecord]:
+    """
+    Merge event streams that are each ordered by start into one ordered stream.
+
+    A k-way heap merge: only the head of every stream is compared, so
+    merging n events from k calendars costs O(n log k).
+
+    Args:
+        streams: Event streams, each sorted by key
+        key: Start of an event as a comparable datetime
+
+    Returns:
+        Iterator[EventRecord]: All events in start order
+    """
+    return heapq.merge(*streams, key=key)
+
+def fetch_parallel(
+    executor: Executor,
+    fetch: Callable[[Source, datetime, datetime], List[EventRecord]],
+    sources: Sequence[Source],
+    start: datetime,
+    end: datetime,
+    key: StartKey
+) -> Iterator[EventRecord]:
+    """
+    Fetch a period from several calendars at once and merge the results.
+
+    Every calendar is fetched and sorted on its own worker, so the total
+    latency is close to that of the slowest calendar.
+
+    Args:
+        executor: Executor running the fetches
+        fetch: Blocking fetch for a single calendar
+        sources: The calendars
+        start: Start of the period
+        end: End of the period
+        key: Start of an event as a comparable datetime
+
+    Returns:
+        Iterator[EventRecord]: All events in start order
+    """
+    def fetch_sorted(source: Source) -> List[EventRecord]:
+        return sorted(fetch(source, start, end), key=key)
+
+    futures = [executor.submit(fetch_sorted, source) for source in sources]
+    return merge_by_start([future.result() for future in futures], key)
+
+async def fetch_parallel_async(
+    fetch: Callable[[Source, datetime, datetime], Awaitable[List[EventRecord]]],
+    sources: Sequence[Source],
+    start: datetime,
+    end: datetime,
+    key: StartKey
+) -> Iterator[EventRecord]:
+    """
+    Fetch a period from several calendars concurrently on the event loop
+    and merge the results.
+
+    Args:
+        fetch: Coroutine fetching a single calendar
+        sources: The calendars
+        start: Start of the period
+        end: End of the period
+        key: Start of an event as a comparable datetime
+
+    Returns:
+        Iterator[EventRecord]: All events in start order
+    """
+    results = await asyncio.gather(*(fetch(source, start, end) for source in sources))
+    return merge_by_start([sorted(events, key=key) for events in results], key)
@@ -0,0 +1,113 @@
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.calendar.event_record import EventRecord
+
+BUSY = 1
+FREE = 0
+
+class DayOccupancy:
+    """
+    Busy/free map over a range of days.
+
+    Backed by a bytearray with one byte per day. Event spans are marked
+    with slice assignment and free days are found with bytes.find, so both
+    run in C and a horizon of years costs a few hundred bytes.
+    """
+    def __init__(self, first_day: date, days: int):
+        """
+        Initialize an occupancy map with all days free.
+
+        Args:
+            first_day: First day covered
+            days: Number of days covered
+        """
+        self.first_day = first_day
+        self.days = days
+        self._busy = bytearray(days)
+        self._ones = memoryview(bytes([BUSY]) * days)
+
+    def mark(self, start: date, end: date) -> None:
+        """
+        Mark a range of days as busy.
+
+        Args:
+            start: First busy day
+            end: Day after the last busy day
+        """
+        lo = max((start - self.first_day).days, 0)
+        hi = min((end - self.first_day).days, self.days)
+        if lo < hi:
+            self._busy[lo:hi] = self._ones[:hi - lo]
+
+    def mark_event(self, record: EventRecord) -> None:
+        """
+        Mark every day an event spans as busy.
+
+        Args:
+            record: The event
+        """
+        if record.all_day:
+            self.mark(record.start, max(record.end, record.start + timedelta(days=1)))
+        else:
+            self.mark_span(record.start, record.end)
+
+    def mark_span(self, start: datetime, end: datetime) -> None:
+        """
+        Mark every day a time span touches as busy.
+
+        Args:
+            start: Start of the span as a local datetime
+            end: End of the span as a local datetime
+        """
+        last_day = start.date()
+        if end > start:
+            # A span ending exactly at midnight does not occupy the next day
+            last_day = (end - timedelta(microseconds=1)).date()
+        self.mark(start.date(), last_day + timedelta(days=1))
+
+    def mark_events(self, records: Iterable[EventRecord]) -> None:
+        """
+        Mark the spans of many events as busy.
+
+        Args:
+            records: The events
+        """
+        for record in records:
+            self.mark_event(record)
+
+    def mark_spans(self, spans: Iterable[Tuple[datetime, datetime]]) -> None:
+        """
+        Mark the days of many time spans as busy, e.g. free-busy periods.
+
+        Args:
+            spans: (start, end) tuples as local datetimes
+        """
+        for start, end in spans:
+            self.mark_span(start, end)
+
+    def is_free(self, day: date) -> bool:
+        """Check whether a day is free. Days outside the range count as free."""
+        index = (day - self.first_day).days
+        return not (0 <= index < self.days) or self._busy[index] == FREE
+
+    def free_days(self, start: Optional[date] = None, end: Optional[date] = None) -> List[date]:
+        """
+        Get all free days in a range.
+
+        Args:
+            start: First day to consider, defaults to the first covered day
+            end: Day after the last day to consider, defaults to the end of the range
+
+        Returns:
+            Free days in ascending order
+        """
+        lo = 0 if start is None else max((start - self.first_day).days, 0)
+        hi = self.days if end is None else min((end - self.first_day).days, self.days)
+
+        free = []
+        index = self._busy.find(FREE, lo, hi)
+        while index != -1:
+            free.append(self.first_day + timedelta(days=index))
+            index = self._busy.find(FREE, index + 1, hi)
+        return free
@@ -0,0 +1,109 @@
+from datetime import date
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Tuple
+
+from app.core.calendar.event_record import EventRecord
+
+def occurrence_key(record: EventRecord) -> Hashable:
+    """
+    Identify an occurrence across fetches.
+
+    Recurring instances are told apart by their recurrence-id, all
+    others by their uid alone, so a moved event counts as changed and
+    not as removed and added.
+
+    Args:
+        record: A normalized event record
+
+    Returns:
+        Hashable: (uid, recurrence-id or None)
+    """
+    return record.uid, record.recurrence_id
+
+def keyed_fragments(rendered: Iterable[Tuple[EventRecord, str]]) -> Dict[Hashable, str]:
+    """
+    Key rendered text blocks by occurrence, keeping their order.
+
+    Occurrences sharing a key (e.g. the same event in two calendars)
+    are numbered, so no block is lost.
+
+    Args:
+        rendered: (record, text) pairs in start order
+
+    Returns:
+        Dictionary of text blocks by occurrence key
+    """
+    fragments: Dict[Hashable, str] = {}
+    for record, fragment in rendered:
+        key = occurrence_key(record)
+        duplicate = 1
+        while key in fragments:
+            key = (*occurrence_key(record), duplicate)
+            duplicate += 1
+        fragments[key] = fragment
+    return fragments
+
+class WeekOverview:
+    """
+    A rendered weekly overview and the event set it was built from.
+
+    Fragments are the rendered text blocks keyed by occurrence in start
+    order; comparing them instead of raw events means only changes that
+    show in the overview count.
+    """
+    def __init__(self, week_start: date, fragments: Dict[Hashable, str], chunks: List[str], stale: bool = False):
+        """
+        Initialize an overview.
+
+        Args:
+            week_start: Monday of the week
+            fragments: Rendered text block per occurrence, in start order
+            chunks: The ready-to-send message texts
+            stale: Whether it was built from the last good data during an outage
+        """
+        self.week_start = week_start
+        self.fragments = fragments
+        self.chunks = chunks
+        self.stale = stale
+
+class OverviewDiff(NamedTuple):
+    """Rendered text blocks that differ between two overviews of a week."""
+    added: List[str]
+    changed: List[str]
+    removed: List[str]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+def diff_overviews(previous: WeekOverview, current: WeekOverview) -> OverviewDiff:
+    """
+    Compare the overview delivered last with the current one.
+
+    Args:
+        previous: Overview delivered last
+        current: Overview built now
+
+    Returns:
+        OverviewDiff: New, changed (new text) and removed (old text) blocks
+    """
+    added, changed = [], []
+    for key, fragment in current.fragments.items():
+        old = previous.fragments.get(key)
+        if old is None:
+            added.append(fragment)
+        elif old != fragment:
+            changed.append(fragment)
+    removed = [fragment for key, fragment in previous.fragments.items() if key not in current.fragments]
+    return OverviewDiff(added, changed, removed)
+
+def changed_chunks(previous: List[str], current: List[str]) -> Iterable[Tuple[int, str]]:
+    """
+    Get the message chunks that need to be edited.
+
+    Args:
+        previous: Chunks delivered last
+        current: Chunks built now, of the same number
+
+    Returns:
+        (index, text) of every chunk whose text differs
+    """
+    return [(index, text) for index, (old, text) in enumerate(zip(previous, current)) if old != text]
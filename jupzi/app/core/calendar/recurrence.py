@@ -0,0 +1,211 @@
+from collections import OrderedDict
+from datetime import datetime, time, timezone
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import logging
+
+import icalendar
+import recurring_ical_events
+
+from app.core.calendar.event_record import EventRecord
+
+logger = logging.getLogger(__name__)
+
+ExpansionKey = Tuple[str, int, datetime, datetime]
+
+def expand_calendar(calendar: icalendar.Calendar, start: datetime, end: datetime,
+                    etag: Optional[str] = None) -> Iterator[EventRecord]:
+    """
+    Expand a parsed calendar resource into single occurrences within a window.
+
+    RRULE, RDATE, EXDATE and overridden instances (RECURRENCE-ID) are
+    applied locally, the server never has to expand anything.
+
+    Occurrences are generated lazily in start order, so a window of
+    years is never materialized as a whole.
+
+    Args:
+        calendar: The parsed resource
+        start: Start of the window, its timezone is used as local timezone
+        end: End of the window
+        etag: Etag of the resource, passed on to the records
+
+    Yields:
+        EventRecord: One normalized record per occurrence
+    """
+    tz = start.tzinfo or timezone.utc
+    local_end = end.astimezone(tz)
+    wall_end = local_end.replace(tzinfo=None)
+
+    for occurrence in recurring_ical_events.of(calendar).after(start):
+        record = EventRecord.from_component(occurrence, tz, etag)
+        if record.all_day:
+            past_end = datetime.combine(record.start, time.min) >= wall_end
+        else:
+            past_end = record.start >= local_end
+        if past_end:
+            break
+        yield record
+
+def expand_resource(ical_data: str, start: datetime, end: datetime,
+                    etag: Optional[str] = None) -> Iterator[EventRecord]:
+    """
+    Expand a calendar resource into single occurrences within a window.
+
+    Args:
+        ical_data: Raw iCalendar data of the resource
+        start: Start of the window, its timezone is used as local timezone
+        end: End of the window
+        etag: Etag of the resource, passed on to the records
+
+    Returns:
+        Iterator[EventRecord]: One normalized record per occurrence
+    """
+    return expand_calendar(icalendar.Calendar.from_ical(ical_data), start, end, etag)
+
+class RecurrenceExpander:
+    """
+    Expands stored master events locally and caches the occurrence sets.
+
+    Every resource is parsed once per (uid, sequence). Its expansions are
+    cached per (uid, sequence, window) in a bounded LRU and dropped only
+    when the master changes, so repeated reports over recurring events
+    never touch the iCalendar data again.
+    """
+    def __init__(self, max_expansions: int = 4096, max_cached_occurrences: int = 512):
+        """
+        Initialize an empty expander.
+
+        Args:
+            max_expansions: Maximum number of cached occurrence sets
+            max_cached_occurrences: Larger occurrence sets are streamed, not cached
+        """
+        self._max_expansions = max_expansions
+        self._max_cached_occurrences = max_cached_occurrences
+        self._masters: Dict[str, Tuple[int, icalendar.Calendar, Optional[str]]] = {}
+        self._expansions: 'OrderedDict[ExpansionKey, Tuple[EventRecord, ...]]' = OrderedDict()
+        self._keys_by_uid: Dict[str, Set[ExpansionKey]] = {}
+        self._lock = Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'parsed': 0, 'invalidations': 0}
+
+    def has_master(self, uid: str, sequence: int) -> bool:
+        """Check whether a master is stored in the given version."""
+        with self._lock:
+            master = self._masters.get(uid)
+            return master is not None and master[0] == sequence
+
+    def add_master(self, uid: str, sequence: int, ical_data: str, etag: Optional[str] = None) -> None:
+        """
+        Parse and store the master of a resource, replacing older versions.
+
+        Args:
+            uid: UID of the resource
+            sequence: SEQUENCE of the master
+            ical_data: Raw iCalendar data of the resource
+            etag: Etag of the resource, passed on to its occurrences
+        """
+        calendar = icalendar.Calendar.from_ical(ical_data)
+        with self._lock:
+            if uid in self._masters and self._masters[uid][0] != sequence:
+                self._drop(uid)
+            self._masters[uid] = (sequence, calendar, etag)
+            self._stats['parsed'] += 1
+
+    def expand(self, uid: str, sequence: int, start: datetime, end: datetime) -> List[EventRecord]:
+        """
+        Get the occurrences of a stored master within a window as a list.
+
+        See iter_expand.
+        """
+        return list(self.iter_expand(uid, sequence, start, end))
+
+    def iter_expand(self, uid: str, sequence: int, start: datetime, end: datetime) -> Iterator[EventRecord]:
+        """
+        Get the occurrences of a stored master within a window.
+
+        Occurrences are yielded as they are expanded. Sets that grow larger
+        than max_cached_occurrences, e.g. a daily event over years, are
+        not cached so memory use does not grow with the window.
+
+        Args:
+            uid: UID of the resource
+            sequence: SEQUENCE of the master
+            start: Start of the window
+            end: End of the window
+
+        Yields:
+            EventRecord: One record per occurrence
+
+        Raises:
+            KeyError: If the master is not stored in this version
+        """
+        key = (uid, sequence, start, end)
+        with self._lock:
+            cached = self._expansions.get(key)
+            if cached is not None:
+                self._expansions.move_to_end(key)
+                self._stats['hits'] += 1
+            else:
+                stored_sequence, calendar, etag = self._masters[uid]
+                if stored_sequence != sequence:
+                    raise KeyError(uid)
+                self._stats['misses'] += 1
+        if cached is not None:
+            yield from cached
+            return
+
+        collected = []
+        for occurrence in expand_calendar(calendar, start, end, etag):
+            if collected is not None:
+                collected.append(occurrence)
+                if len(collected) > self._max_cached_occurrences:
+                    collected = None
+            yield occurrence
+        if collected is None:
+            return
+
+        occurrences = tuple(collected)
+        with self._lock:
+            # Skip storing if the master changed while expanding
+            if self._masters.get(uid, (None,))[0] == sequence:
+                self._expansions[key] = occurrences
+                self._keys_by_uid.setdefault(uid, set()).add(key)
+                while len(self._expansions) > self._max_expansions:
+                    old_key, _ = self._expansions.popitem(last=False)
+                    self._keys_by_uid[old_key[0]].discard(old_key)
+
+    def invalidate(self, uid: str) -> None:
+        """
+        Forget the master of a resource and all of its expansions.
+
+        Args:
+            uid: UID of the changed or deleted resource
+        """
+        with self._lock:
+            self._drop(uid)
+            self._stats['invalidations'] += 1
+        logger.debug(f"Recurrence cache invalidated for {uid}")
+
+    def clear(self) -> None:
+        """Forget all masters and expansions."""
+        with self._lock:
+            self._masters.clear()
+            self._expansions.clear()
+            self._keys_by_uid.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss, parse and invalidation counts and the
+            number of stored masters and expansions
+        """
+        with self._lock:
+            return dict(self._stats, masters=len(self._masters), expansions=len(self._expansions))
+
+    def _drop(self, uid: str) -> None:
+        """Remove a master and its expansions, the lock must be held."""
+        self._masters.pop(uid, None)
+        for key in self._keys_by_uid.pop(uid, ()):
+            self._expansions.pop(key, None)
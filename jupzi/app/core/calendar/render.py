@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from datetime import timedelta
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple
+import re
+
+from app.core.calendar.event_record import EventRecord
+from app.utils.templates import WEEKDAY_TRANSLATIONS
+
+# "rauchfrei" in any case, with optional surrounding brackets
+SMOKING_FREE_PATTERN = re.compile(r'[(\[{]?\s*rauchfrei\s*[)\]}]?', re.IGNORECASE)
+TITLE_SEPARATORS = ":,- ()[]{}"
+
+def normalize_title(title: Optional[str], smoking_free: bool) -> str:
+    """
+    Get the display title of an event.
+
+    Args:
+        title: Title as stored in the calendar
+        smoking_free: Whether the title carries the "rauchfrei" marker
+
+    Returns:
+        str: Title without the marker and everything after the first comma
+    """
+    title = title or "Unbenannter Termin"
+    if not smoking_free:
+        return title.split(",", 1)[0]
+    # Remove the marker and the separators it leaves behind before
+    # splitting, a leading marker would otherwise take the title with it
+    title = SMOKING_FREE_PATTERN.sub("", title).strip(TITLE_SEPARATORS)
+    return title.split(",", 1)[0].rstrip()
+
+def render_event(record: EventRecord) -> Tuple[str, str]:
+    """
+    Render the overview text block of an event.
+
+    Args:
+        record: A normalized event record
+
+    Returns:
+        tuple: (date, text) - Formatted date and event text
+    """
+    start = record.start
+    date = f"{WEEKDAY_TRANSLATIONS[start.strftime('%A')]} {start.strftime('%d.%m')}."
+
+    end = record.end
+    if not record.all_day:
+        time_range = start.strftime('%H:%M')
+        if start.date() == end.date():
+            time_range += f" - {end.strftime('%H:%M')}"
+        else:
+            time_range += " - OpenEnd"
+    else:
+        time_range = "Ganztägig"
+        if start != end:  # If end date is different from start date
+            # Subtract one day from end date since CalDAV stores end date as day after event
+            last_day = end - timedelta(days=1)
+            time_range += f" bis einschließlich {last_day.strftime('%d.%m')}."
+
+    title = normalize_title(record.title, record.smoking_free)
+    description = record.description or "Keine Beschreibung vorhanden."
+    smoking_info = "Rauchfrei" if record.smoking_free else "Rauchkneipe"
+
+    text = (
+        f"  🗓  {date}\n"
+        f"  🕖  {time_range}\n"
+        f"  🃏  {title}\n"
+        f"  🫧  {description}\n"
+        f"  🪩  {smoking_info}"
+    )
+    return date, text
+
+class EventRenderCache:
+    """
+    Bounded LRU of rendered event text blocks.
+
+    Fragments are keyed by (uid, recurrence-id, etag): an occurrence is
+    rendered once and reused until its resource changes on the server.
+    Records without an etag are rendered every time.
+    """
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached fragments
+        """
+        self._max_entries = max_entries
+        self._fragments: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self._lock = Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def render(self, record: EventRecord) -> str:
+        """
+        Get the overview text block of an event.
+
+        Args:
+            record: A normalized event record
+
+        Returns:
+            str: The rendered text block
+        """
+        if record.etag is None:
+            return render_event(record)[1]
+
+        key = (record.uid, record.recurrence_id, record.etag)
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self._stats['hits'] += 1
+                return fragment
+            self._stats['misses'] += 1
+
+        fragment = render_event(record)[1]
+        with self._lock:
+            self._fragments[key] = fragment
+            while len(self._fragments) > self._max_entries:
+                self._fragments.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        """Drop all cached fragments."""
+        with self._lock:
+            self._fragments.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit and miss counts and the number of fragments
+        """
+        with self._lock:
+            return dict(self._stats, fragments=len(self._fragments))
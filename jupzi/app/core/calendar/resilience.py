@@ -0,0 +1,230 @@
+from threading import Lock
+from typing import Any, Awaitable, Callable, Iterable, Tuple, Type, TypeVar
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class StaleEvents(list):
+    """
+    Last good events served in place of a failed fetch.
+
+    A plain list to every consumer; reports check for this type to tell
+    their readers how old the data is.
+    """
+    def __init__(self, events: Iterable[Any], age: float):
+        """
+        Args:
+            events: The events
+            age: Seconds since the events were fetched
+        """
+        super().__init__(events)
+        self.age = age
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a server the circuit breaker considers down."""
+
+class CircuitBreaker:
+    """
+    Stops calling a failing server for a while.
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls fail immediately with CircuitOpenError. Once reset_timeout has
+    passed a single probe call is let through (half open): its success
+    closes the circuit, its failure opens it again.
+    """
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a closed circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = CLOSED
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """closed, open or half_open."""
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until a probe call is allowed, 0 if calls are allowed now."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - self._clock(), 0.0)
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go to the server, reserving the probe
+        call when the circuit is half open.
+
+        Returns:
+            True if the call may be made
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._probing or self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit closed, server reachable again")
+            self._failures = 0
+            self._state = CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._state == CLOSED:
+                    logger.warning(f"Circuit opened after {self._failures} consecutive failures")
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def _end_probe(self) -> None:
+        """Give up the probe call, so an interrupted probe does not block later ones."""
+        with self._lock:
+            self._probing = False
+
+    def call(self, func: Callable[[], T]) -> T:
+        """
+        Call a function through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit open, retry in {self.retry_after():.0f}s")
+        try:
+            result = func()
+        except Exception:
+            self.record_failure()
+            raise
+        else:
+            self.record_success()
+        finally:
+            self._end_probe()
+        return result
+
+    async def call_async(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await a coroutine function through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit open, retry in {self.retry_after():.0f}s")
+        try:
+            result = await func()
+        except Exception:
+            self.record_failure()
+            raise
+        else:
+            self.record_success()
+        finally:
+            # Also reached when the probe is cancelled
+            self._end_probe()
+        return result
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float,
+                  rng: Callable[[], float] = random.random) -> float:
+    """
+    Get the delay before a retry with exponential backoff and full jitter.
+
+    Spreading retries randomly over the whole backoff window keeps
+    clients that failed together from retrying in lockstep.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 0
+        base_delay: Backoff window after the first failure, in seconds
+        max_delay: Largest backoff window
+        rng: Random number source in [0, 1)
+
+    Returns:
+        float: Seconds to wait
+    """
+    return rng() * min(max_delay, base_delay * 2 ** attempt)
+
+def retry(
+    func: Callable[[], T],
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    sleep: Callable[[float], None] = time.sleep
+) -> T:
+    """
+    Call a function, retrying failures with jittered exponential backoff.
+
+    Args:
+        func: Function to call
+        attempts: Maximum number of calls
+        base_delay: Backoff window after the first failure, in seconds
+        max_delay: Largest backoff window
+        retry_on: Exception types worth retrying
+        sleep: Sleep function
+
+    Returns:
+        The result of the first successful call
+
+    Raises:
+        The exception of the last attempt
+    """
+    for attempt in range(attempts):
+        try:
+            return func()
+        except retry_on as e:
+            if attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.debug(f"Attempt {attempt + 1} failed ({e}), retrying in {delay:.2f}s")
+            sleep(delay)
+
+async def retry_async(
+    func: Callable[[], Awaitable[T]],
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+) -> T:
+    """Await a coroutine function, retrying failures like retry()."""
+    for attempt in range(attempts):
+        try:
+            return await func()
+        except retry_on as e:
+            if attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.debug(f"Attempt {attempt + 1} failed ({e}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
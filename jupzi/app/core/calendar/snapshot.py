@@ -0,0 +1,225 @@
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+import mmap
+import os
+import struct
+
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.timezones import localize_many
+
+MAGIC = b'JZSNAP\x00\x01'
+# magic, count, max duration, window start, window end, written at (µs since epoch)
+HEADER = struct.Struct('<8sIqqqq')
+# span start, span end, raw start, raw end, flags, payload offset, payload length
+ENTRY = struct.Struct('<qqqqBII')
+LENGTH = struct.Struct('<i')
+
+ALL_DAY = 1
+SMOKING_FREE = 2
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+Span = Tuple[datetime, datetime]
+
+def _micros(value: datetime) -> int:
+    """Get an aware datetime as microseconds since the epoch."""
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def _from_micros(value: int, tz: tzinfo) -> datetime:
+    """Get microseconds since the epoch as a local datetime."""
+    return (EPOCH + timedelta(microseconds=value)).astimezone(tz)
+
+def _encode(value: Optional[str]) -> bytes:
+    """Encode an optional string with a length prefix, -1 meaning None."""
+    if value is None:
+        return LENGTH.pack(-1)
+    data = value.encode('utf-8')
+    return LENGTH.pack(len(data)) + data
+
+def write_snapshot(
+    path: Union[str, Path],
+    records: Iterable[EventRecord],
+    span: Callable[[EventRecord], Span],
+    window: Span
+) -> int:
+    """
+    Write event records to a snapshot file.
+
+    The file holds a fixed-size header, a table of fixed-size entries
+    sorted by start and the variable-length text fields. Range queries
+    on a loaded snapshot only decode the entries they return. The file
+    is replaced atomically, so readers never see a partial snapshot.
+
+    Args:
+        path: Snapshot file
+        records: Events covering the window, in any order
+        span: Returns the (start, end) of an event as local datetimes
+        window: Period the records cover completely
+
+    Returns:
+        int: Number of records written
+    """
+    entries = []
+    payload = bytearray()
+    max_duration = 0
+    for record in records:
+        start, end = span(record)
+        start_key, end_key = _micros(start), _micros(end)
+        max_duration = max(max_duration, end_key - start_key)
+        if record.all_day:
+            raw = (record.start.toordinal(), record.end.toordinal())
+        else:
+            raw = (_micros(record.start), _micros(record.end))
+        flags = (ALL_DAY if record.all_day else 0) | (SMOKING_FREE if record.smoking_free else 0)
+        recurrence_id = record.recurrence_id.isoformat() if record.recurrence_id is not None else None
+
+        fields = b''.join(_encode(value) for value in (
+            record.uid, record.title, record.description, recurrence_id, record.etag
+        ))
+        entries.append((start_key, end_key, *raw, flags, len(payload), len(fields)))
+        payload += fields
+    entries.sort()
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(path.name + '.tmp')
+    with open(temp, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC, len(entries), max_duration,
+            _micros(window[0]), _micros(window[1]), _micros(datetime.now(timezone.utc))
+        ))
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+    return len(entries)
+
+class CalendarSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Opening a snapshot only reads its header; the entry table is binary
+    searched in place and records are decoded on demand, so a snapshot
+    can answer queries right after startup regardless of its size.
+    """
+    def __init__(self, path: Union[str, Path], tz: tzinfo):
+        """
+        Open a snapshot file.
+
+        Args:
+            path: Snapshot file
+            tz: Local timezone of the decoded records
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid snapshot
+        """
+        self._tz = tz
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, count, max_duration, window_start, window_end, written_at = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a calendar snapshot")
+            self._count = count
+            self._max_duration = max_duration
+            self._payload = HEADER.size + count * ENTRY.size
+            if len(self._map) < self._payload:
+                raise ValueError(f"{path} is truncated")
+        except (ValueError, struct.error):
+            self._map.close()
+            raise ValueError(f"{path} is not a valid calendar snapshot")
+        self.window = (_from_micros(window_start, tz), _from_micros(window_end, tz))
+        self.written_at = _from_micros(written_at, timezone.utc)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Check whether the snapshot holds every event of a period."""
+        return self.window[0] <= start and end <= self.window[1]
+
+    def between(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """
+        Get all events overlapping a period.
+
+        Args:
+            start: Start of the period
+            end: End of the period
+
+        Returns:
+            Event records in start order
+        """
+        start_key, end_key = _micros(start), _micros(end)
+        lo = self._search(start_key - self._max_duration)
+        hi = self._search(end_key)
+
+        records = []
+        for index in range(lo, hi):
+            entry = ENTRY.unpack_from(self._map, HEADER.size + index * ENTRY.size)
+            if entry[1] > start_key or entry[0] >= start_key:
+                records.append(self._decode(entry))
+
+        # The timed events of the period are converted together
+        timed = [record for record in records if not record.all_day]
+        local = localize_many([value for record in timed for value in (record.start, record.end)], self._tz)
+        for record, start, end in zip(timed, local[::2], local[1::2]):
+            record.start, record.end = start, end
+        return records
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._map.close()
+
+    def _search(self, key: int) -> int:
+        """Get the index of the first entry starting at or after a key."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if struct.unpack_from('<q', self._map, HEADER.size + mid * ENTRY.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _decode(self, entry: Tuple) -> EventRecord:
+        """Build the record of a table entry."""
+        _, _, raw_start, raw_end, flags, offset, _ = entry
+        position = self._payload + offset
+        fields = []
+        for _ in range(5):
+            length = LENGTH.unpack_from(self._map, position)[0]
+            position += LENGTH.size
+            if length < 0:
+                fields.append(None)
+                continue
+            fields.append(self._map[position:position + length].decode('utf-8'))
+            position += length
+        uid, title, description, recurrence_id, etag = fields
+
+        if flags & ALL_DAY:
+            start, end = date.fromordinal(raw_start), date.fromordinal(raw_end)
+        else:
+            # UTC, localized with the other events of the period
+            start, end = _from_micros(raw_start, timezone.utc), _from_micros(raw_end, timezone.utc)
+        if recurrence_id is not None:
+            recurrence_id = (
+                date.fromisoformat(recurrence_id) if len(recurrence_id) == 10
+                else datetime.fromisoformat(recurrence_id)
+            )
+
+        return EventRecord(
+            uid=uid,
+            start=start,
+            end=end,
+            all_day=bool(flags & ALL_DAY),
+            title=title,
+            description=description,
+            smoking_free=bool(flags & SMOKING_FREE),
+            recurrence_id=recurrence_id,
+            etag=etag
+        )
@@ -0,0 +1,475 @@
+from itertools import islice
+from threading import Lock
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime, time, timedelta, timezone
+import logging
+
+import caldav
+import icalendar
+from caldav.elements.base import ValuedBaseElement
+from caldav.lib.error import DAVError, NotFoundError, ReportError
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.calendar.dav_stream import stream_propfind, stream_report
+from app.core.calendar.dav_xml import (
+    DavResource,
+    MultistatusParser,
+    calendar_multiget,
+    propfind_etags,
+    sync_collection
+)
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.recurrence import RecurrenceExpander, expand_calendar, expand_resource
+from app.models.calendar_events import CalendarEvent, CalendarSyncState
+from app.utils.database import Database
+
+logger = logging.getLogger(__name__)
+
+# caldav emulates sync tokens with this prefix when the server has no
+# sync-collection support; such tokens cannot be sent back to the server.
+FAKE_SYNC_TOKEN_PREFIX = "fake-"
+
+# Streamed rows are flushed and released from the session in batches
+FLUSH_EVERY = 200
+
+# Mirror rows are read and their masters parsed in batches of this size
+READ_BATCH_SIZE = 200
+
+class GetCTag(ValuedBaseElement):
+    """CalendarServer collection tag, changes whenever a member changes."""
+    tag = "{http://calendarserver.org/ns/}getctag"
+
+def to_naive_utc(value) -> datetime:
+    """
+    Convert an iCalendar date or datetime to a naive UTC datetime.
+
+    Args:
+        value: date, naive datetime (floating time) or aware datetime
+
+    Returns:
+        datetime: Naive datetime in UTC, all-day dates map to midnight
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime.combine(value, time.min)
+
+class CalendarSync:
+    """
+    Keeps the calendar_events table in sync with a CalDAV collection.
+
+    Changes are fetched incrementally through the collection's sync-token
+    (RFC 6578). Without a usable token a listing of etags is reconciled
+    against an href->etag map of the mirror and only new or changed
+    resources are downloaded, in calendar-multiget batches. An unchanged
+    ctag skips the round trip entirely.
+
+    Recurring events are stored once as their master and expanded
+    locally; the expansions are cached until the master changes.
+    """
+    def __init__(self, calendar: caldav.Calendar, db: Database,
+                 expander: Optional[RecurrenceExpander] = None, multiget_batch_size: int = 50):
+        """
+        Initialize the sync engine.
+
+        Args:
+            calendar: CalDAV calendar to mirror
+            db: Database holding the mirror
+            expander: Expansion cache, a private one by default
+            multiget_batch_size: Resources fetched per calendar-multiget REPORT
+        """
+        self._calendar = calendar
+        self._db = db
+        self._expander = expander or RecurrenceExpander()
+        self._calendar_url = str(calendar.url)
+        self._multiget_batch_size = multiget_batch_size
+        self._streaming = True
+        self._etags: Optional[Dict[str, Optional[str]]] = None
+        self._skipped_etags: Dict[str, Optional[str]] = {}
+        self._lock = Lock()
+
+    @property
+    def calendar_url(self) -> str:
+        """URL of the mirrored calendar."""
+        return self._calendar_url
+
+    def sync(self, full: bool = False) -> bool:
+        """
+        Bring the mirror up to date with the server.
+
+        Syncs of the same calendar run one at a time, whichever thread
+        starts them, so a change is never applied twice.
+
+        Args:
+            full: Reconcile every resource by etag even if the ctag and
+                sync token report no changes
+
+        Returns:
+            True if any event was added, changed or removed
+        """
+        with self._lock, self._db.get_session() as session:
+            state = session.query(CalendarSyncState).filter_by(
+                calendar_url=self._calendar_url
+            ).one_or_none()
+            if state is None:
+                state = CalendarSyncState(calendar_url=self._calendar_url)
+                session.add(state)
+
+            # A full refresh does not look at the ctag, it is fetched again
+            # by the next regular sync
+            ctag = None if full else self._get_ctag()
+            if ctag is not None and state.last_synced_at and state.ctag == ctag:
+                logger.debug(f"Calendar {self._calendar_url} unchanged (ctag {ctag})")
+                return False
+
+            incremental = (not full and bool(state.sync_token)
+                           and not state.sync_token.startswith(FAKE_SYNC_TOKEN_PREFIX))
+            try:
+                try:
+                    changed, sync_token = self._sync_objects(session, state.sync_token if incremental else None)
+                except DAVError as e:
+                    if not incremental:
+                        raise
+                    # Expired or rejected token: start over with a full listing
+                    logger.warning(f"Sync token rejected for {self._calendar_url}, doing full sync: {e}")
+                    changed, sync_token = self._sync_objects(session, None)
+            except Exception:
+                # The mirror is rolled back, so the etag map must be reloaded
+                self._etags = None
+                raise
+
+            state.sync_token = sync_token
+            state.ctag = ctag
+            state.last_synced_at = datetime.utcnow()
+
+            if changed:
+                logger.info(f"Calendar mirror updated for {self._calendar_url}")
+            return changed
+
+    def events_between(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """
+        Read all event occurrences within a window from the mirror.
+
+        Args:
+            start: Start of the window
+            end: End of the window
+
+        Returns:
+            List of event records, one per occurrence
+        """
+        return list(self.iter_events_between(start, end))
+
+    def iter_events_between(self, start: datetime, end: datetime) -> Iterator[EventRecord]:
+        """
+        Stream all event occurrences within a window from the mirror.
+
+        Rows are read in batches and occurrences are yielded as they are
+        expanded, so memory use does not depend on the size of the window.
+
+        Args:
+            start: Start of the window
+            end: End of the window
+
+        Yields:
+            EventRecord: One record per occurrence, in no particular order
+        """
+        # Pad the coarse SQL filter by a day so floating and all-day events
+        # are not lost at the edges; expansion does the exact filtering.
+        lower = to_naive_utc(start) - timedelta(days=1)
+        upper = to_naive_utc(end) + timedelta(days=1)
+
+        with self._db.get_session() as session:
+            rows = session.query(CalendarEvent.href, CalendarEvent.uid, CalendarEvent.sequence).filter(
+                CalendarEvent.calendar_url == self._calendar_url,
+                or_(
+                    CalendarEvent.is_recurring.is_(True),
+                    and_(CalendarEvent.start_time < upper, CalendarEvent.end_time > lower)
+                )
+            ).yield_per(READ_BATCH_SIZE)
+
+            while True:
+                batch = list(islice(rows, READ_BATCH_SIZE))
+                if not batch:
+                    break
+                self._load_masters(session, batch)
+
+                for href, uid, sequence in batch:
+                    try:
+                        yield from self._expander.iter_expand(uid or href, sequence, start, end)
+                    except Exception as e:
+                        logger.error(f"Error expanding mirrored event: {e}")
+
+    def _load_masters(self, session: Session, rows) -> None:
+        """Parse the masters of rows not parsed in their current version yet."""
+        missing = [href for href, uid, sequence in rows
+                   if not self._expander.has_master(uid or href, sequence)]
+        if not missing:
+            return
+        for href, uid, sequence, etag, ical_data in session.query(
+            CalendarEvent.href, CalendarEvent.uid, CalendarEvent.sequence, CalendarEvent.etag, CalendarEvent.ical_data
+        ).filter(CalendarEvent.href.in_(missing)):
+            try:
+                self._expander.add_master(uid or href, sequence, ical_data, etag)
+            except Exception as e:
+                logger.error(f"Error parsing mirrored event: {e}")
+
+    def get_expansion_stats(self) -> Dict[str, int]:
+        """Get statistics of the recurrence expansion cache."""
+        return self._expander.stats()
+
+    def _get_ctag(self) -> Optional[str]:
+        """Fetch the collection ctag, or None if the server has none."""
+        try:
+            return self._calendar.get_property(GetCTag())
+        except Exception as e:
+            logger.debug(f"Could not fetch ctag for {self._calendar_url}: {e}")
+            return None
+
+    def _sync_objects(self, session: Session, sync_token: Optional[str]):
+        """
+        Apply the changes since the last sync to the mirror.
+
+        Incremental syncs and the initial load stream a sync-collection
+        REPORT including the event bodies. Any other full listing is
+        reconciled by etag, see _refresh.
+
+        Args:
+            session: Database session
+            sync_token: Token of the last sync, None for a full listing
+
+        Returns:
+            tuple: (changed, new_sync_token)
+        """
+        etags = self._load_etags(session)
+
+        if self._streaming and (sync_token is not None or not etags):
+            try:
+                return self._stream_changes(session, sync_token)
+            except ReportError as e:
+                if sync_token is not None:
+                    raise
+                logger.info(f"Streaming sync not supported for {self._calendar_url}, listing etags: {e}")
+                self._streaming = False
+        return self._refresh(session)
+
+    def _stream_changes(self, session: Session, sync_token: Optional[str]):
+        """
+        Apply a streamed sync-collection REPORT to the mirror.
+
+        Every resource is written to the mirror as soon as it is parsed and
+        released from the session in batches, so memory use does not grow
+        with the size of the calendar.
+
+        Args:
+            session: Database session
+            sync_token: Token of the last sync, None for the initial load
+
+        Returns:
+            tuple: (changed, new_sync_token)
+        """
+        parser = MultistatusParser()
+        resources = stream_report(
+            self._calendar.client, self._calendar_url, sync_collection(sync_token), parser=parser
+        )
+        changed = self._apply_resources(session, resources)
+        return changed, parser.sync_token
+
+    def _refresh(self, session: Session):
+        """
+        Reconcile the mirror with a listing of hrefs and etags.
+
+        Only the etags are listed, through a sync-collection REPORT without
+        event bodies (which also yields a fresh sync token) or a PROPFIND.
+        Resources whose etag differs from the href->etag map are fetched
+        with calendar-multiget REPORTs in batches; if nothing changed the
+        refresh costs this single listing request.
+
+        Args:
+            session: Database session
+
+        Returns:
+            tuple: (changed, new_sync_token)
+        """
+        etags = self._load_etags(session)
+        listing, sync_token = self._list_etags()
+
+        changed = False
+        removed = [href for href in etags if href not in listing]
+        for href in removed:
+            row = session.query(CalendarEvent).filter_by(href=href).one_or_none()
+            if row is not None:
+                self._delete(session, row)
+                changed = True
+
+        stale = [
+            href for href, etag in listing.items()
+            if etag is None or etag not in (etags.get(href), self._skipped_etags.get(href))
+        ]
+        for i in range(0, len(stale), self._multiget_batch_size):
+            batch = stale[i:i + self._multiget_batch_size]
+            resources = stream_report(
+                self._calendar.client, self._calendar_url, calendar_multiget(batch), depth=None
+            )
+            changed |= self._apply_resources(session, resources, listing)
+
+        logger.debug(
+            f"Refreshed {self._calendar_url}: {len(listing)} listed, "
+            f"{len(stale)} fetched, {len(removed)} removed"
+        )
+        return changed, sync_token
+
+    def _list_etags(self):
+        """
+        List the href and etag of every resource in the collection.
+
+        Returns:
+            tuple: (dict of href to etag, sync token or None)
+        """
+        if self._streaming:
+            parser = MultistatusParser()
+            try:
+                resources = stream_report(
+                    self._calendar.client, self._calendar_url,
+                    sync_collection(None, calendar_data=False), parser=parser
+                )
+                listing = self._collect_etags(resources)
+                return listing, parser.sync_token
+            except ReportError as e:
+                logger.info(f"sync-collection not supported for {self._calendar_url}: {e}")
+                self._streaming = False
+
+        resources = stream_propfind(self._calendar.client, self._calendar_url, propfind_etags())
+        return self._collect_etags(resources), None
+
+    def _collect_etags(self, resources: Iterator[DavResource]) -> Dict[str, Optional[str]]:
+        """Map the member resources of a listing to their etags."""
+        listing = {}
+        for resource in resources:
+            if resource.status >= 300 or self._is_collection(resource.href):
+                continue
+            listing[resource.href] = resource.etag
+        return listing
+
+    def _apply_resources(self, session: Session, resources: Iterator[DavResource],
+                         listing: Optional[Dict[str, Optional[str]]] = None) -> bool:
+        """
+        Write streamed resources with their bodies to the mirror.
+
+        Args:
+            session: Database session
+            resources: Parsed responses of a sync-collection or multiget REPORT
+            listing: Etags from a preceding listing, used if a response has none
+
+        Returns:
+            True if the mirror was modified
+        """
+        etags = self._load_etags(session)
+        changed = False
+        written = 0
+        for resource in resources:
+            if self._is_collection(resource.href):
+                continue
+            row = None
+            if resource.href in etags:
+                row = session.query(CalendarEvent).filter_by(href=resource.href).one_or_none()
+
+            if resource.status == 404:
+                # Deleted on the server
+                if row is not None:
+                    self._delete(session, row)
+                    changed = True
+                continue
+            if resource.status >= 300:
+                continue
+
+            etag = resource.etag or (listing or {}).get(resource.href)
+            if row is not None and etag and row.etag == etag:
+                continue
+
+            ical_data = resource.calendar_data or self._load_object(resource.href)
+            if not ical_data:
+                continue
+            changed |= self._upsert(session, row, resource.href, etag, ical_data)
+
+            written += 1
+            if written % FLUSH_EVERY == 0:
+                session.flush()
+                for obj in list(session.identity_map.values()):
+                    if isinstance(obj, CalendarEvent):
+                        session.expunge(obj)
+
+        return changed
+
+    def _load_etags(self, session: Session) -> Dict[str, Optional[str]]:
+        """Get the href->etag map of the mirror, loading it on first use."""
+        if self._etags is None:
+            self._etags = dict(
+                session.query(CalendarEvent.href, CalendarEvent.etag).filter_by(calendar_url=self._calendar_url)
+            )
+        return self._etags
+
+    def _is_collection(self, href: str) -> bool:
+        """Check whether an href is the collection itself or a sub-collection."""
+        return href.endswith('/') or href.rstrip('/') == self._calendar_url.rstrip('/')
+
+    def _load_object(self, href: str) -> Optional[str]:
+        """Download a single resource whose body was not part of a response."""
+        try:
+            return self._calendar.event_by_url(href).data
+        except NotFoundError:
+            return None
+
+    def _upsert(self, session: Session, row: Optional[CalendarEvent], href: str,
+                etag: Optional[str], ical_data: str) -> bool:
+        """
+        Insert or update the mirror row of a calendar resource.
+
+        Returns:
+            True if the mirror was modified
+        """
+        calendar = icalendar.Calendar.from_ical(ical_data)
+        vevents = list(calendar.walk('VEVENT'))
+        if not vevents:
+            # Todos and journals are not mirrored, but their etag is kept
+            # so a refresh does not download them again
+            self._skipped_etags[href] = etag
+            if row is not None:
+                self._delete(session, row)
+                return True
+            return False
+
+        master = next((v for v in vevents if 'RECURRENCE-ID' not in v), vevents[0])
+        start = master.decoded('DTSTART')
+        if 'DTEND' in master:
+            end = master.decoded('DTEND')
+        elif 'DURATION' in master:
+            end = start + master.decoded('DURATION')
+        else:
+            end = start
+
+        if row is None:
+            row = CalendarEvent(calendar_url=self._calendar_url, href=href)
+            session.add(row)
+        else:
+            self._expander.invalidate(row.uid or href)
+
+        row.uid = str(master.get('UID', ''))
+        row.sequence = int(master.get('SEQUENCE', 0))
+        row.etag = etag
+        row.title = str(master.get('SUMMARY', ''))
+        row.description = str(master['DESCRIPTION']) if 'DESCRIPTION' in master else None
+        row.location = str(master['LOCATION']) if 'LOCATION' in master else None
+        row.start_time = to_naive_utc(start)
+        row.end_time = to_naive_utc(end)
+        row.is_recurring = len(vevents) > 1 or any(prop in master for prop in ('RRULE', 'RDATE'))
+        row.ical_data = ical_data
+        self._load_etags(session)[href] = etag
+        return True
+
+    def _delete(self, session: Session, row: CalendarEvent) -> None:
+        """Remove the mirror row of a deleted resource and its expansions."""
+        self._expander.invalidate(row.uid or row.href)
+        self._load_etags(session).pop(row.href, None)
+        session.delete(row)
@@ -0,0 +1,144 @@
+from datetime import date, datetime, time, tzinfo
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Iterable, List
+import zoneinfo
+
+BACKENDS = ('zoneinfo', 'pytz')
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str, backend: str = 'zoneinfo') -> tzinfo:
+    """
+    Resolve a timezone by name, once per process.
+
+    Args:
+        name: IANA timezone name, e.g. Europe/Berlin
+        backend: 'zoneinfo' (standard library) or 'pytz'
+
+    Returns:
+        tzinfo: The timezone object
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == 'zoneinfo':
+        return zoneinfo.ZoneInfo(name)
+    if backend == 'pytz':
+        import pytz
+        return pytz.timezone(name)
+    raise ValueError(f"Timezone backend must be one of {BACKENDS}")
+
+def localize(value: datetime, tz: tzinfo) -> datetime:
+    """
+    Get a datetime in a timezone.
+
+    Naive datetimes are interpreted as wall time of the timezone, aware
+    ones are converted.
+
+    Args:
+        value: Datetime to localize
+        tz: Target timezone, zoneinfo or pytz
+
+    Returns:
+        datetime: The datetime in the timezone
+    """
+    if value.tzinfo is None:
+        if hasattr(tz, 'localize'):
+            return tz.localize(value)
+        return value.replace(tzinfo=tz)
+    return value.astimezone(tz)
+
+def localize_many(values: Iterable[datetime], tz: tzinfo) -> List[datetime]:
+    """
+    Localize a batch of datetimes in one call, see localize().
+
+    Equal values share one conversion, which matters with pytz whose
+    localize() is comparatively expensive and with the many events of a
+    window starting at the same time.
+
+    Args:
+        values: Datetimes to localize
+        tz: Target timezone, zoneinfo or pytz
+
+    Returns:
+        List of datetimes in the timezone, in the same order
+    """
+    seen: Dict[datetime, datetime] = {}
+    result = []
+    append = result.append
+    for value in values:
+        local = seen.get(value)
+        if local is None:
+            local = seen[value] = localize(value, tz)
+        append(local)
+    return result
+
+class LocalTimezone:
+    """
+    The configured local timezone, resolved once.
+
+    Localizes single datetimes or whole lists of them, and keeps the local
+    midnight of every day it has been asked for, since all-day events
+    are placed on the timeline by their midnights over and over.
+    """
+    def __init__(self, name: str, backend: str = 'zoneinfo', max_days: int = 4096):
+        """
+        Initialize the local timezone.
+
+        Args:
+            name: IANA timezone name
+            backend: 'zoneinfo' or 'pytz'
+            max_days: Maximum number of cached midnights
+        """
+        self.name = name
+        self.tz = get_timezone(name, backend)
+        self._max_days = max_days
+        self._midnights: Dict[date, datetime] = {}
+        self._lock = Lock()
+
+    def now(self) -> datetime:
+        """Get the current time in the local timezone."""
+        return datetime.now(self.tz)
+
+    def localize(self, value: datetime) -> datetime:
+        """
+        Get a datetime in the local timezone, see localize().
+
+        Args:
+            value: Datetime to localize
+
+        Returns:
+            datetime: The local datetime
+        """
+        return localize(value, self.tz)
+
+    def localize_many(self, values: Iterable[datetime]) -> List[datetime]:
+        """
+        Get a batch of datetimes in the local timezone, see localize_many().
+
+        Args:
+            values: Datetimes to localize
+
+        Returns:
+            List of local datetimes in the same order
+        """
+        return localize_many(values, self.tz)
+
+    def start_of_day(self, day: date) -> datetime:
+        """
+        Get the local midnight starting a day.
+
+        Args:
+            day: The day
+
+        Returns:
+            datetime: Midnight of the day in the local timezone
+        """
+        midnight = self._midnights.get(day)
+        if midnight is None:
+            midnight = self.localize(datetime.combine(day, time.min))
+            with self._lock:
+                if len(self._midnights) >= self._max_days:
+                    self._midnights.clear()
+                self._midnights[day] = midnight
+        return midnight
@@ -0,0 +1,253 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+Span = Tuple[datetime, datetime]
+
+class _Window:
+    """Events fetched for one time window."""
+    __slots__ = ('start', 'end', 'events', 'fetched_at', 'invalidated')
+
+    def __init__(self, start: datetime, end: datetime, events: List[Any], fetched_at: float):
+        self.start = start
+        self.end = end
+        self.events = events
+        self.fetched_at = fetched_at
+        self.invalidated = False
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.start <= start and end <= self.end
+
+class _Flight:
+    """A window fetch in progress that other callers can wait on."""
+    __slots__ = ('start', 'end', 'done', 'window', 'error')
+
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+        self.done = threading.Event()
+        self.window: Optional[_Window] = None
+        self.error: Optional[BaseException] = None
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.start <= start and end <= self.end
+
+class CalendarWindowCache:
+    """
+    TTL-bounded cache of fetched calendar windows.
+
+    A request is served from any cached window that covers it, so one fetch
+    of a wide window answers every sub-range until the TTL expires or the
+    cache is invalidated. Concurrent misses for a covered range wait on a
+    single in-flight fetch instead of issuing their own.
+
+    Expired and invalidated windows are never served as fresh, but are
+    kept (up to max_windows) as the last good data for stale().
+    """
+    def __init__(
+        self,
+        ttl: float,
+        span: Callable[[Any], Span],
+        widen: Optional[Callable[[datetime, datetime], Span]] = None,
+        max_windows: int = 8,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the window cache.
+
+        Args:
+            ttl: Seconds a fetched window stays valid
+            span: Returns the (start, end) of an event
+            widen: Maps a requested range to the range actually fetched
+            max_windows: Maximum number of windows kept
+            clock: Monotonic time source
+        """
+        self._ttl = ttl
+        self._span = span
+        self._widen = widen or (lambda start, end: (start, end))
+        self._max_windows = max_windows
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows: List[_Window] = []
+        self._flights: List[_Flight] = []
+        self._generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'invalidations': 0, 'stale': 0}
+
+    def get(self, start: datetime, end: datetime, loader: Callable[[datetime, datetime], List[Any]]) -> List[Any]:
+        """
+        Get all events overlapping a time period.
+
+        Args:
+            start: Start of the period
+            end: End of the period
+            loader: Fetches the events of a (widened) period on a miss
+
+        Returns:
+            Events overlapping the period
+        """
+        events, flight, leader, generation = self._begin(start, end)
+        if events is not None:
+            return events
+
+        if not leader:
+            flight.done.wait()
+            return self._joined(flight, start, end)
+
+        try:
+            self._finish(flight, generation, loader(flight.start, flight.end))
+        except BaseException as e:
+            self._fail(flight, e)
+            raise
+        return self._slice(flight.window, start, end)
+
+    async def get_async(
+        self,
+        start: datetime,
+        end: datetime,
+        loader: Callable[[datetime, datetime], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """
+        Get all events overlapping a time period from a coroutine.
+
+        Works like get() but awaits the loader, and waits for fetches in
+        flight without blocking the event loop.
+
+        Args:
+            start: Start of the period
+            end: End of the period
+            loader: Coroutine function fetching a (widened) period on a miss
+
+        Returns:
+            Events overlapping the period
+        """
+        events, flight, leader, generation = self._begin(start, end)
+        if events is not None:
+            return events
+
+        if not leader:
+            await asyncio.get_running_loop().run_in_executor(None, flight.done.wait)
+            return self._joined(flight, start, end)
+
+        try:
+            self._finish(flight, generation, await loader(flight.start, flight.end))
+        except BaseException as e:
+            self._fail(flight, e)
+            raise
+        return self._slice(flight.window, start, end)
+
+    def invalidate(self) -> None:
+        """Expire all cached windows, e.g. after a sync detected changes."""
+        with self._lock:
+            for window in self._windows:
+                window.invalidated = True
+            self._generation += 1
+            self._stats['invalidations'] += 1
+        logger.debug("Calendar window cache invalidated")
+
+    def stale(self, start: datetime, end: datetime) -> Optional[Tuple[List[Any], float]]:
+        """
+        Get the last good events of a period, however old they are.
+
+        Args:
+            start: Start of the period
+            end: End of the period
+
+        Returns:
+            tuple: (events, age in seconds) from the most recently fetched
+            window covering the period, or None if no window covers it
+        """
+        with self._lock:
+            windows = [w for w in self._windows if w.covers(start, end)]
+            if not windows:
+                return None
+            window = max(windows, key=lambda w: w.fetched_at)
+            self._stats['stale'] += 1
+            return self._slice(window, start, end), self._clock() - window.fetched_at
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss, coalesced, invalidation and stale
+            counts and the number of cached windows
+        """
+        with self._lock:
+            return dict(self._stats, windows=len(self._windows))
+
+    def _begin(self, start: datetime, end: datetime):
+        """
+        Look up a period and register a fetch if nothing covers it.
+
+        Returns:
+            tuple: (events, flight, leader, generation) where events is set
+            on a cache hit and leader tells whether the caller must fetch
+        """
+        with self._lock:
+            window = self._find_window(start, end)
+            if window is not None:
+                self._stats['hits'] += 1
+                return self._slice(window, start, end), None, False, None
+
+            flight = next((f for f in self._flights if f.covers(start, end)), None)
+            if flight is not None:
+                self._stats['coalesced'] += 1
+                return None, flight, False, None
+
+            self._stats['misses'] += 1
+            flight = _Flight(*self._widen(start, end))
+            self._flights.append(flight)
+            return None, flight, True, self._generation
+
+    def _finish(self, flight: _Flight, generation: int, events: List[Any]) -> None:
+        """Complete a fetch and cache it unless the cache was invalidated meanwhile."""
+        flight.window = _Window(flight.start, flight.end, list(events), self._clock())
+        with self._lock:
+            self._flights.remove(flight)
+            if generation == self._generation:
+                self._store(flight.window)
+        flight.done.set()
+
+    def _fail(self, flight: _Flight, error: BaseException) -> None:
+        """Complete a failed fetch, waiters get the same error."""
+        flight.error = error
+        with self._lock:
+            self._flights.remove(flight)
+        flight.done.set()
+
+    def _joined(self, flight: _Flight, start: datetime, end: datetime) -> List[Any]:
+        """Get the result of a fetch another caller made."""
+        if flight.error is not None:
+            raise flight.error
+        return self._slice(flight.window, start, end)
+
+    def _find_window(self, start: datetime, end: datetime) -> Optional[_Window]:
+        """Find a fresh window covering a period."""
+        now = self._clock()
+        return next((
+            w for w in self._windows
+            if not w.invalidated and now - w.fetched_at < self._ttl and w.covers(start, end)
+        ), None)
+
+    def _store(self, window: _Window) -> None:
+        """Store a window, replacing windows it covers."""
+        self._windows = [w for w in self._windows if not window.covers(w.start, w.end)]
+        self._windows.append(window)
+        del self._windows[:-self._max_windows]
+
+    def _slice(self, window: _Window, start: datetime, end: datetime) -> List[Any]:
+        """Get the events of a window that overlap a period."""
+        if window.start == start and window.end == end:
+            return list(window.events)
+
+        events = []
+        for event in window.events:
+            event_start, event_end = self._span(event)
+            if event_start < end and (event_end > start or event_start >= start):
+                events.append(event)
+        return events
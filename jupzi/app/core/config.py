@@ -35,15 +35,83 @@ class Config(BaseSettings):
     
     # Calendar settings
     calendar_check_interval: int = Field(
-        default=300,  # 5 minutes
+        default=300,  # 5 minutes, the first poll interval
         env='CALENDAR_CHECK_INTERVAL'
     )
+    calendar_check_interval_min: int = Field(
+        default=60,  # Right after changes were found
+        env='CALENDAR_CHECK_INTERVAL_MIN'
+    )
+    calendar_check_interval_max: int = Field(
+        default=3600,  # Backoff limit while nothing changes
+        env='CALENDAR_CHECK_INTERVAL_MAX'
+    )
+    calendar_backend: str = Field(
+        default='caldav',  # 'caldav' (blocking library) or 'async'
+        env='CALENDAR_BACKEND'
+    )
+    caldav_pool_max_connections: int = Field(
+        default=4,
+        env='CALDAV_POOL_MAX_CONNECTIONS'
+    )
+    caldav_pool_idle_timeout: int = Field(
+        default=600,  # 10 minutes
+        env='CALDAV_POOL_IDLE_TIMEOUT'
+    )
+    caldav_pool_health_check_interval: int = Field(
+        default=60,
+        env='CALDAV_POOL_HEALTH_CHECK_INTERVAL'
+    )
+    caldav_multiget_batch_size: int = Field(
+        default=50,  # Resources per calendar-multiget REPORT
+        env='CALDAV_MULTIGET_BATCH_SIZE'
+    )
+    calendar_free_busy: bool = Field(
+        default=False,  # Free dates from free-busy-query REPORTs
+        env='CALENDAR_FREE_BUSY'
+    )
+    calendar_cache_ttl: int = Field(
+        default=300,  # 5 minutes
+        env='CALENDAR_CACHE_TTL'
+    )
+    calendar_cache_horizon_days: int = Field(
+        default=21,
+        env='CALENDAR_CACHE_HORIZON_DAYS'
+    )
+    calendar_snapshot_path: Optional[str] = Field(
+        default='data/calendar_snapshot.bin',  # Empty to disable
+        env='CALENDAR_SNAPSHOT_PATH'
+    )
+    caldav_retry_attempts: int = Field(
+        default=3,  # Tries per fetch, with jittered backoff in between
+        env='CALDAV_RETRY_ATTEMPTS'
+    )
+    caldav_circuit_failure_threshold: int = Field(
+        default=3,  # Failed fetches in a row that stop calls to the server
+        env='CALDAV_CIRCUIT_FAILURE_THRESHOLD'
+    )
+    caldav_circuit_reset_timeout: int = Field(
+        default=60,  # Seconds before the server is tried again
+        env='CALDAV_CIRCUIT_RESET_TIMEOUT'
+    )
+    overview_delivery: str = Field(
+        default='edit',  # 'edit' the delivered overview or send a 'notice' of changes
+        env='OVERVIEW_DELIVERY'
+    )
     
     # Poll settings
     poll_timeout: int = Field(
         default=3600,  # 1 hour
         env='POLL_TIMEOUT'
     )
+    poll_vote_flush_interval: float = Field(
+        default=2.0,  # Longest time a vote waits before it is written
+        env='POLL_VOTE_FLUSH_INTERVAL'
+    )
+    poll_vote_flush_size: int = Field(
+        default=100,  # Pending writes that trigger an early flush
+        env='POLL_VOTE_FLUSH_SIZE'
+    )
     
     # Security
     allowed_chat_ids: list[int] = Field(default_factory=list, env='ALLOWED_CHAT_IDS')
@@ -59,6 +127,20 @@ class Config(BaseSettings):
             raise ValueError(f'Environment must be one of {allowed}')
         return v
     
+    @validator('calendar_backend')
+    def validate_calendar_backend(cls, v):
+        allowed = {'caldav', 'async'}
+        if v not in allowed:
+            raise ValueError(f'Calendar backend must be one of {allowed}')
+        return v
+    
+    @validator('overview_delivery')
+    def validate_overview_delivery(cls, v):
+        allowed = {'edit', 'notice'}
+        if v not in allowed:
+            raise ValueError(f'Overview delivery must be one of {allowed}')
+        return v
+    
     @validator('log_level')
     def validate_log_level(cls, v):
         allowed = {'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'}
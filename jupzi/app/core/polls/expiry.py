@@ -0,0 +1,64 @@
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Hashable, List, Optional, Tuple
+import heapq
+import itertools
+
+class ExpiryQueue:
+    """
+    Deadlines of open polls in a min-heap.
+
+    Finding the due polls pops them off the heap, so the work is
+    proportional to the number of expiring polls and not to all polls
+    kept. Rescheduled deadlines stay in the heap and are skipped when
+    they come up.
+    """
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, datetime] = {}
+        self._counter = itertools.count()
+        self._lock = Lock()
+
+    def schedule(self, key: Hashable, deadline: datetime) -> None:
+        """
+        Schedule a deadline, replacing an earlier one of the same key.
+
+        Args:
+            key: ID of the poll
+            deadline: When the poll expires
+        """
+        with self._lock:
+            self._deadlines[key] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._counter), key))
+
+    def pop_due(self, now: datetime) -> List[Hashable]:
+        """
+        Remove and return every key whose deadline has passed.
+
+        Args:
+            now: Current time, comparable with the deadlines
+
+        Returns:
+            Keys in deadline order
+        """
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, _, key = heapq.heappop(self._heap)
+                if self._deadlines.get(key) == deadline:
+                    del self._deadlines[key]
+                    due.append(key)
+        return due
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Get the earliest pending deadline, None if nothing is scheduled."""
+        with self._lock:
+            while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
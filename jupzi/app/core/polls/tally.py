@@ -0,0 +1,105 @@
+from typing import Dict, Hashable, Iterable, Tuple
+
+class VoteTally:
+    """
+    Vote counts per option of one poll.
+
+    Updated with every vote, retraction and change instead of counting the
+    raw votes on every read, so results cost one lookup per option. The
+    raw votes are only counted once, when a poll is loaded.
+    """
+    def __init__(self, option_ids: Iterable[Hashable]):
+        """
+        Initialize a tally with no votes.
+
+        Args:
+            option_ids: IDs of the poll's options
+        """
+        self._counts: Dict[Hashable, int] = dict.fromkeys(option_ids, 0)
+
+    @classmethod
+    def from_votes(cls, option_ids: Iterable[Hashable], voted_option_ids: Iterable[Hashable]) -> 'VoteTally':
+        """
+        Rebuild a tally from raw votes.
+
+        Args:
+            option_ids: IDs of the poll's options
+            voted_option_ids: Option ID of every vote
+
+        Returns:
+            VoteTally: The counted votes
+        """
+        tally = cls(option_ids)
+        for option_id in voted_option_ids:
+            tally.add(option_id)
+        return tally
+
+    def add(self, option_id: Hashable) -> int:
+        """
+        Count a vote for an option.
+
+        Args:
+            option_id: ID of the option
+
+        Returns:
+            int: The option's new count
+
+        Raises:
+            KeyError: If the option does not belong to the poll
+        """
+        self._counts[option_id] += 1
+        return self._counts[option_id]
+
+    def remove(self, option_id: Hashable) -> int:
+        """
+        Take back a vote for an option.
+
+        Args:
+            option_id: ID of the option
+
+        Returns:
+            int: The option's new count
+
+        Raises:
+            KeyError: If the option does not belong to the poll
+            ValueError: If the option has no votes
+        """
+        if not self._counts[option_id]:
+            raise ValueError(f"Option {option_id} has no votes to remove")
+        self._counts[option_id] -= 1
+        return self._counts[option_id]
+
+    def move(self, old_option_id: Hashable, new_option_id: Hashable) -> Tuple[int, int]:
+        """
+        Move a vote from one option to another.
+
+        Args:
+            old_option_id: ID of the option voted for before
+            new_option_id: ID of the option voted for now
+
+        Returns:
+            tuple: The new counts of the old and the new option
+
+        Raises:
+            KeyError: If an option does not belong to the poll
+            ValueError: If the old option has no votes
+        """
+        if new_option_id not in self._counts:
+            raise KeyError(new_option_id)
+        return self.remove(old_option_id), self.add(new_option_id)
+
+    def __contains__(self, option_id: Hashable) -> bool:
+        return option_id in self._counts
+
+    def count(self, option_id: Hashable) -> int:
+        """Get the number of votes for an option."""
+        return self._counts[option_id]
+
+    def counts(self) -> Dict[Hashable, int]:
+        """Get the number of votes per option ID."""
+        return dict(self._counts)
+
+    @property
+    def total(self) -> int:
+        """Total number of votes."""
+        return sum(self._counts.values())
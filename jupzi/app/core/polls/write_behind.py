@@ -0,0 +1,122 @@
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Dict, Hashable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindBuffer:
+    """
+    Collects writes in memory and hands them to a writer in batches.
+
+    Writes are keyed, and a later write replaces a pending one with the
+    same key, so a user changing their vote twice before a flush costs one
+    row. A background thread flushes every flush_interval seconds or as
+    soon as max_pending keys are waiting, which bounds how many writes a
+    crash can lose. stop() flushes whatever is left synchronously.
+    """
+    def __init__(
+        self,
+        writer: Callable[[Dict[Hashable, Any]], None],
+        flush_interval: float = 2.0,
+        max_pending: int = 100
+    ):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            writer: Writes one batch of pending values by key in a single
+                transaction, raising if nothing was written
+            flush_interval: Longest time a write waits, in seconds
+            max_pending: Number of pending keys that triggers a flush
+        """
+        self._writer = writer
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[Hashable, Any] = {}
+        self._condition = Condition()
+        self._flush_lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._stopping = False
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Queue a write, replacing a pending write of the same key.
+
+        Args:
+            key: What is written, e.g. a table and primary key
+            value: The value to write
+        """
+        with self._condition:
+            self._pending[key] = value
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write all pending values now.
+
+        Flushes run one at a time, so an older batch never lands after a
+        newer one. If the writer fails, the batch is queued again, except
+        for keys written anew in the meantime.
+
+        Returns:
+            int: Number of values written
+
+        Raises:
+            Exception: The writer's error
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                self._writer(batch)
+            except Exception:
+                with self._condition:
+                    # Newer writes of the same key win over the failed batch
+                    batch.update(self._pending)
+                    self._pending = batch
+                raise
+            return len(batch)
+
+    def start(self) -> None:
+        """Start flushing in the background."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background flushes and write everything still pending.
+
+        Raises:
+            Exception: The writer's error on the final flush
+        """
+        if self._thread is not None:
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        """Flush on every interval or when enough writes are pending."""
+        while True:
+            with self._condition:
+                if not self._stopping and len(self._pending) < self.max_pending:
+                    self._condition.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                # The batch was queued again and is retried on the next round
+                logger.error(f"Write-behind flush failed: {str(e)}")
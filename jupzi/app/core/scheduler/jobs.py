@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import asyncio
 import logging
 
 from app.core.base_service import BaseService
+from app.core.calendar.overview_diff import WeekOverview, changed_chunks, diff_overviews
 from app.core.config import Config
+from app.core.scheduler.scheduler import JobScheduler
 from app.models.jobs import Job
 from app.services.calendar import CalendarService
 from app.services.poll import PollService
@@ -32,6 +35,7 @@ class WeeklyPollJob:
             
             # Send poll to Telegram
             await self.telegram_service.send_poll(poll)
+            self.poll_service.save_poll_message(poll)
             
             # Store current poll info
             self._current_poll = {
@@ -54,27 +58,153 @@ class WeeklyPollJob:
         next_monday = today + timedelta(days=days_until_monday)
         return next_monday.strftime("%d.%m.")
 
+class PollExpiryJob:
+    """
+    Job for closing polls exactly when they expire.
+    
+    Waits for the earliest deadline of the poll service's expiry queue
+    and wakes up early when a poll with an earlier deadline is created.
+    Closed polls are stopped in Telegram and their results are posted.
+    """
+    
+    def __init__(self, poll_service: PollService, telegram_service: TelegramService):
+        self.poll_service = poll_service
+        self.telegram_service = telegram_service
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        poll_service.add_expiry_listener(self.wake)
+
+    def wake(self) -> None:
+        """Let the waiting job look at the deadlines again, from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self) -> None:
+        """Close expiring polls until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            deadline = self.poll_service.next_expiry()
+            timeout = None if deadline is None else max((deadline - datetime.utcnow()).total_seconds(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.execute()
+            except Exception:
+                # Already logged, keep closing the polls that follow
+                pass
+
+    async def execute(self) -> None:
+        """Execute the poll expiry job."""
+        try:
+            for poll in self.poll_service.close_expired_polls():
+                # A poll that cannot be stopped must not keep the others open
+                try:
+                    if poll.message_id is not None:
+                        await self.telegram_service.stop_poll(poll)
+                    results = self.poll_service.format_poll_results(poll)
+                    await self.telegram_service.send_message(results, poll.chat_id)
+                    logger.info(f"Poll {poll.id} closed and results posted")
+                except Exception as e:
+                    logger.error(f"Failed to post results of poll {poll.id}: {str(e)}")
+        except Exception as e:
+            logger.error(f"Failed to execute poll expiry job: {str(e)}")
+            raise
+
 class WeeklyOverviewJob:
-    """Job for generating and sending weekly overview."""
+    """
+    Job for generating and sending weekly overview.
+    
+    The overview is sent once per week. Later runs compare the current
+    events with the ones delivered and only act on changes: the sent
+    messages are edited in place, or a short notice lists the changed
+    events. Runs without changes send nothing.
+    
+    _delivered is the overview the chat was last told about and
+    _shown_chunks the texts the sent messages show; both are updated
+    together once a run has delivered its changes.
+    """
     
     def __init__(self, calendar_service: CalendarService, telegram_service: TelegramService):
         self.calendar_service = calendar_service
         self.telegram_service = telegram_service
+        self._delivery = calendar_service.get_config_value('overview_delivery', 'edit')
+        self._delivered: Optional[WeekOverview] = None
+        self._message_ids: List[int] = []
+        self._shown_chunks: List[str] = []
 
     async def execute(self) -> None:
         """Execute the weekly overview job."""
         try:
-            # Generate overview
-            overview = self.calendar_service.generate_week_overview()
+            overview = await self.calendar_service.get_week_overview_async()
             
-            # Send to Telegram
-            await self.telegram_service.send_message(overview)
+            # A new week gets the full overview
+            if self._delivered is None or self._delivered.week_start != overview.week_start:
+                messages = await self.telegram_service.send_messages(overview.chunks)
+                self._message_ids = [message.message_id for message in messages]
+                self._shown_chunks = list(overview.chunks)
+                self._delivered = overview
+                logger.info("Weekly overview sent successfully")
+                return
+            
+            # Data served during an outage is no newer than what was delivered
+            if overview.stale:
+                logger.info("Calendar unavailable, delivered weekly overview kept")
+                return
             
-            logger.info("Weekly overview sent successfully")
+            diff = diff_overviews(self._delivered, overview)
+            if diff.is_empty():
+                logger.info("Weekly overview unchanged, nothing sent")
+                return
+            
+            if self._delivery == 'edit' and await self._edit(overview):
+                self._shown_chunks = list(overview.chunks)
+                logger.info("Weekly overview edited in place")
+            else:
+                notice = self.calendar_service.format_overview_changes(overview, diff)
+                await self.telegram_service.send_messages(notice)
+                logger.info("Weekly overview changes sent")
+            self._delivered = overview
         except Exception as e:
             logger.error(f"Failed to execute weekly overview job: {str(e)}")
             raise
 
+    async def _edit(self, overview: WeekOverview) -> bool:
+        """
+        Edit the delivered overview messages to show the current overview.
+        
+        If an edit fails, the messages edited before are changed back, so
+        the overview never shows a mix of two versions next to the notice.
+        
+        Returns:
+            bool: False if the overview no longer fits the sent messages
+            or editing failed, so a notice has to be sent instead
+        """
+        if len(overview.chunks) != len(self._message_ids):
+            return False
+        edited = []
+        try:
+            for index, text in changed_chunks(self._shown_chunks, overview.chunks):
+                await self.telegram_service.edit_message(self._message_ids[index], text)
+                edited.append((index, text))
+        except Exception as e:
+            logger.warning(f"Failed to edit weekly overview: {str(e)}")
+            await self._roll_back(edited)
+            return False
+        return True
+
+    async def _roll_back(self, edited: List[Tuple[int, str]]) -> None:
+        """Change edited overview messages back to the texts they showed before."""
+        for index, text in edited:
+            try:
+                await self.telegram_service.edit_message(self._message_ids[index], self._shown_chunks[index])
+            except Exception as e:
+                # The message keeps the new text, remember that it shows it
+                self._shown_chunks[index] = text
+                logger.warning(f"Failed to restore weekly overview message {index}: {str(e)}")
+
 class FreeDatesJob:
     """Job for finding and reporting free dates."""
     
@@ -86,12 +216,41 @@ class FreeDatesJob:
         """Execute the free dates job."""
         try:
             # Get free dates
-            free_dates = self.calendar_service.get_free_dates()
+            free_dates = await self.calendar_service.get_free_dates_messages_async()
             
             # Send to Telegram
-            await self.telegram_service.send_message(free_dates)
+            await self.telegram_service.send_messages(free_dates)
             
             logger.info("Free dates report sent successfully")
         except Exception as e:
             logger.error(f"Failed to execute free dates job: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+class CalendarSyncJob:
+    """
+    Job for polling the calendars for changes.
+    
+    The poll interval adapts to how often the calendars change; after
+    every run the job is rescheduled with the interval the calendar
+    service suggests.
+    """
+    
+    def __init__(self, calendar_service: CalendarService, scheduler: Optional[JobScheduler] = None,
+                 job_id: str = 'calendar-sync'):
+        self.calendar_service = calendar_service
+        self.scheduler = scheduler
+        self.job_id = job_id
+
+    async def execute(self) -> None:
+        """Execute the calendar sync job."""
+        try:
+            interval = await asyncio.to_thread(self.calendar_service.poll_calendar)
+            
+            # Poll sooner after changes, back off while nothing changes
+            if self.scheduler is not None:
+                self.scheduler.reschedule_interval(self.job_id, interval)
+            
+            logger.info(f"Calendar polled, next poll in {interval:.0f} seconds")
+        except Exception as e:
+            logger.error(f"Failed to execute calendar sync job: {str(e)}")
+            raise
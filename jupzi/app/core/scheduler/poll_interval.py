@@ -0,0 +1,95 @@
+from collections import deque
+from threading import Lock
+from typing import Callable, Dict, List, NamedTuple
+import time
+
+class PollResult(NamedTuple):
+    """Outcome of one poll."""
+    polled_at: float
+    changed: bool
+    next_interval: float
+
+class AdaptivePollInterval:
+    """
+    Poll interval that follows the observed change rate.
+
+    A poll that finds changes drops the interval to the minimum, since
+    edits tend to come in bursts. Every quiet poll multiplies it by the
+    backoff factor up to the maximum, so an idle calendar is polled
+    rarely.
+    """
+    def __init__(
+        self,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        backoff: float = 2.0,
+        history_size: int = 100,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the interval.
+
+        Args:
+            initial: Interval before the first poll, in seconds
+            minimum: Shortest interval, used right after changes
+            maximum: Longest interval during quiet periods
+            backoff: Factor the interval grows by per quiet poll
+            history_size: Number of polls kept in the history
+            clock: Time source for the history
+        """
+        if not 0 < minimum <= maximum:
+            raise ValueError("Poll interval bounds must satisfy 0 < minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self._interval = min(max(initial, minimum), maximum)
+        self._history: 'deque[PollResult]' = deque(maxlen=history_size)
+        self._clock = clock
+        self._lock = Lock()
+
+    @property
+    def current(self) -> float:
+        """Seconds until the next poll."""
+        return self._interval
+
+    def record(self, changed: bool) -> float:
+        """
+        Record the outcome of a poll and adapt the interval.
+
+        Args:
+            changed: Whether the poll found changes
+
+        Returns:
+            float: Seconds until the next poll
+        """
+        with self._lock:
+            if changed:
+                self._interval = self.minimum
+            else:
+                self._interval = min(self._interval * self.backoff, self.maximum)
+            self._history.append(PollResult(self._clock(), changed, self._interval))
+            return self._interval
+
+    def history(self) -> List[PollResult]:
+        """Get the recorded polls, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get poll statistics over the history.
+
+        Returns:
+            Dictionary with the number of polls and changes, the share of
+            polls that found changes and the current interval
+        """
+        with self._lock:
+            polls = len(self._history)
+            changes = sum(1 for result in self._history if result.changed)
+            return {
+                'polls': polls,
+                'changes': changes,
+                'change_rate': changes / polls if polls else 0.0,
+                'interval': self._interval
+            }
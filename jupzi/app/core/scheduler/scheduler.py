@@ -1,7 +1,9 @@
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.cron import CronTrigger
@@ -26,7 +28,10 @@ class JobScheduler:
         self.config = config
         self.scheduler = BackgroundScheduler(
             jobstores={
-                'default': SQLAlchemyJobStore(url=config.database_url if config else 'sqlite:///jobs.db')
+                'default': SQLAlchemyJobStore(url=config.database_url if config else 'sqlite:///jobs.db'),
+                # Jobs bound to live services cannot be persisted, they are
+                # set up again on every start
+                'memory': MemoryJobStore()
             },
             executors={
                 'default': ThreadPoolExecutor(20)
@@ -37,6 +42,16 @@ class JobScheduler:
             }
         )
         self._is_running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def set_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Run coroutine jobs on a running event loop, e.g. the bot's.
+        
+        Args:
+            loop: The loop the coroutines are handed to
+        """
+        self._loop = loop
 
     def start(self) -> None:
         """Start the scheduler."""
@@ -48,7 +63,9 @@ class JobScheduler:
     def stop(self) -> None:
         """Stop the scheduler."""
         if self._is_running:
-            self.scheduler.shutdown()
+            # A job waiting for the event loop must not block a shutdown
+            # called from that loop
+            self.scheduler.shutdown(wait=self._loop is None)
             self._is_running = False
             logger.info("Job scheduler stopped")
 
@@ -79,6 +96,36 @@ class JobScheduler:
             logger.error(f"Failed to add job {job.name}: {str(e)}")
             raise
 
+    def add_interval_job(self, job_id: str, func: Callable[[], Any], seconds: float) -> None:
+        """
+        Run a callable every given number of seconds, starting right away.
+        
+        Coroutine functions are run to completion on the loop given to
+        set_event_loop, or on a loop of their own without one. The job can
+        change its interval with reschedule_interval.
+        
+        Args:
+            job_id: ID of the job
+            func: Callable without arguments, e.g. a job's execute method
+            seconds: Interval between runs
+        """
+        try:
+            self.scheduler.add_job(
+                func=self._run_callable,
+                trigger='interval',
+                seconds=seconds,
+                args=[func],
+                id=job_id,
+                name=job_id,
+                jobstore='memory',
+                next_run_time=datetime.now(),
+                replace_existing=True
+            )
+            logger.info(f"Added interval job: {job_id} (every {seconds:.0f}s)")
+        except Exception as e:
+            logger.error(f"Failed to add job {job_id}: {str(e)}")
+            raise
+
     def remove_job(self, job_id: int) -> None:
         """
         Remove a job from the scheduler.
@@ -93,6 +140,21 @@ class JobScheduler:
             logger.error(f"Failed to remove job {job_id}: {str(e)}")
             raise
 
+    def reschedule_interval(self, job_id: Union[int, str], seconds: float) -> None:
+        """
+        Let a job run every given number of seconds from now on.
+        
+        Args:
+            job_id: ID of the job to reschedule
+            seconds: New interval
+        """
+        try:
+            self.scheduler.reschedule_job(str(job_id), trigger='interval', seconds=seconds)
+            logger.debug(f"Rescheduled job {job_id} to run every {seconds:.0f}s")
+        except Exception as e:
+            logger.error(f"Failed to reschedule job {job_id}: {str(e)}")
+            raise
+
     def get_job(self, job_id: int) -> Optional[Dict]:
         """
         Get information about a scheduled job.
@@ -132,6 +194,16 @@ class JobScheduler:
             logger.error(f"Failed to execute job {job.name}: {str(e)}")
             raise
 
+    def _run_callable(self, func: Callable[[], Any]) -> None:
+        """Run an interval job, awaiting it if it is a coroutine function."""
+        result = func()
+        if not asyncio.iscoroutine(result):
+            return
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(result, self._loop).result()
+        else:
+            asyncio.run(result)
+
     def is_running(self) -> bool:
         """Check if the scheduler is currently running."""
         return self._is_running 
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Calendar event mirror
+
+Revision ID: 3b7c1f2a9d40
+Revises: e9342aeb5a83
+Create Date: 2026-10-16 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1f2a9d40'
+down_revision: Union[str, None] = 'e9342aeb5a83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite cannot alter columns in place, batch mode copies the table there
+    with op.batch_alter_table('calendar_events') as batch_op:
+        batch_op.alter_column('job_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('event_date', existing_type=sa.Date(), nullable=True)
+        batch_op.alter_column('event_location', existing_type=sa.String(), new_column_name='location')
+        batch_op.add_column(sa.Column('title', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('description', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('start_time', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('end_time', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('calendar_url', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('href', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('uid', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('etag', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('ical_data', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('is_recurring', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.create_unique_constraint('uq_calendar_event_href', ['href'])
+        batch_op.create_index('idx_calendar_event_calendar_url', ['calendar_url'])
+        batch_op.create_index('idx_calendar_event_start_time', ['start_time'])
+    # Existing rows only have a date and a summary, both are required now
+    op.execute(
+        "UPDATE calendar_events SET title = COALESCE(event_summary, ''), "
+        "start_time = event_date, end_time = event_date"
+    )
+    with op.batch_alter_table('calendar_events') as batch_op:
+        batch_op.alter_column('title', existing_type=sa.String(), nullable=False)
+        batch_op.alter_column('start_time', existing_type=sa.DateTime(), nullable=False)
+        batch_op.alter_column('end_time', existing_type=sa.DateTime(), nullable=False)
+    op.create_table('calendar_sync_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('calendar_url', sa.String(), nullable=False),
+    sa.Column('sync_token', sa.String(), nullable=True),
+    sa.Column('ctag', sa.String(), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('calendar_url')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('calendar_sync_state')
+    # Mirrored events do not fit the old schema, they are synced again after an upgrade
+    op.execute("DELETE FROM calendar_events WHERE job_id IS NULL OR event_date IS NULL")
+    with op.batch_alter_table('calendar_events') as batch_op:
+        batch_op.drop_index('idx_calendar_event_start_time')
+        batch_op.drop_index('idx_calendar_event_calendar_url')
+        batch_op.drop_constraint('uq_calendar_event_href', type_='unique')
+        for column in ('is_recurring', 'ical_data', 'etag', 'uid', 'href', 'calendar_url',
+                       'updated_at', 'end_time', 'start_time', 'description', 'title'):
+            batch_op.drop_column(column)
+        batch_op.alter_column('location', existing_type=sa.String(), new_column_name='event_location')
+        batch_op.alter_column('event_date', existing_type=sa.Date(), nullable=False)
+        batch_op.alter_column('job_id', existing_type=sa.Integer(), nullable=False)
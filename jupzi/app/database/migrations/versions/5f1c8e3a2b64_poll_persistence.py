@@ -0,0 +1,70 @@
+"""Poll persistence
+
+Revision ID: 5f1c8e3a2b64
+Revises: 7d2e4a6c8b13
+Create Date: 2026-10-16 17:41:09.226318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1c8e3a2b64'
+down_revision: Union[str, None] = '7d2e4a6c8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('polls', 'telegram_poll_id', existing_type=sa.String(), nullable=True)
+    op.alter_column('polls', 'chat_id', existing_type=sa.Integer(), type_=sa.BigInteger(), nullable=True)
+    op.alter_column('polls', 'message_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('polls', 'start_time', existing_type=sa.DateTime(), nullable=True)
+    op.alter_column('polls', 'end_time', existing_type=sa.DateTime(), nullable=True)
+    op.alter_column('polls', 'status', existing_type=sa.String(), nullable=True)
+    op.add_column('polls', sa.Column('title', sa.String(), server_default='', nullable=False))
+    op.add_column('polls', sa.Column('creator_id', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('polls', sa.Column('is_anonymous', sa.Boolean(), nullable=True))
+    op.add_column('polls', sa.Column('allows_multiple_answers', sa.Boolean(), nullable=True))
+    op.add_column('polls', sa.Column('expires_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('polls', sa.Column('is_closed', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_unique_constraint('uq_poll_telegram_poll_id', 'polls', ['telegram_poll_id'])
+    op.create_table('poll_options',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('poll_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.String(), nullable=False),
+    sa.Column('vote_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['poll_id'], ['polls.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('poll_votes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('poll_id', sa.Integer(), nullable=False),
+    sa.Column('option_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['option_id'], ['poll_options.id'], ),
+    sa.ForeignKeyConstraint(['poll_id'], ['polls.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('poll_id', 'user_id', 'option_id', name='uq_poll_vote')
+    )
+    op.create_index('idx_poll_vote_voter', 'poll_votes', ['poll_id', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_poll_vote_voter', table_name='poll_votes')
+    op.drop_table('poll_votes')
+    op.drop_table('poll_options')
+    op.drop_constraint('uq_poll_telegram_poll_id', 'polls', type_='unique')
+    for column in ('is_closed', 'expires_at', 'allows_multiple_answers', 'is_anonymous', 'creator_id', 'title'):
+        op.drop_column('polls', column)
+    op.alter_column('polls', 'status', existing_type=sa.String(), nullable=False)
+    op.alter_column('polls', 'end_time', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('polls', 'start_time', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('polls', 'message_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('polls', 'chat_id', existing_type=sa.BigInteger(), type_=sa.Integer(), nullable=False)
+    op.alter_column('polls', 'telegram_poll_id', existing_type=sa.String(), nullable=False)
@@ -0,0 +1,26 @@
+"""Calendar event sequence
+
+Revision ID: 7d2e4a6c8b13
+Revises: 3b7c1f2a9d40
+Create Date: 2026-10-16 14:03:27.540911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4a6c8b13'
+down_revision: Union[str, None] = '3b7c1f2a9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('calendar_events', sa.Column('sequence', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('calendar_events', 'sequence')
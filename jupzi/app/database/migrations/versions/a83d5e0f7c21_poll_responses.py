@@ -0,0 +1,33 @@
+"""Poll responses
+
+Revision ID: a83d5e0f7c21
+Revises: 5f1c8e3a2b64
+Create Date: 2026-10-16 19:05:52.873140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83d5e0f7c21'
+down_revision: Union[str, None] = '5f1c8e3a2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Telegram user and chat IDs do not fit into 32 bits
+    op.alter_column('poll_responses', 'user_id', existing_type=sa.Integer(), type_=sa.BigInteger())
+    op.alter_column('poll_votes', 'user_id', existing_type=sa.Integer(), type_=sa.BigInteger())
+    op.alter_column('polls', 'creator_id', existing_type=sa.Integer(), type_=sa.BigInteger())
+    op.create_unique_constraint('uq_poll_response_voter', 'poll_responses', ['poll_id', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_poll_response_voter', 'poll_responses', type_='unique')
+    op.alter_column('polls', 'creator_id', existing_type=sa.BigInteger(), type_=sa.Integer())
+    op.alter_column('poll_votes', 'user_id', existing_type=sa.BigInteger(), type_=sa.Integer())
+    op.alter_column('poll_responses', 'user_id', existing_type=sa.BigInteger(), type_=sa.Integer())
@@ -1,5 +1,5 @@
 from .polls import Poll, PollResponse
 from .jobs import Job, JobMetadata
-from .calendar_events import CalendarEvent
+from .calendar_events import CalendarEvent, CalendarSyncState
 
-__all__ = ['Poll', 'PollResponse', 'Job', 'JobMetadata', 'CalendarEvent'] 
\ No newline at end of file
+__all__ = ['Poll', 'PollResponse', 'Job', 'JobMetadata', 'CalendarEvent', 'CalendarSyncState'] 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 
 from app.utils.database import Base
@@ -16,10 +16,38 @@ class CalendarEvent(Base):
     location = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
+    # CalDAV mirror fields (set for events synced from the server)
+    calendar_url = Column(String)
+    href = Column(String, unique=True)
+    uid = Column(String)
+    sequence = Column(Integer, default=0, nullable=False)
+    etag = Column(String)
+    ical_data = Column(Text)
+    is_recurring = Column(Boolean, default=False, nullable=False)
+
     # Relationships
     job_id = Column(Integer, ForeignKey('jobs.id'))
     job = relationship("Job", back_populates="calendar_events")
-    
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_calendar_event_calendar_url', 'calendar_url'),
+        Index('idx_calendar_event_start_time', 'start_time'),
+    )
+
+    def __repr__(self):
+        return f"<CalendarEvent(id={self.id}, title='{self.title}', start_time='{self.start_time}')>"
+
+class CalendarSyncState(Base):
+    """Model for the sync state of a mirrored CalDAV collection."""
+    __tablename__ = 'calendar_sync_state'
+
+    id = Column(Integer, primary_key=True)
+    calendar_url = Column(String, nullable=False, unique=True)
+    sync_token = Column(String)
+    ctag = Column(String)
+    last_synced_at = Column(DateTime)
+
     def __repr__(self):
-        return f"<CalendarEvent(id={self.id}, title='{self.title}', start_time='{self.start_time}')>" 
\ No newline at end of file
+        return f"<CalendarSyncState(calendar_url='{self.calendar_url}', sync_token='{self.sync_token}')>"
@@ -2,7 +2,7 @@ from datetime import datetime, UTC
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index, CheckConstraint
 from sqlalchemy.orm import relationship
 
-from utils.database import Base
+from app.utils.database import Base
 
 class Job(Base):
     __tablename__ = 'jobs'
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.utils.database import Base
@@ -10,15 +10,20 @@ class Poll(Base):
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
-    creator_id = Column(Integer, nullable=False)
+    creator_id = Column(BigInteger, nullable=False)
     is_anonymous = Column(Boolean, default=True)
     allows_multiple_answers = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     expires_at = Column(DateTime, nullable=False)
+    is_closed = Column(Boolean, default=False, nullable=False)
+    telegram_poll_id = Column(String, nullable=True, unique=True)
+    chat_id = Column(BigInteger, nullable=True)
+    message_id = Column(Integer, nullable=True)
     
     # Relationships
-    options = relationship("PollOption", back_populates="poll", cascade="all, delete-orphan")
+    options = relationship("PollOption", back_populates="poll", cascade="all, delete-orphan", order_by="PollOption.id")
     votes = relationship("PollVote", back_populates="poll", cascade="all, delete-orphan")
+    responses = relationship("PollResponse", back_populates="poll", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Poll(id={self.id}, title='{self.title}')>"
@@ -30,6 +35,7 @@ class PollOption(Base):
     id = Column(Integer, primary_key=True)
     poll_id = Column(Integer, ForeignKey('polls.id'), nullable=False)
     text = Column(String, nullable=False)
+    vote_count = Column(Integer, nullable=False, default=0, server_default='0')
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -46,12 +52,39 @@ class PollVote(Base):
     id = Column(Integer, primary_key=True)
     poll_id = Column(Integer, ForeignKey('polls.id'), nullable=False)
     option_id = Column(Integer, ForeignKey('poll_options.id'), nullable=False)
-    user_id = Column(Integer, nullable=False)
+    user_id = Column(BigInteger, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     poll = relationship("Poll", back_populates="votes")
     option = relationship("PollOption", back_populates="votes")
     
+    # One row per chosen option, replaced as a whole when a voter answers again
+    __table_args__ = (
+        UniqueConstraint('poll_id', 'user_id', 'option_id', name='uq_poll_vote'),
+        Index('idx_poll_vote_voter', 'poll_id', 'user_id'),
+    )
+    
+    def __repr__(self):
+        return f"<PollVote(id={self.id}, user_id={self.user_id})>"
+
+class PollResponse(Base):
+    """Model for a voter's current answer to a poll, as given in Telegram."""
+    __tablename__ = 'poll_responses'
+
+    id = Column(Integer, primary_key=True)
+    poll_id = Column(Integer, ForeignKey('polls.id'), nullable=False)
+    user_id = Column(BigInteger, nullable=False)
+    username = Column(String, nullable=True)
+    response = Column(String, nullable=False)
+    responded_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    poll = relationship("Poll", back_populates="responses")
+    
+    __table_args__ = (
+        UniqueConstraint('poll_id', 'user_id', name='uq_poll_response_voter'),
+    )
+    
     def __repr__(self):
-        return f"<PollVote(id={self.id}, user_id={self.user_id})>" 
\ No newline at end of file
+        return f"<PollResponse(id={self.id}, user_id={self.user_id}, response='{self.response}')>"
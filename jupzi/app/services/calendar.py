@@ -1,15 +1,53 @@
-from typing import List, Optional, Dict, Set
-from datetime import datetime, timedelta
+from typing import Hashable, Iterable, Iterator, List, Optional, Dict, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import threading
+import time
+
+import httpx
+from caldav.lib.error import DAVError
 
 from app.core.base_service import BaseService
+from app.core.calendar.async_client import AsyncCalDAVClient
+from app.core.calendar.dav_pool import configure_dav_pool
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.event_store import EventStore
+from app.core.calendar.freebusy import BusyPeriod, parse_busy_periods
+from app.core.calendar.merge import fetch_parallel, fetch_parallel_async
+from app.core.calendar.occupancy import DayOccupancy
+from app.core.calendar.overview_diff import OverviewDiff, WeekOverview, keyed_fragments
+from app.core.calendar.render import EventRenderCache
+from app.core.calendar.resilience import CircuitBreaker, StaleEvents, retry, retry_async
+from app.core.calendar.snapshot import CalendarSnapshot, write_snapshot
+from app.core.calendar.sync import CalendarSync
+from app.core.calendar.window_cache import CalendarWindowCache
 from app.core.config import Config
+from app.core.scheduler.poll_interval import AdaptivePollInterval, PollResult
 from app.models.calendar_events import CalendarEvent
-from app.utils.calendar_utils import get_calendar_client, get_local_time, format_event, get_event_sort_key
+from app.utils.database import Database
+from app.utils.message_builder import MessageBuilder
+from app.utils.calendar_utils import (
+    LOCAL_TIMEZONE,
+    get_calendar_clients,
+    get_async_calendar_clients,
+    release_calendar_clients,
+    get_local_time,
+    get_start_of_day,
+    get_event_span,
+    get_event_start
+)
 from app.utils.templates import (
+    CHANGED_EVENTS_HEADER,
+    CHANGED_EVENTS_LABELS,
     WEEKDAY_TRANSLATIONS,
     FOOTER_TEXT,
     FREE_DAYS_HEADER,
+    FREE_DAYS_PERIOD_DAYS,
+    FREE_DAYS_PERIODS,
+    NO_FREE_DAYS_TEXT,
+    STALE_DATA_NOTICE,
     WEEKLY_OVERVIEW_HEADER
 )
 
@@ -21,17 +59,63 @@ class CalendarService(BaseService):
     """
     def __init__(self, config: Config):
         super().__init__(config)
-        self._check_interval = self.get_config_value('calendar_check_interval', 300)
-        self._events: List[CalendarEvent] = []
-        self._calendar_client = None
+        self._poll_interval = AdaptivePollInterval(
+            initial=self.get_config_value('calendar_check_interval', 300),
+            minimum=self.get_config_value('calendar_check_interval_min', 60),
+            maximum=self.get_config_value('calendar_check_interval_max', 3600)
+        )
+        self._events = EventStore()
+        self._calendar_clients = []
+        self._db: Optional[Database] = None
+        self._syncs: List[CalendarSync] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._backend = self.get_config_value('calendar_backend', 'caldav')
+        self._async_clients: List[AsyncCalDAVClient] = []
+        self._free_busy = self.get_config_value('calendar_free_busy', False)
+        self._render_cache = EventRenderCache()
+        self._cache_horizon_days = self.get_config_value('calendar_cache_horizon_days', 21)
+        self._cache = CalendarWindowCache(
+            ttl=self.get_config_value('calendar_cache_ttl', 300),
+            span=get_event_span,
+            widen=self._widen_window
+        )
+        self._snapshot_path = self.get_config_value('calendar_snapshot_path', None)
+        self._snapshot: Optional[CalendarSnapshot] = None
+        self._reconciling = threading.Event()
+        self._breaker = CircuitBreaker(
+            failure_threshold=self.get_config_value('caldav_circuit_failure_threshold', 3),
+            reset_timeout=self.get_config_value('caldav_circuit_reset_timeout', 60)
+        )
+        self._retry_attempts = self.get_config_value('caldav_retry_attempts', 3)
+        self._revalidating = threading.Event()
 
     def initialize(self) -> None:
         """Initialize the calendar service."""
         try:
-            self._calendar_client = get_calendar_client()
-            if not self._calendar_client:
+            configure_dav_pool(
+                max_connections=self.get_config_value('caldav_pool_max_connections', 4),
+                idle_timeout=self.get_config_value('caldav_pool_idle_timeout', 600),
+                health_check_interval=self.get_config_value('caldav_pool_health_check_interval', 60)
+            )
+            self._calendar_clients = get_calendar_clients()
+            if not self._calendar_clients:
                 raise RuntimeError("Failed to initialize calendar client")
-                
+
+            self._db = Database(self.config)
+            batch_size = self.get_config_value('caldav_multiget_batch_size', 50)
+            self._syncs = [
+                CalendarSync(calendar, self._db, multiget_batch_size=batch_size)
+                for calendar in self._calendar_clients
+            ]
+            # One worker per calendar, so all calendars are fetched at once
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self._syncs),
+                thread_name_prefix='calendar-fetch'
+            )
+
+            if self._backend == 'async':
+                self._async_clients = get_async_calendar_clients()
+
             # Load existing events from database
             self._load_events()
             self._is_initialized = True
@@ -43,14 +127,334 @@ class CalendarService(BaseService):
     def cleanup(self) -> None:
         """Clean up calendar service resources."""
         self._events.clear()
-        self._calendar_client = None
+        self._cache.invalidate()
+        self._render_cache.clear()
+        self._snapshot = None
+        release_calendar_clients(self._calendar_clients)
+        self._calendar_clients = []
+        for client in self._async_clients:
+            self._close_async_client(client)
+        self._async_clients = []
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._syncs = []
+        self._db = None
         self._is_initialized = False
         self.log_info("Calendar service cleaned up")
 
     def _load_events(self) -> None:
-        """Load events from the database."""
-        # TODO: Implement database loading
-        pass
+        """
+        Load the snapshot of the last run and reconcile with the server in
+        the background.
+        
+        While the reconcile is pending, requests the snapshot covers are
+        answered from it without touching the database or the server.
+        Afterwards it only stands in as stale data while the calendars
+        cannot be reached, until the first successful sync or fetch
+        retires it.
+        """
+        if self._snapshot_path:
+            try:
+                self._snapshot = CalendarSnapshot(self._snapshot_path, LOCAL_TIMEZONE.tz)
+                self._reconciling.set()
+                self.log_info(f"Loaded calendar snapshot with {len(self._snapshot)} events")
+            except FileNotFoundError:
+                self.log_info("No calendar snapshot found")
+            except (OSError, ValueError) as e:
+                self.log_error("Failed to load calendar snapshot", e)
+
+        threading.Thread(target=self._reconcile, name='calendar-reconcile', daemon=True).start()
+
+    def _reconcile(self) -> None:
+        """Synchronize all calendars and warm the window cache, which retires the snapshot."""
+        today = get_start_of_day(get_local_time().date())
+        try:
+            self._cache.get(today, today, self._guarded_load)
+            self.log_info("Calendar snapshot reconciled")
+        except Exception as e:
+            self.log_error("Failed to reconcile calendar snapshot", e)
+        finally:
+            # Requests go to the server from now on, even if it failed
+            self._reconciling.clear()
+
+    def _retire_snapshot(self) -> None:
+        """Stop using the snapshot once live data has been loaded."""
+        if self._snapshot is None:
+            return
+        # Readers holding the snapshot keep it mapped until they are done
+        self._snapshot = None
+        self.log_info("Calendar snapshot retired")
+
+    def _pending_snapshot(self, start: datetime, end: datetime) -> Optional[List[EventRecord]]:
+        """Get the snapshot's events of a period while the startup reconcile is pending."""
+        snapshot = self._snapshot
+        if not self._reconciling.is_set() or snapshot is None or not snapshot.covers(start, end):
+            return None
+        return snapshot.between(start, end)
+
+    def _save_snapshot(self, events: List[EventRecord], start: datetime, end: datetime) -> None:
+        """Write the events of a freshly loaded window to the snapshot file."""
+        if not self._snapshot_path:
+            return
+        try:
+            write_snapshot(self._snapshot_path, events, get_event_span, (start, end))
+        except OSError as e:
+            self.log_error("Failed to write calendar snapshot", e)
+
+    def sync_calendar(self) -> bool:
+        """
+        Synchronize the local event mirror with all calendars.
+        
+        Returns:
+            True if the mirror changed
+        """
+        # Collect every result so all calendars are synchronized
+        changed = any(list(self._executor.map(CalendarSync.sync, self._syncs)))
+        self._retire_snapshot()
+        if changed:
+            self._cache.invalidate()
+        return changed
+
+    def poll_calendar(self) -> float:
+        """
+        Synchronize all calendars as a scheduled poll and adapt the poll
+        interval to the outcome.
+        
+        A failed poll counts as a quiet one, so an unreachable server is
+        polled less often. While the circuit breaker is open the poll does
+        not reach the server at all.
+        
+        Returns:
+            float: Seconds until the next poll
+        """
+        try:
+            changed = self._breaker.call(self.sync_calendar)
+        except Exception as e:
+            self.log_error("Calendar poll failed", e)
+            changed = False
+        interval = self._poll_interval.record(changed)
+        self.log_debug(f"Calendar poll {'found changes' if changed else 'found nothing new'}, next in {interval:.0f}s")
+        return interval
+
+    def get_poll_interval(self) -> float:
+        """Get the seconds until the next scheduled calendar poll."""
+        return self._poll_interval.current
+
+    def get_poll_history(self) -> List[PollResult]:
+        """Get the recent calendar polls and whether they found changes, oldest first."""
+        return self._poll_interval.history()
+
+    def refresh_calendar(self) -> bool:
+        """
+        Reconcile the whole local event mirror with all calendars by etag.
+        
+        Unlike sync_calendar this does not trust the ctag or sync token.
+        Only hrefs and etags are listed and changed events are fetched in
+        calendar-multiget batches, so a refresh without changes costs one
+        small request per calendar.
+        
+        Returns:
+            True if the mirror changed
+        """
+        changed = any(list(self._executor.map(lambda sync: sync.sync(full=True), self._syncs)))
+        self._retire_snapshot()
+        if changed:
+            self._cache.invalidate()
+        return changed
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss statistics of the calendar window cache."""
+        return self._cache.stats()
+
+    def _fetch_events(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """
+        Get all event occurrences in a time period.
+        
+        Served from the window cache, which is shared by all jobs and
+        commands; misses are loaded from the local mirror of every
+        calendar in parallel and merged in start order. If the calendars
+        cannot be reached, the last good data is served as StaleEvents.
+        
+        Args:
+            start: Start of the period
+            end: End of the period
+            
+        Returns:
+            List of event records, one per occurrence
+            
+        Raises:
+            Exception: If loading failed and no earlier data covers the period
+        """
+        events = self._pending_snapshot(start, end)
+        if events is not None:
+            return events
+        try:
+            return self._cache.get(start, end, self._guarded_load)
+        except Exception as e:
+            return self._serve_stale(start, end, e)
+
+    async def _fetch_events_async(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """
+        Get all event occurrences in a time period without blocking the
+        event loop.
+        
+        With the async backend the calendars are queried through the
+        non-blocking clients, otherwise the blocking path runs in a thread.
+        
+        Args:
+            start: Start of the period
+            end: End of the period
+            
+        Returns:
+            List of event records, one per occurrence
+        """
+        events = self._pending_snapshot(start, end)
+        if events is not None:
+            return events
+        if not self._async_clients:
+            return await asyncio.to_thread(self._fetch_events, start, end)
+        try:
+            return await self._cache.get_async(start, end, self._guarded_search_async)
+        except Exception as e:
+            return self._serve_stale(start, end, e)
+
+    def _guarded_load(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """Load a window through the circuit breaker, retrying failures with backoff."""
+        events = self._breaker.call(
+            lambda: retry(lambda: self._load_window(start, end), attempts=self._retry_attempts)
+        )
+        self._retire_snapshot()
+        return events
+
+    async def _guarded_search_async(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """Query a window through the circuit breaker, retrying failures with backoff."""
+        events = await self._breaker.call_async(
+            lambda: retry_async(lambda: self._search_async(start, end), attempts=self._retry_attempts)
+        )
+        self._retire_snapshot()
+        return events
+
+    def _serve_stale(self, start: datetime, end: datetime, error: Exception) -> StaleEvents:
+        """
+        Serve the last good data of a period after a failed fetch and
+        refresh it in the background.
+        
+        The last good data comes from the window cache or, if nothing has
+        been loaded since startup, from the snapshot.
+        
+        Args:
+            start: Start of the period
+            end: End of the period
+            error: The error of the failed fetch
+            
+        Returns:
+            StaleEvents: The events and their age
+            
+        Raises:
+            Exception: The error of the failed fetch if no earlier data covers the period
+        """
+        stale = self._cache.stale(start, end)
+        snapshot = self._snapshot
+        if stale is None and snapshot is not None and snapshot.covers(start, end):
+            age = (datetime.now(timezone.utc) - snapshot.written_at).total_seconds()
+            stale = snapshot.between(start, end), age
+        if stale is None:
+            raise error
+        events, age = stale
+        self.log_error(f"Calendar unavailable, serving events fetched {age:.0f}s ago", error)
+        self._revalidate_in_background(start, end)
+        return StaleEvents(events, age)
+
+    def _revalidate_in_background(self, start: datetime, end: datetime) -> None:
+        """Start refreshing a period in the background unless a refresh is running."""
+        if self._revalidating.is_set():
+            return
+        self._revalidating.set()
+        threading.Thread(
+            target=self._revalidate, args=(start, end), name='calendar-revalidate', daemon=True
+        ).start()
+
+    def _revalidate(self, start: datetime, end: datetime) -> None:
+        """Refresh a period once the circuit breaker lets a call through."""
+        try:
+            # Waiting for the breaker instead of calling right away keeps
+            # the refresh from failing fast on an open circuit
+            time.sleep(self._breaker.retry_after())
+            self._cache.get(start, end, self._guarded_load)
+            self.log_info("Calendar reachable again, cached events refreshed")
+        except Exception as e:
+            self.log_error("Failed to refresh calendar events", e)
+        finally:
+            self._revalidating.clear()
+
+    @staticmethod
+    def _close_async_client(client: AsyncCalDAVClient) -> None:
+        """Close the async client from sync code, inside or outside a loop."""
+        try:
+            asyncio.get_running_loop().create_task(client.close())
+        except RuntimeError:
+            asyncio.run(client.close())
+
+    def _load_window(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """Synchronize all calendars and read a time window from their mirrors."""
+        events = list(fetch_parallel(
+            self._executor, self._load_calendar, self._syncs, start, end, get_event_start
+        ))
+        self._save_snapshot(events, start, end)
+        return events
+
+    @staticmethod
+    def _load_calendar(sync: CalendarSync, start: datetime, end: datetime) -> List[EventRecord]:
+        """Synchronize a single calendar and read a time window from its mirror."""
+        # The window is read right after the sync, so the cache does not
+        # need to be invalidated here
+        sync.sync()
+        return sync.events_between(start, end)
+
+    async def _search_async(self, start: datetime, end: datetime) -> List[EventRecord]:
+        """Query all calendars concurrently through the non-blocking clients."""
+        events = list(await fetch_parallel_async(
+            AsyncCalDAVClient.search, self._async_clients, start, end, get_event_start
+        ))
+        await asyncio.to_thread(self._save_snapshot, events, start, end)
+        return events
+
+    def _fits_cache(self, start: datetime, end: datetime) -> bool:
+        """Check whether a period is short enough to be served from the window cache."""
+        return end - start <= timedelta(days=self._cache_horizon_days)
+
+    def _iter_events(self, start: datetime, end: datetime) -> Iterable[EventRecord]:
+        """
+        Get all event occurrences in a period for consumers that take them
+        one at a time.
+        
+        Periods within the cache horizon come from the window cache, longer
+        ones are streamed from the mirrors so they are never held in memory
+        as a whole.
+        
+        Args:
+            start: Start of the period
+            end: End of the period
+            
+        Returns:
+            Iterable of event records, in start order only for cached periods
+        """
+        if self._fits_cache(start, end):
+            return self._fetch_events(start, end)
+        return self._stream_events(start, end)
+
+    def _stream_events(self, start: datetime, end: datetime) -> Iterator[EventRecord]:
+        """Synchronize all calendars and stream a period from their mirrors, bypassing the cache."""
+        self.sync_calendar()
+        for sync in self._syncs:
+            yield from sync.iter_events_between(start, end)
+
+    def _widen_window(self, start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+        """Widen a requested period to the cached horizon starting today."""
+        today = get_start_of_day(get_local_time().date())
+        horizon_end = today + timedelta(days=self._cache_horizon_days)
+        return min(start, today), max(end, horizon_end)
 
     def get_upcoming_events(self, hours: int = 24) -> List[CalendarEvent]:
         """
@@ -65,10 +469,7 @@ class CalendarService(BaseService):
         now = datetime.utcnow()
         end_time = now + timedelta(hours=hours)
         
-        return [
-            event for event in self._events
-            if now <= event.start_time <= end_time
-        ]
+        return self._events.starting_between(now, end_time)
 
     def add_event(self, event: CalendarEvent) -> None:
         """
@@ -79,7 +480,7 @@ class CalendarService(BaseService):
         """
         try:
             # TODO: Save to database
-            self._events.append(event)
+            self._events.add(event)
             self.log_info(f"Added calendar event: {event.title}")
         except Exception as e:
             self.log_error(f"Failed to add calendar event: {event.title}", e)
@@ -94,7 +495,7 @@ class CalendarService(BaseService):
         """
         try:
             # TODO: Remove from database
-            self._events = [e for e in self._events if e.id != event_id]
+            self._events.remove(event_id)
             self.log_info(f"Removed calendar event with ID: {event_id}")
         except Exception as e:
             self.log_error(f"Failed to remove calendar event: {event_id}", e)
@@ -111,77 +512,230 @@ class CalendarService(BaseService):
             Calendar event if found, None otherwise
         """
         try:
-            return next((e for e in self._events if e.id == event_id), None)
+            return self._events.get(event_id)
         except Exception as e:
             self.log_error(f"Failed to get calendar event: {event_id}", e)
             return None
 
-    def get_free_dates(self) -> str:
+    def get_free_dates(self, days: int = 14) -> str:
         """
-        Generates a list of days without events in the next two weeks.
+        Generates a list of days without events in the coming days.
         
+        Args:
+            days: Number of days to look ahead, two weeks by default
+            
         Returns:
             str: Formatted message with all free days
         """
-        if not self._calendar_client:
-            return "Error connecting to the calendar."
+        return self._free_dates_builder(days).build()
+
+    async def get_free_dates_async(self, days: int = 14) -> str:
+        """
+        Generates a list of days without events in the coming days
+        without blocking the event loop.
+        
+        Args:
+            days: Number of days to look ahead, two weeks by default
+            
+        Returns:
+            str: Formatted message with all free days
+        """
+        return (await self._free_dates_builder_async(days)).build()
+
+    async def get_free_dates_messages_async(self, days: int = 14) -> List[str]:
+        """
+        Generates the free days report split into messages that fit
+        Telegram's length limit.
+        
+        Args:
+            days: Number of days to look ahead, two weeks by default
+            
+        Returns:
+            List of message texts to send in order
+        """
+        return (await self._free_dates_builder_async(days)).chunks()
+
+    def _free_dates_builder(self, days: int) -> MessageBuilder:
+        """Build the free days report, or an error message."""
+        if not self._calendar_clients:
+            return MessageBuilder().add("Error connecting to the calendar.")
+
+        start_date, end_date = self._free_dates_period(days)
+        try:
+            occupancy = self._new_occupancy(start_date, end_date)
+            busy = self._fetch_busy(start_date, end_date) if self._free_busy else None
+            events = None
+            if busy is not None:
+                occupancy.mark_spans(busy)
+            else:
+                events = self._iter_events(start_date, end_date)
+                self._mark_events(occupancy, events)
+            return self._mark_stale(self._format_free_dates(occupancy, start_date, end_date), events)
+        except Exception as e:
+            self.log_error(f"Error retrieving events: {e}")
+            return MessageBuilder().add("Error retrieving event data.")
 
+    async def _free_dates_builder_async(self, days: int) -> MessageBuilder:
+        """Build the free days report without blocking the event loop."""
+        if not self._calendar_clients:
+            return MessageBuilder().add("Error connecting to the calendar.")
+
+        start_date, end_date = self._free_dates_period(days)
+        try:
+            occupancy = self._new_occupancy(start_date, end_date)
+            busy = await self._fetch_busy_async(start_date, end_date) if self._free_busy else None
+            events = None
+            if busy is not None:
+                occupancy.mark_spans(busy)
+            else:
+                events = await self._mark_events_async(occupancy, start_date, end_date)
+            return self._mark_stale(self._format_free_dates(occupancy, start_date, end_date), events)
+        except Exception as e:
+            self.log_error(f"Error retrieving events: {e}")
+            return MessageBuilder().add("Error retrieving event data.")
+
+    def _free_dates_period(self, days: int) -> Tuple[datetime, datetime]:
+        """Get the period covered by the free dates report."""
         current_time = get_local_time()
         
-        # Calculate start (today) and end (in 2 weeks)
-        start_date = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = start_date + timedelta(days=14, hours=23, minutes=59, seconds=59)
+        # Calculate start (today) and end (in the given number of days)
+        start_date = get_start_of_day(current_time.date())
+        end_date = start_date + timedelta(days=days, hours=23, minutes=59, seconds=59)
+        return start_date, end_date
+
+    def _fetch_busy(self, start: datetime, end: datetime) -> Optional[List[BusyPeriod]]:
+        """
+        Get the busy periods of all calendars with free-busy-query REPORTs.
         
-        # Create a list of all days in the period
-        all_days = set()
-        current_date = start_date
-        while current_date <= end_date:
-            all_days.add(current_date.date())
-            current_date += timedelta(days=1)
+        Only busy periods are transferred instead of full event bodies.
+        Servers rejecting the query switch the service back to the
+        search-based path for good.
         
-        try:
-            # Get all events in the period
-            events = self._calendar_client.search(
-                start=start_date,
-                end=end_date,
-                expand=True  # Expands recurring events
-            )
-            
-            # Collect all days with events
-            days_with_events = set()
+        Args:
+            start: Start of the period
+            end: End of the period
             
-            for event in events:
-                try:
-                    start = get_local_time(event.instance.vevent.dtstart.value)
-                    days_with_events.add(start.date())
-                    event_title = event.instance.vevent.summary.value if hasattr(event.instance.vevent, 'summary') else 'Unnamed event'
-                    self.log_info(f"Event found: {start.strftime('%d.%m.')} - {event_title}")
-                except Exception as e:
-                    self.log_error(f"Error processing event: {e}")
+        Returns:
+            List of busy periods, or None if the search-based path must be used
+        """
+        try:
+            futures = [
+                self._executor.submit(calendar.freebusy_request, start, end)
+                for calendar in self._calendar_clients
+            ]
+            busy = []
+            for future in futures:
+                busy.extend(parse_busy_periods(future.result().data, start.tzinfo))
+            return busy
+        except Exception as e:
+            return self._free_busy_failed(e)
+
+    async def _fetch_busy_async(self, start: datetime, end: datetime) -> Optional[List[BusyPeriod]]:
+        """
+        Get the busy periods of all calendars without blocking the event loop.
+        
+        Args:
+            start: Start of the period
+            end: End of the period
             
-            # Calculate free days
-            free_days = all_days - days_with_events
+        Returns:
+            List of busy periods, or None if the search-based path must be used
+        """
+        if not self._async_clients:
+            return await asyncio.to_thread(self._fetch_busy, start, end)
+        try:
+            results = await asyncio.gather(*(client.free_busy(start, end) for client in self._async_clients))
+            return [period for periods in results for period in periods]
+        except Exception as e:
+            return self._free_busy_failed(e)
+
+    def _free_busy_failed(self, error: Exception) -> None:
+        """Handle a failed free-busy query, disabling the mode if it is unsupported."""
+        if isinstance(error, (DAVError, httpx.HTTPStatusError)):
+            self._free_busy = False
+            self.log_error("Free-busy query not supported, using event search instead", error)
+        else:
+            self.log_error("Free-busy query failed, using event search instead", error)
+        return None
+
+    @staticmethod
+    def _new_occupancy(start_date: datetime, end_date: datetime) -> DayOccupancy:
+        """Create an empty occupancy map covering every day of a period."""
+        first_day = start_date.date()
+        return DayOccupancy(first_day, (end_date.date() - first_day).days + 1)
+
+    def _mark_events(self, occupancy: DayOccupancy, events: Iterable[EventRecord]) -> None:
+        """Mark every day an event spans as busy, consuming events as they come."""
+        for event in events:
+            self._mark_event(occupancy, event)
+
+    async def _mark_events_async(self, occupancy: DayOccupancy, start: datetime, end: datetime) -> Optional[List[EventRecord]]:
+        """
+        Mark the days of all events in a period as busy without blocking the event loop.
+        
+        Returns:
+            The events of cached periods, None if they were streamed
+        """
+        if self._fits_cache(start, end):
+            events = await self._fetch_events_async(start, end)
+            self._mark_events(occupancy, events)
+            return events
+        elif self._async_clients:
+            async def mark(client: AsyncCalDAVClient) -> None:
+                async for event in client.iter_search(start, end):
+                    self._mark_event(occupancy, event)
+
+            await asyncio.gather(*(mark(client) for client in self._async_clients))
+        else:
+            await asyncio.to_thread(self._mark_events, occupancy, self._stream_events(start, end))
+        return None
+
+    def _mark_event(self, occupancy: DayOccupancy, event: EventRecord) -> None:
+        """Mark every day an event spans as busy."""
+        try:
+            occupancy.mark_event(event)
+            self.log_debug(f"Event found: {event.start.strftime('%d.%m.')} - {event.title or 'Unnamed event'}")
+        except Exception as e:
+            self.log_error(f"Error processing event: {e}")
+
+    def _format_free_dates(self, occupancy: DayOccupancy, start_date: datetime, end_date: datetime) -> MessageBuilder:
+        """
+        Format the free dates report for a period.
+        
+        Args:
+            occupancy: Busy days of the period
+            start_date: Start of the period
+            end_date: End of the period
             
-            # Format the output
-            message = FREE_DAYS_HEADER.format(
+        Returns:
+            MessageBuilder: The report with one fragment per free day
+        """
+        free_days = occupancy.free_days()
+        period = self._free_dates_period_text((end_date.date() - start_date.date()).days)
+        
+        # Format the output
+        builder = MessageBuilder(
+            header=FREE_DAYS_HEADER.format(
+                period=period,
                 start_date=start_date.strftime('%d.%m.'),
                 end_date=end_date.strftime('%d.%m.')
-            )
-            
-            if not free_days:
-                message += "Keine freien Tage in den nächsten zwei Wochen."
-            else:
-                for date in sorted(free_days):
-                    weekday = WEEKDAY_TRANSLATIONS[date.strftime("%A")]
-                    message += f"{weekday}, {date.strftime('%d.%m.')}\n"
-            
-            message += FOOTER_TEXT
-            
-            return message
+            ),
+            footer=FOOTER_TEXT
+        )
+        
+        if not free_days:
+            builder.add(NO_FREE_DAYS_TEXT.format(period=period))
+        else:
+            for date in free_days:
+                weekday = WEEKDAY_TRANSLATIONS[date.strftime("%A")]
+                builder.add(f"{weekday}, {date.strftime('%d.%m.')}\n")
+        
+        return builder
 
-        except Exception as e:
-            self.log_error(f"Error retrieving events: {e}")
-            return "Error retrieving event data."
+    @staticmethod
+    def _free_dates_period_text(days: int) -> str:
+        """Describe the look-ahead of the free dates report, e.g. "in den nächsten zwei Wochen"."""
+        return FREE_DAYS_PERIODS.get(days) or FREE_DAYS_PERIOD_DAYS.format(days=days)
 
     def generate_week_overview(self) -> str:
         """
@@ -190,55 +744,162 @@ class CalendarService(BaseService):
         Returns:
             str: Formatted message with all events for the current week
         """
-        if not self._calendar_client:
-            return "Error connecting to calendar."
+        return self._week_overview_builder().build()
+
+    async def generate_week_overview_async(self) -> str:
+        """
+        Generates a weekly overview of all events without blocking the
+        event loop.
+        
+        Returns:
+            str: Formatted message with all events for the current week
+        """
+        return (await self._week_overview_builder_async()).build()
+
+    async def get_week_overview_messages_async(self) -> List[str]:
+        """
+        Generates the weekly overview split into messages that fit
+        Telegram's length limit, breaking only between events.
+        
+        Returns:
+            List of message texts to send in order
+        """
+        return (await self._week_overview_builder_async()).chunks()
+
+    def _week_overview_builder(self) -> MessageBuilder:
+        """Build the weekly overview, or an error message."""
+        if not self._calendar_clients:
+            return MessageBuilder().add("Error connecting to calendar.")
+
+        monday, next_sunday = self._week_period()
+        try:
+            events = self._fetch_events(monday, next_sunday)
+            return self._mark_stale(self._build_week_overview(events, monday, next_sunday), events)
+        except Exception as e:
+            self.log_error(f"Error retrieving events: {e}")
+            return MessageBuilder().add("Fehler beim Abrufen der Veranstaltungsdaten.")
+
+    async def _week_overview_builder_async(self) -> MessageBuilder:
+        """Build the weekly overview without blocking the event loop."""
+        if not self._calendar_clients:
+            return MessageBuilder().add("Error connecting to calendar.")
+
+        monday, next_sunday = self._week_period()
+        try:
+            events = await self._fetch_events_async(monday, next_sunday)
+            return self._mark_stale(self._build_week_overview(events, monday, next_sunday), events)
+        except Exception as e:
+            self.log_error(f"Error retrieving events: {e}")
+            return MessageBuilder().add("Fehler beim Abrufen der Veranstaltungsdaten.")
+
+    async def get_week_overview_async(self) -> WeekOverview:
+        """
+        Build the weekly overview together with the event set it shows,
+        so it can be compared with the overview delivered last.
+        
+        Returns:
+            WeekOverview: Rendered blocks per occurrence and message chunks
+            
+        Raises:
+            RuntimeError: If no calendar is connected
+        """
+        if not self._calendar_clients:
+            raise RuntimeError("Error connecting to calendar.")
+
+        monday, next_sunday = self._week_period()
+        events = await self._fetch_events_async(monday, next_sunday)
+        fragments = self._render_week(events)
+        builder = self._mark_stale(self._week_overview_message(fragments.values(), monday, next_sunday), events)
+        return WeekOverview(monday.date(), fragments, builder.chunks(), stale=isinstance(events, StaleEvents))
+
+    def format_overview_changes(self, overview: WeekOverview, diff: OverviewDiff) -> List[str]:
+        """
+        Format a compact notice listing only the changed events of a week.
+        
+        Args:
+            overview: The current overview
+            diff: Changes since the overview delivered last
+            
+        Returns:
+            List of message texts to send in order
+        """
+        week_end = overview.week_start + timedelta(days=6)
+        builder = MessageBuilder(
+            header=CHANGED_EVENTS_HEADER.format(
+                start_date=overview.week_start.strftime("%d.%m."),
+                end_date=week_end.strftime("%d.%m.")
+            ) + "\n",
+            separator="\n\n"
+        )
+        for kind, fragments in (('added', diff.added), ('changed', diff.changed), ('removed', diff.removed)):
+            for fragment in fragments:
+                builder.add(f"{CHANGED_EVENTS_LABELS[kind]}\n{fragment}")
+        return builder.chunks()
+
+    @staticmethod
+    def _mark_stale(builder: MessageBuilder, events: Optional[Iterable[EventRecord]]) -> MessageBuilder:
+        """Tell the reader how old the data of a report is if it was served stale."""
+        if isinstance(events, StaleEvents):
+            fetched_at = get_local_time() - timedelta(seconds=events.age)
+            builder.header = STALE_DATA_NOTICE.format(fetched_at=fetched_at.strftime('%d.%m. %H:%M')) + builder.header
+        return builder
 
+    def _week_period(self) -> Tuple[datetime, datetime]:
+        """Get the period covered by the weekly overview (next Monday to Sunday)."""
         current_time = get_local_time()
         
         # Calculate next Monday
         days_until_monday = 7 - current_time.weekday()  # Days until next Monday
-        monday = current_time + timedelta(days=days_until_monday)
-        monday = monday.replace(hour=0, minute=0, second=0, microsecond=0)
+        monday = get_start_of_day(current_time.date() + timedelta(days=days_until_monday))
         
         # Calculate next Sunday
         next_sunday = monday + timedelta(days=6, hours=23, minutes=59, seconds=59)
+        return monday, next_sunday
 
-        try:
-            # Get all events in the time period
-            events = self._calendar_client.search(
-                start=monday,
-                end=next_sunday,
-                expand=True  # Expands recurring events
-            )
+    def _build_week_overview(self, events: Iterable[EventRecord], monday: datetime, next_sunday: datetime) -> MessageBuilder:
+        """
+        Format the weekly overview for a week.
+        
+        Args:
+            events: Events in the week
+            monday: Start of the week
+            next_sunday: End of the week
             
-            # Format the events
-            formatted_events = []
-            for event in events:
-                try:
-                    date, text = format_event(event)
-                    sort_key = get_event_sort_key(event)
-                    formatted_events.append((sort_key, text))
-                except Exception as e:
-                    self.log_error(f"Error formatting event: {e}")
-
-            # Sort events by date
-            formatted_events.sort(key=lambda x: x[0])
-
-            # Create the message
-            week_from = monday.strftime("%d.%m.")
-            week_to = next_sunday.strftime("%d.%m.")
-            message = WEEKLY_OVERVIEW_HEADER.format(
-                start_date=week_from,
-                end_date=week_to
-            )
+        Returns:
+            MessageBuilder: The overview with one fragment per event
+        """
+        return self._week_overview_message(self._render_week(events).values(), monday, next_sunday)
 
-            for _, text in formatted_events:
-                message += f"\n{text}\n"
+    def _render_week(self, events: Iterable[EventRecord]) -> Dict[Hashable, str]:
+        """Render the events of a week, keyed by occurrence in start order."""
+        # The events arrive merged in start order and unchanged events
+        # come straight from the render cache
+        rendered = []
+        for event in events:
+            try:
+                rendered.append((event, self._render_cache.render(event)))
+            except Exception as e:
+                self.log_error(f"Error formatting event: {e}")
+        return keyed_fragments(rendered)
 
-            message += FOOTER_TEXT
+    def _week_overview_message(self, fragments: Iterable[str], monday: datetime, next_sunday: datetime) -> MessageBuilder:
+        """Put the rendered events of a week into the overview message."""
+        fragments = list(fragments)
+        week_from = monday.strftime("%d.%m.")
+        week_to = next_sunday.strftime("%d.%m.")
+        builder = MessageBuilder(
+            header=WEEKLY_OVERVIEW_HEADER.format(
+                start_date=week_from,
+                end_date=week_to
+            ),
+            footer=FOOTER_TEXT,
+            separator="\n\n"
+        )
 
-            return message
+        if fragments:
+            builder.header += "\n"
+            builder.footer = "\n" + builder.footer
+            for fragment in fragments:
+                builder.add(fragment)
 
-        except Exception as e:
-            self.log_error(f"Error retrieving events: {e}")
-            return "Fehler beim Abrufen der Veranstaltungsdaten." 
\ No newline at end of file
+        return builder
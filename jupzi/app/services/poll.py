@@ -1,10 +1,19 @@
-from typing import List, Optional, Dict
+from typing import Any, Callable, Hashable, List, Optional, Dict
 from datetime import datetime, timedelta
 import logging
 
+from sqlalchemy import delete, insert, tuple_, update
+from sqlalchemy.orm import selectinload
+
 from app.core.base_service import BaseService
 from app.core.config import Config
-from app.models.polls import Poll, PollOption, PollVote
+from app.core.polls.expiry import ExpiryQueue
+from app.core.polls.tally import VoteTally
+from app.core.polls.write_behind import WriteBehindBuffer
+from app.models.polls import Poll, PollOption, PollResponse, PollVote
+from app.utils.database import Database
+from app.utils.message_builder import MessageBuilder
+from app.utils.templates import POLL_RESULTS_HEADER, POLL_SETTINGS
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +24,27 @@ class PollService(BaseService):
     def __init__(self, config: Config):
         super().__init__(config)
         self._polls: Dict[int, Poll] = {}
+        self._tallies: Dict[int, VoteTally] = {}
+        self._voters: Dict[int, Dict[int, List[PollVote]]] = {}
+        self._telegram_polls: Dict[str, int] = {}
+        self._expiry = ExpiryQueue()
+        self._expiry_listeners: List[Callable[[], None]] = []
         self._poll_timeout = self.get_config_value('poll_timeout', 3600)
+        self._db: Optional[Database] = None
+        self._writes = WriteBehindBuffer(
+            self._write_batch,
+            flush_interval=self.get_config_value('poll_vote_flush_interval', 2),
+            max_pending=self.get_config_value('poll_vote_flush_size', 100)
+        )
 
     def initialize(self) -> None:
         """Initialize the poll service."""
         try:
+            self._db = Database(self.config)
+            
             # Load existing polls from database
             self._load_polls()
+            self._writes.start()
             self._is_initialized = True
             self.log_info("Poll service initialized")
         except Exception as e:
@@ -29,15 +52,41 @@ class PollService(BaseService):
             raise
 
     def cleanup(self) -> None:
-        """Clean up poll service resources."""
+        """Clean up poll service resources, writing all pending votes first."""
+        try:
+            self._writes.stop()
+        except Exception as e:
+            self.log_error("Failed to write pending votes", e)
         self._polls.clear()
+        self._tallies.clear()
+        self._voters.clear()
+        self._telegram_polls.clear()
+        self._expiry = ExpiryQueue()
+        self._db = None
         self._is_initialized = False
         self.log_info("Poll service cleaned up")
 
     def _load_polls(self) -> None:
-        """Load polls from the database."""
-        # TODO: Implement database loading
-        pass
+        """
+        Load the open polls with their options and votes from the database.
+        
+        The vote counts and voter index are rebuilt from the raw votes and
+        polls that expired while the bot was down are closed on the next
+        expiry run.
+        """
+        with self._db.get_session() as session:
+            polls = session.query(Poll).options(
+                selectinload(Poll.options),
+                selectinload(Poll.votes)
+            ).filter(Poll.is_closed.is_(False)).all()
+            # Detach before the commit, so the polls stay usable in memory
+            session.expunge_all()
+            
+        for poll in polls:
+            self._polls[poll.id] = poll
+            self._index_poll(poll)
+            self._schedule_expiry(poll)
+        self.log_info(f"Loaded {len(polls)} open polls")
 
     def create_poll(self, title: str, options: List[str], creator_id: int) -> Poll:
         """
@@ -55,17 +104,24 @@ class PollService(BaseService):
             poll = Poll(
                 title=title,
                 creator_id=creator_id,
+                # Telegram only reports answers to polls that are not anonymous
+                is_anonymous=POLL_SETTINGS['is_anonymous'],
+                allows_multiple_answers=POLL_SETTINGS['allows_multiple_answers'],
+                is_closed=False,
                 created_at=datetime.utcnow(),
                 expires_at=datetime.utcnow() + timedelta(seconds=self._poll_timeout)
             )
             
             # Add options
             for option_text in options:
-                option = PollOption(text=option_text)
+                option = PollOption(text=option_text, vote_count=0)
                 poll.options.append(option)
             
-            # TODO: Save to database
+            # Polls are written right away, they need their IDs
+            self._save_poll(poll)
             self._polls[poll.id] = poll
+            self._index_poll(poll)
+            self._schedule_expiry(poll)
             self.log_info(f"Created poll: {title}")
             
             return poll
@@ -102,27 +158,16 @@ class PollService(BaseService):
             True if vote was added successfully, False otherwise
         """
         try:
-            poll = self.get_poll(poll_id)
+            poll = self._open_poll(poll_id)
             if not poll:
                 return False
                 
-            if poll.expires_at < datetime.utcnow():
-                return False
-                
             # Check if user already voted
-            if any(vote.user_id == user_id for vote in poll.votes):
+            if user_id in self._voters[poll_id]:
                 return False
                 
-            # Add vote
-            vote = PollVote(
-                poll_id=poll_id,
-                option_id=option_id,
-                user_id=user_id,
-                created_at=datetime.utcnow()
-            )
-            
-            # TODO: Save to database
-            poll.votes.append(vote)
+            if not self._record_answer(poll, user_id, [option_id]):
+                return False
             self.log_info(f"Added vote to poll {poll_id} by user {user_id}")
             
             return True
@@ -130,6 +175,144 @@ class PollService(BaseService):
             self.log_error(f"Failed to add vote to poll {poll_id}", e)
             return False
 
+    def change_vote(self, poll_id: int, option_id: int, user_id: int) -> bool:
+        """
+        Move a user's vote to another option.
+        
+        Args:
+            poll_id: ID of the poll
+            option_id: ID of the option voted for now
+            user_id: ID of the user voting
+            
+        Returns:
+            True if the vote was changed, False otherwise
+        """
+        try:
+            poll = self._open_poll(poll_id)
+            if not poll or user_id not in self._voters[poll_id]:
+                return False
+                
+            if not self._record_answer(poll, user_id, [option_id]):
+                return False
+            self.log_info(f"Changed vote in poll {poll_id} by user {user_id}")
+            
+            return True
+        except Exception as e:
+            self.log_error(f"Failed to change vote in poll {poll_id}", e)
+            return False
+
+    def retract_vote(self, poll_id: int, user_id: int) -> bool:
+        """
+        Remove a user's vote from a poll.
+        
+        Args:
+            poll_id: ID of the poll
+            user_id: ID of the user who voted
+            
+        Returns:
+            True if a vote was removed, False otherwise
+        """
+        try:
+            poll = self._open_poll(poll_id)
+            if not poll or user_id not in self._voters[poll_id]:
+                return False
+                
+            self._record_answer(poll, user_id, [])
+            self.log_info(f"Retracted vote in poll {poll_id} by user {user_id}")
+            
+            return True
+        except Exception as e:
+            self.log_error(f"Failed to retract vote in poll {poll_id}", e)
+            return False
+
+    def apply_answer(self, poll_id: int, user_id: int, option_ids: List[int]) -> bool:
+        """
+        Apply a user's current answer to a poll, the way Telegram reports it.
+        
+        The answer replaces whatever the user voted before: a first answer
+        adds votes, a different one changes them and an empty one retracts
+        them.
+        
+        Args:
+            poll_id: ID of the poll
+            user_id: ID of the user answering
+            option_ids: IDs of the chosen options, empty for a retraction
+            
+        Returns:
+            True if the answer was applied, False otherwise
+        """
+        try:
+            poll = self._open_poll(poll_id)
+            if not poll:
+                return False
+            if len(option_ids) > 1 and not poll.allows_multiple_answers:
+                return False
+                
+            if not self._record_answer(poll, user_id, option_ids):
+                return False
+            self.log_debug(f"Applied answer to poll {poll_id} by user {user_id}: {option_ids}")
+            
+            return True
+        except Exception as e:
+            self.log_error(f"Failed to apply answer to poll {poll_id}", e)
+            return False
+
+    def apply_telegram_answer(self, telegram_poll_id: str, user_id: int, option_indices: List[int],
+                              username: Optional[str] = None) -> bool:
+        """
+        Apply an answer from a Telegram poll_answer update.
+        
+        Telegram names polls by its own ID and options by position. Both
+        are resolved in memory and the answer is written in the next batch,
+        so a whole group answering at once never waits for the database.
+        
+        Args:
+            telegram_poll_id: Telegram's ID of the poll
+            user_id: Telegram ID of the user answering
+            option_indices: Positions of the chosen options, empty for a retraction
+            username: Telegram username of the user, if any
+            
+        Returns:
+            True if the answer was applied, False for unknown or closed polls
+            and invalid answers
+        """
+        try:
+            poll_id = self._telegram_polls.get(telegram_poll_id)
+            poll = self._polls.get(poll_id)
+            if not poll:
+                return False
+            if any(not 0 <= index < len(poll.options) for index in option_indices):
+                return False
+                
+            options = [poll.options[index] for index in option_indices]
+            if not self.apply_answer(poll_id, user_id, [option.id for option in options]):
+                return False
+                
+            response = None
+            if options:
+                response = {
+                    'username': username,
+                    'response': ", ".join(option.text for option in options),
+                    'responded_at': datetime.utcnow()
+                }
+            self._writes.put(('response', poll_id, user_id), response)
+            return True
+        except Exception as e:
+            self.log_error(f"Failed to apply Telegram answer to poll {telegram_poll_id}", e)
+            return False
+
+    def get_poll_by_telegram_id(self, telegram_poll_id: str) -> Optional[Poll]:
+        """
+        Get a poll by the ID Telegram gave it.
+        
+        Args:
+            telegram_poll_id: Telegram's ID of the poll
+            
+        Returns:
+            Poll object if found, None otherwise
+        """
+        return self._polls.get(self._telegram_polls.get(telegram_poll_id))
+
     def get_poll_results(self, poll_id: int) -> Optional[Dict[str, int]]:
         """
         Get the results of a poll.
@@ -145,31 +328,281 @@ class PollService(BaseService):
             if not poll:
                 return None
                 
-            results = {}
-            for option in poll.options:
-                vote_count = sum(1 for vote in poll.votes if vote.option_id == option.id)
-                results[option.text] = vote_count
-                
-            return results
+            tally = self._tallies[poll_id]
+            return {option.text: tally.count(option.id) for option in poll.options}
         except Exception as e:
             self.log_error(f"Failed to get poll results: {poll_id}", e)
             return None
 
-    def cleanup_expired_polls(self) -> None:
-        """Remove expired polls."""
+    def format_poll_results(self, poll: Poll) -> str:
+        """
+        Format the results of a poll as a message.
+        
+        Works from the poll's own vote counts, so a closed poll can still be
+        reported after it was dropped from memory.
+        
+        Args:
+            poll: The poll, e.g. as returned by close_expired_polls
+            
+        Returns:
+            str: Message with the vote count per option
+        """
+        builder = MessageBuilder(header=POLL_RESULTS_HEADER.format(title=poll.title))
+        for option in poll.options:
+            builder.add(f"{option.text}: {option.vote_count}\n")
+        return builder.build()
+
+    def add_expiry_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback run whenever a poll deadline is scheduled, so
+        a waiting expiry job can wake up for an earlier deadline.
+        
+        Args:
+            listener: Callback without arguments
+        """
+        self._expiry_listeners.append(listener)
+
+    def next_expiry(self) -> Optional[datetime]:
+        """Get the earliest deadline of an open poll (UTC), None if no poll is open."""
+        return self._expiry.next_deadline()
+
+    def close_expired_polls(self, now: Optional[datetime] = None) -> List[Poll]:
+        """
+        Close every poll whose deadline has passed.
+        
+        Only the expiring polls are touched, however many polls are kept.
+        Closed polls stop accepting votes and are dropped from memory once
+        their closed state is written.
+        
+        Args:
+            now: Current time (UTC), the current time by default
+            
+        Returns:
+            List of the polls closed, in deadline order
+        """
         try:
-            now = datetime.utcnow()
-            expired_polls = [
-                poll_id for poll_id, poll in self._polls.items()
-                if poll.expires_at < now
-            ]
-            
-            for poll_id in expired_polls:
-                # TODO: Remove from database
-                del self._polls[poll_id]
+            closed = []
+            for poll_id in self._expiry.pop_due(now or datetime.utcnow()):
+                poll = self._polls.get(poll_id)
+                if poll is None or poll.is_closed:
+                    continue
+                    
+                poll.is_closed = True
+                self._voters.pop(poll_id, None)
+                self._queue_poll_update(poll)
+                closed.append(poll)
                 
-            if expired_polls:
-                self.log_info(f"Cleaned up {len(expired_polls)} expired polls")
+            if closed:
+                self.log_info(f"Closed {len(closed)} expired polls")
+            return closed
         except Exception as e:
-            self.log_error("Failed to cleanup expired polls", e)
-            raise 
\ No newline at end of file
+            self.log_error("Failed to close expired polls", e)
+            raise
+
+    def _open_poll(self, poll_id: int) -> Optional[Poll]:
+        """Get a poll that still accepts votes."""
+        poll = self.get_poll(poll_id)
+        if not poll or poll.is_closed or poll.expires_at < datetime.utcnow():
+            return None
+        return poll
+
+    def _schedule_expiry(self, poll: Poll) -> None:
+        """Schedule an open poll to be closed at its deadline."""
+        if poll.is_closed:
+            return
+        self._expiry.schedule(poll.id, poll.expires_at)
+        for listener in self._expiry_listeners:
+            listener()
+
+    def _record_answer(self, poll: Poll, user_id: int, option_ids: List[int]) -> bool:
+        """
+        Replace a user's votes in a poll, updating the tally and voter index.
+        
+        Votes for options that stay chosen are kept, so only the difference
+        to the previous answer touches the tally; a vote for another option
+        is moved between the two counts.
+        
+        Args:
+            poll: The poll
+            user_id: ID of the user answering
+            option_ids: IDs of the chosen options, empty to retract
+            
+        Returns:
+            False if an option does not belong to the poll, True otherwise
+        """
+        tally = self._tallies[poll.id]
+        if any(option_id not in tally for option_id in option_ids):
+            return False
+            
+        voters = self._voters[poll.id]
+        previous = {vote.option_id: vote for vote in voters.pop(user_id, [])}
+        votes, added = [], []
+        for option_id in dict.fromkeys(option_ids):
+            vote = previous.pop(option_id, None)
+            if vote is None:
+                vote = PollVote(
+                    poll_id=poll.id,
+                    option_id=option_id,
+                    user_id=user_id,
+                    created_at=datetime.utcnow()
+                )
+                added.append(option_id)
+            votes.append(vote)
+            
+        removed = list(previous)
+        for old_option_id, new_option_id in zip(removed, added):
+            old_count, new_count = tally.move(old_option_id, new_option_id)
+            self._set_vote_count(poll, old_option_id, old_count)
+            self._set_vote_count(poll, new_option_id, new_count)
+        for option_id in added[len(removed):]:
+            self._set_vote_count(poll, option_id, tally.add(option_id))
+        for option_id in removed[len(added):]:
+            self._set_vote_count(poll, option_id, tally.remove(option_id))
+            
+        if votes:
+            voters[user_id] = votes
+        self._writes.put(('answer', poll.id, user_id), [(vote.option_id, vote.created_at) for vote in votes])
+        return True
+
+    def _index_poll(self, poll: Poll) -> None:
+        """
+        Count the raw votes of a poll once, index them by voter and keep
+        its options' counters in sync.
+        
+        From here on the voter index holds the poll's votes; the loaded
+        list is dropped, so a vote change never scans it.
+        """
+        voters: Dict[int, List[PollVote]] = {}
+        for vote in poll.votes:
+            voters.setdefault(vote.user_id, []).append(vote)
+        self._voters[poll.id] = voters
+        if poll.telegram_poll_id:
+            self._telegram_polls[poll.telegram_poll_id] = poll.id
+        
+        tally = VoteTally.from_votes(
+            (option.id for option in poll.options),
+            (vote.option_id for vote in poll.votes)
+        )
+        for option in poll.options:
+            option.vote_count = tally.count(option.id)
+        self._tallies[poll.id] = tally
+        poll.votes = []
+
+    def _evict_poll(self, poll_id: int) -> None:
+        """Drop a closed poll and its indexes from memory."""
+        poll = self._polls.pop(poll_id, None)
+        self._tallies.pop(poll_id, None)
+        self._voters.pop(poll_id, None)
+        if poll is not None and poll.telegram_poll_id:
+            self._telegram_polls.pop(poll.telegram_poll_id, None)
+
+    def _set_vote_count(self, poll: Poll, option_id: int, count: int) -> None:
+        """Store an option's vote count next to its votes."""
+        for option in poll.options:
+            if option.id == option_id:
+                option.vote_count = count
+                self._writes.put(('option', option_id), count)
+                return
+
+    def save_poll_message(self, poll: Poll) -> None:
+        """
+        Persist where a poll was sent, after TelegramService.send_poll.
+        
+        Args:
+            poll: The sent poll
+        """
+        if poll.telegram_poll_id:
+            self._telegram_polls[poll.telegram_poll_id] = poll.id
+        self._queue_poll_update(poll)
+
+    def flush_votes(self) -> int:
+        """
+        Write all pending votes and poll updates now.
+        
+        Returns:
+            int: Number of rows and voter answers written
+        """
+        return self._writes.flush()
+
+    def _save_poll(self, poll: Poll) -> None:
+        """Insert a new poll with its options."""
+        # Start with loaded, empty collections, a detached poll cannot load them
+        poll.votes = []
+        with self._db.get_session() as session:
+            session.add(poll)
+            session.flush()
+            session.expunge(poll)
+
+    def _queue_poll_update(self, poll: Poll) -> None:
+        """Queue writing the mutable state of a poll."""
+        self._writes.put(('poll', poll.id), {
+            'is_closed': poll.is_closed,
+            'telegram_poll_id': poll.telegram_poll_id,
+            'chat_id': poll.chat_id,
+            'message_id': poll.message_id
+        })
+
+    def _write_batch(self, batch: Dict[Hashable, Any]) -> None:
+        """
+        Write a batch of buffered changes in one transaction.
+        
+        Every voter's answer replaces their stored votes: their old rows are
+        deleted with one statement and the new ones inserted with a single
+        multi-row insert, and Telegram answers replace the voter's response
+        the same way. Vote counts and poll states are bulk-updated by
+        primary key.
+        
+        Args:
+            batch: Pending writes by ('answer', poll_id, user_id),
+                ('response', poll_id, user_id), ('option', option_id) or
+                ('poll', poll_id)
+        """
+        answers, responses, options, polls = {}, {}, [], []
+        for key, value in batch.items():
+            if key[0] == 'answer':
+                answers[key[1:]] = value
+            elif key[0] == 'response':
+                responses[key[1:]] = value
+            elif key[0] == 'option':
+                options.append({'id': key[1], 'vote_count': value})
+            else:
+                polls.append(dict(value, id=key[1]))
+                
+        with self._db.get_session() as session:
+            if answers:
+                session.execute(
+                    delete(PollVote).where(tuple_(PollVote.poll_id, PollVote.user_id).in_(list(answers))),
+                    execution_options={'synchronize_session': False}
+                )
+                rows = [
+                    {'poll_id': poll_id, 'user_id': user_id, 'option_id': option_id, 'created_at': created_at}
+                    for (poll_id, user_id), votes in answers.items()
+                    for option_id, created_at in votes
+                ]
+                if rows:
+                    session.execute(insert(PollVote), rows)
+            if responses:
+                session.execute(
+                    delete(PollResponse).where(tuple_(PollResponse.poll_id, PollResponse.user_id).in_(list(responses))),
+                    execution_options={'synchronize_session': False}
+                )
+                rows = [
+                    dict(response, poll_id=poll_id, user_id=user_id)
+                    for (poll_id, user_id), response in responses.items()
+                    if response is not None
+                ]
+                if rows:
+                    session.execute(insert(PollResponse), rows)
+            if options:
+                session.execute(update(PollOption), options)
+            if polls:
+                session.execute(update(Poll), polls)
+                
+        # A closed poll changes no more, nothing has to be kept once it is written
+        for poll in polls:
+            if poll['is_closed']:
+                self._evict_poll(poll['id'])
+        self.log_debug(
+            f"Wrote {len(answers)} answers, {len(responses)} responses, "
+            f"{len(options)} vote counts and {len(polls)} polls"
+        )
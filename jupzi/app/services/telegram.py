@@ -1,16 +1,19 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 import logging
-from telegram import Bot, Update
+from telegram import Bot, Message, Poll as TelegramPoll, Update
 from telegram.ext import (
     Application,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
+    PollAnswerHandler,
     filters
 )
 
 from app.core.base_service import BaseService
 from app.core.config import Config
+from app.models.polls import Poll as PollModel
+from app.services.poll import PollService
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +26,7 @@ class TelegramService(BaseService):
         self._bot: Optional[Bot] = None
         self._application: Optional[Application] = None
         self._handlers: Dict[str, Any] = {}
+        self._poll_service: Optional[PollService] = None
 
     def initialize(self) -> None:
         """Initialize the Telegram service."""
@@ -48,6 +52,15 @@ class TelegramService(BaseService):
         self._is_initialized = False
         self.log_info("Telegram service cleaned up")
 
+    def set_poll_service(self, poll_service: PollService) -> None:
+        """
+        Set the poll service that records answers to native polls.
+        
+        Args:
+            poll_service: The poll service
+        """
+        self._poll_service = poll_service
+
     def _register_handlers(self) -> None:
         """Register all command and message handlers."""
         # Basic commands
@@ -61,6 +74,7 @@ class TelegramService(BaseService):
         # Poll commands
         self._application.add_handler(CommandHandler("poll", self._handle_poll))
         self._application.add_handler(CommandHandler("vote", self._handle_vote))
+        self._application.add_handler(PollAnswerHandler(self._handle_poll_answer))
         
         # Callback query handler for inline buttons
         self._application.add_handler(CallbackQueryHandler(self._handle_callback))
@@ -83,6 +97,96 @@ class TelegramService(BaseService):
         if self._application:
             await self._application.stop()
 
+    async def send_message(self, text: str, chat_id: Optional[int] = None) -> Message:
+        """
+        Send a text message.
+        
+        Args:
+            text: Message text, at most one Telegram message long
+            chat_id: Target chat, the admin chat by default
+            
+        Returns:
+            Message: The sent message
+        """
+        if not self._is_initialized:
+            raise RuntimeError("Telegram service not initialized")
+        return await self._bot.send_message(
+            chat_id=chat_id if chat_id is not None else self.config.admin_chat_id,
+            text=text
+        )
+
+    async def edit_message(self, message_id: int, text: str, chat_id: Optional[int] = None) -> Message:
+        """
+        Replace the text of a message sent earlier.
+        
+        Args:
+            message_id: ID of the message to edit
+            text: New message text
+            chat_id: Chat of the message, the admin chat by default
+            
+        Returns:
+            Message: The edited message
+        """
+        if not self._is_initialized:
+            raise RuntimeError("Telegram service not initialized")
+        return await self._bot.edit_message_text(
+            text=text,
+            chat_id=chat_id if chat_id is not None else self.config.admin_chat_id,
+            message_id=message_id
+        )
+
+    async def send_messages(self, chunks: Iterable[str], chat_id: Optional[int] = None) -> List[Message]:
+        """
+        Send a report split into chunks as consecutive messages.
+        
+        Args:
+            chunks: Message texts in order, e.g. from MessageBuilder.chunks()
+            chat_id: Target chat, the admin chat by default
+            
+        Returns:
+            List of the sent messages
+        """
+        return [await self.send_message(chunk, chat_id) for chunk in chunks]
+
+    async def send_poll(self, poll: PollModel, chat_id: Optional[int] = None) -> Message:
+        """
+        Send a poll as a native Telegram poll and remember where it was sent.
+        
+        Args:
+            poll: The poll with its options
+            chat_id: Target chat, the admin chat by default
+            
+        Returns:
+            Message: The sent poll message
+        """
+        if not self._is_initialized:
+            raise RuntimeError("Telegram service not initialized")
+        message = await self._bot.send_poll(
+            chat_id=chat_id if chat_id is not None else self.config.admin_chat_id,
+            question=poll.title,
+            options=[option.text for option in poll.options],
+            is_anonymous=poll.is_anonymous,
+            allows_multiple_answers=poll.allows_multiple_answers
+        )
+        poll.telegram_poll_id = message.poll.id
+        poll.chat_id = message.chat_id
+        poll.message_id = message.message_id
+        return message
+
+    async def stop_poll(self, poll: PollModel) -> TelegramPoll:
+        """
+        Close a sent poll in Telegram, so no more answers can be given.
+        
+        Args:
+            poll: A poll sent with send_poll
+            
+        Returns:
+            TelegramPoll: The final state of the Telegram poll
+        """
+        if not self._is_initialized:
+            raise RuntimeError("Telegram service not initialized")
+        return await self._bot.stop_poll(chat_id=poll.chat_id, message_id=poll.message_id)
+
     async def _handle_start(self, update: Update, context: Any) -> None:
         """Handle the /start command."""
         await update.message.reply_text(
@@ -121,6 +225,17 @@ Available commands:
         # TODO: Implement voting
         await update.message.reply_text("Voting not implemented yet")
 
+    async def _handle_poll_answer(self, update: Update, context: Any) -> None:
+        """Record an answer to a native poll, including changed and retracted ones."""
+        answer = update.poll_answer
+        # Answers given on behalf of a chat have no user to count
+        if self._poll_service is None or answer.user is None:
+            return
+        if not self._poll_service.apply_telegram_answer(
+            answer.poll_id, answer.user.id, list(answer.option_ids), answer.user.username
+        ):
+            self.log_debug(f"Ignored answer to unknown or closed poll {answer.poll_id}")
+
     async def _handle_callback(self, update: Update, context: Any) -> None:
         """Handle callback queries from inline buttons."""
         query = update.callback_query
@@ -2,37 +2,90 @@
 Common calendar utilities used across scripts.
 """
 import caldav
-import pytz
-from datetime import datetime, timedelta
-from typing import Optional, List, Tuple, Union
+from datetime import date, datetime
+from typing import Iterable, Optional, List, Tuple, Union
 from caldav.lib.error import AuthorizationError
-from utils.logging_config import setup_logging, CALDAV_URL, CALENDAR_PATH, TIMEZONE, CALDAV_USERNAME, CALDAV_PASSWORD
-from utils.templates import WEEKDAY_TRANSLATIONS
+from app.core.calendar.async_client import AsyncCalDAVClient
+from app.core.calendar.dav_pool import get_dav_pool
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.render import render_event
+from app.core.calendar.timezones import LocalTimezone
+from app.utils.logging_config import setup_logging, CALDAV_URL, CALENDAR_PATHS, TIMEZONE, TIMEZONE_BACKEND, CALDAV_USERNAME, CALDAV_PASSWORD
 
 # Configure logging
 logger = setup_logging('calendar_utils.log')
 
-def get_calendar_client() -> Optional[caldav.Calendar]:
+# Resolved once, shared by every calendar code path
+LOCAL_TIMEZONE = LocalTimezone(TIMEZONE, TIMEZONE_BACKEND)
+
+def get_calendar_clients() -> List[caldav.Calendar]:
     """
-    Creates and returns a CalDAV calendar client.
+    Creates and returns a CalDAV calendar client for every configured calendar.
+    
+    CALENDAR_PATH may list several calendars separated by commas. All of
+    them share one DAV client from the pool, so their HTTP session and
+    connections are reused across services and jobs.
     
     Returns:
-        Optional[caldav.Calendar]: The calendar client or None if connection fails
+        List[caldav.Calendar]: The calendar clients, empty if the connection fails
     """
     try:
-        client = caldav.DAVClient(
+        client = get_dav_pool().get_client(
             url=CALDAV_URL,
             username=CALDAV_USERNAME,
             password=CALDAV_PASSWORD
         )
-        calendar = client.calendar(url=f"{CALDAV_URL}{CALENDAR_PATH}")
-        return calendar
+        return [client.calendar(url=f"{CALDAV_URL}{path}") for path in CALENDAR_PATHS]
     except AuthorizationError as e:
         logger.error(f"Authorization failed when connecting to calendar: {e}")
-        return None
+        return []
     except Exception as e:
         logger.error(f"Error connecting to calendar: {e}")
-        return None
+        return []
+
+def release_calendar_clients(calendars: Iterable[caldav.Calendar]) -> None:
+    """
+    Hand the pooled DAV clients of calendars from get_calendar_clients back.
+    
+    Args:
+        calendars: The calendar clients, sharing one DAV client per server
+    """
+    pool = get_dav_pool()
+    for client in {id(calendar.client): calendar.client for calendar in calendars}.values():
+        pool.release_client(client)
+
+def get_calendar_client() -> Optional[caldav.Calendar]:
+    """
+    Creates and returns a CalDAV client for the first configured calendar.
+    
+    Returns:
+        Optional[caldav.Calendar]: The calendar client or None if connection fails
+    """
+    calendars = get_calendar_clients()
+    return calendars[0] if calendars else None
+
+def get_async_calendar_clients() -> List[AsyncCalDAVClient]:
+    """
+    Creates and returns a non-blocking CalDAV client for every configured calendar.
+    
+    Returns:
+        List[AsyncCalDAVClient]: The async clients, empty if they cannot be created
+    """
+    try:
+        pool = get_dav_pool()
+        return [
+            AsyncCalDAVClient(
+                calendar_url=f"{CALDAV_URL}{path}",
+                username=CALDAV_USERNAME,
+                password=CALDAV_PASSWORD,
+                max_connections=pool.max_connections,
+                keepalive_expiry=pool.idle_timeout
+            )
+            for path in CALENDAR_PATHS
+        ]
+    except Exception as e:
+        logger.error(f"Error creating async calendar client: {e}")
+        return []
 
 def get_local_time(dt: Optional[datetime] = None) -> datetime:
     """
@@ -44,121 +97,94 @@ def get_local_time(dt: Optional[datetime] = None) -> datetime:
     Returns:
         datetime: Time in local timezone
     """
-    local_tz = pytz.timezone(TIMEZONE)
     if dt is None:
-        return datetime.now(local_tz)
-    if dt.tzinfo is None:
-        dt = local_tz.localize(dt)
-    return dt.astimezone(local_tz)
+        return LOCAL_TIMEZONE.now()
+    return LOCAL_TIMEZONE.localize(dt)
 
-def get_event_sort_key(event) -> Union[datetime.date, datetime]:
+def get_local_times(values: Iterable[datetime]) -> List[datetime]:
     """
-    Get a sort key for an event, handling both datetime and date objects.
+    Get many datetimes in the configured local timezone in one call.
     
     Args:
-        event: A caldav.Event object
+        values: Datetimes to convert, naive ones are taken as local time
         
     Returns:
-        Union[datetime.date, datetime]: A sortable key for the event
+        List[datetime]: The local datetimes in the same order
     """
-    start = event.instance.vevent.dtstart.value
-    if isinstance(start, datetime):
-        start = get_local_time(start)
-        return start.date()
-    return start
+    return LOCAL_TIMEZONE.localize_many(values)
 
-def format_event(event) -> Tuple[str, str]:
+def get_start_of_day(day: date) -> datetime:
     """
-    Format a calendar event into a readable format.
+    Get midnight of a day in the configured local timezone.
     
     Args:
-        event: A caldav.Event object
+        day: The day
         
     Returns:
-        tuple: (date, text) - Formatted date and event text
+        datetime: The local midnight starting the day
     """
-    try:
-        # Handle start time
-        start = event.instance.vevent.dtstart.value
-        
-        # Check if it's a datetime or date object
-        if isinstance(start, datetime):
-            start = get_local_time(start)
-            weekday_en = start.strftime("%A")
-            date = f"{weekday_en} {start.strftime('%d.%m')}."
-            time_range = f"{start.strftime('%H:%M')}"
-        else:  # date object (all-day event)
-            weekday_en = start.strftime("%A")
-            date = f"{weekday_en} {start.strftime('%d.%m')}."
-            time_range = "Ganztägig"
+    return LOCAL_TIMEZONE.start_of_day(day)
 
-        # Handle end time
-        end = event.instance.vevent.dtend.value
+def get_event_sort_key(record: EventRecord) -> Union[date, datetime]:
+    """
+    Get a sort key for an event, handling both timed and all-day events.
+    
+    Args:
+        record: A normalized event record
         
-        if isinstance(end, datetime):
-            end = get_local_time(end)
-            if isinstance(start, datetime):
-                if start.date() == end.date():
-                    time_range += f" - {end.strftime('%H:%M')}"
-                else:
-                    time_range += " - OpenEnd"
-            else:
-                time_range += " - OpenEnd"
-        else:  # date object (all-day event)
-            if start != end:  # If end date is different from start date
-                # Subtract one day from end date since CalDAV stores end date as day after event
-                last_day = end - timedelta(days=1)
-                time_range += f" bis einschließlich {last_day.strftime('%d.%m')}."
-
-        weekday = WEEKDAY_TRANSLATIONS[weekday_en]
-
-        # Safely get event properties
-        try:
-            original_title = event.instance.vevent.summary.value if hasattr(event.instance.vevent, 'summary') else "Unbenannter Termin"
-        except Exception:
-            original_title = "Unbenannter Termin"
-
-        try:
-            description = event.instance.vevent.description.value if hasattr(event.instance.vevent, 'description') else "Keine Beschreibung vorhanden."
-        except Exception:
-            description = "Keine Beschreibung vorhanden."
-
-        # Detect + prune "rauchfrei" and surrounding brackets
-        if "rauchfrei" in original_title.lower():
-            smoking_info = "Rauchfrei"
-            # Remove "rauchfrei" and any surrounding brackets
-            title = original_title
-            title = title.replace("(rauchfrei)", "").replace("[rauchfrei]", "").replace("{rauchfrei}", "")
-            title = title.replace("(Rauchfrei)", "").replace("[Rauchfrei]", "").replace("{Rauchfrei}", "")
-            title = title.replace("rauchfrei", "").replace("Rauchfrei", "")
-            title = title.strip(":,- ()[]{}")  # Remove any remaining brackets and separators
-        else:
-            smoking_info = "Rauchkneipe"
-            title = original_title
-
-        title = title.split(",", 1)[0]
+    Returns:
+        Union[date, datetime]: A sortable key for the event
+    """
+    if record.all_day:
+        return record.start
+    return record.start.date()
 
-        text = (
-            f"  🗓  {date}\n"
-            f"  🕖  {time_range}\n"
-            f"  🃏  {title}\n"
-            f"  🫧  {description}\n"
-            f"  🪩  {smoking_info}"
-        )
+def get_event_span(record: EventRecord) -> Tuple[datetime, datetime]:
+    """
+    Get the start and end of an event in the local timezone.
+    
+    All-day events span from midnight of their first day to midnight
+    after their last day.
+    
+    Args:
+        record: A normalized event record
+        
+    Returns:
+        Tuple[datetime, datetime]: (start, end) as local datetimes
+    """
+    if not record.all_day:
+        return record.start, record.end
+    return LOCAL_TIMEZONE.start_of_day(record.start), LOCAL_TIMEZONE.start_of_day(record.end)
 
-        # Replace English weekday with German
-        for en, de in WEEKDAY_TRANSLATIONS.items():
-            text = text.replace(en, de)
+def get_event_start(record: EventRecord) -> datetime:
+    """
+    Get the start of an event as a local datetime, used to order events
+    of all kinds and calendars.
+    
+    Args:
+        record: A normalized event record
+        
+    Returns:
+        datetime: Start of the event in the local timezone
+    """
+    return get_event_span(record)[0]
 
-        logger.debug(f"Event formatted: {date} - {title}")
+def format_event(record: EventRecord) -> Tuple[str, str]:
+    """
+    Format a calendar event into a readable format.
+    
+    Args:
+        record: A normalized event record
+        
+    Returns:
+        tuple: (date, text) - Formatted date and event text
+    """
+    try:
+        date, text = render_event(record)
+        logger.debug(f"Event formatted: {date} - {record.title}")
         return date, text
         
     except Exception as e:
         logger.error(f"Error formatting event: {e}")
-        # Try to get basic event info for logging
-        try:
-            event_info = f"Event: {event.instance.vevent.summary.value if hasattr(event.instance.vevent, 'summary') else 'Unnamed event'}"
-            logger.error(f"Error with event: {event_info}")
-        except:
-            logger.error("Error formatting an event (no additional details available)")
+        logger.error(f"Error with event: {record.title or 'Unnamed event'} ({record.uid})")
         raise  # Re-raise the exception to be handled by the caller 
\ No newline at end of file
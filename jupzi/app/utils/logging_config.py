@@ -67,8 +67,10 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 # Calendar configuration
 CALDAV_URL = os.getenv('CALDAV_URL')
 CALENDAR_PATH = os.getenv('CALENDAR_PATH')
+CALENDAR_PATHS = [path.strip() for path in (CALENDAR_PATH or '').split(',') if path.strip()]  # Comma-separated for several calendars
 CALDAV_USERNAME = os.getenv('CALDAV_USERNAME')
 CALDAV_PASSWORD = os.getenv('CALDAV_PASSWORD')
 
 # Timezone configuration
-TIMEZONE = os.getenv('TIMEZONE', 'Europe/Berlin')  # Default to Berlin if not specified 
\ No newline at end of file
+TIMEZONE = os.getenv('TIMEZONE', 'Europe/Berlin')  # Default to Berlin if not specified
+TIMEZONE_BACKEND = os.getenv('TIMEZONE_BACKEND', 'zoneinfo')  # 'zoneinfo' or 'pytz' 
\ No newline at end of file
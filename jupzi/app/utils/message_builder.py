@@ -0,0 +1,158 @@
+"""
+Message building with Telegram's length limit in mind.
+"""
+from typing import List
+
+# Maximum length of a Telegram text message
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+def telegram_length(text: str) -> int:
+    """
+    Get the length of a text as Telegram counts it (UTF-16 code units).
+
+    Emoji outside the basic multilingual plane count twice.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Length in UTF-16 code units
+    """
+    return len(text) + sum(1 for char in text if ord(char) > 0xFFFF)
+
+class MessageBuilder:
+    """
+    Collects message fragments and joins them once.
+
+    Fragments are kept in a list instead of being appended to a string,
+    so building a message is linear in its length. Each fragment is an
+    unbreakable unit (e.g. one event) that chunks() never splits unless
+    it is longer than a whole message on its own.
+    """
+    def __init__(self, header: str = "", footer: str = "", separator: str = "",
+                 limit: int = TELEGRAM_MESSAGE_LIMIT):
+        """
+        Initialize an empty message.
+
+        Args:
+            header: Text at the start of the first chunk
+            footer: Text at the end of the last chunk
+            separator: Text placed between fragments
+            limit: Maximum length of a chunk
+        """
+        self.header = header
+        self.footer = footer
+        self.separator = separator
+        self.limit = limit
+        self._fragments: List[str] = []
+
+    def add(self, fragment: str) -> 'MessageBuilder':
+        """
+        Append a fragment.
+
+        Args:
+            fragment: Text that should stay in one chunk
+
+        Returns:
+            MessageBuilder: self, for chaining
+        """
+        self._fragments.append(fragment)
+        return self
+
+    def __len__(self) -> int:
+        """Number of fragments added."""
+        return len(self._fragments)
+
+    def build(self) -> str:
+        """
+        Join header, fragments and footer into one string.
+
+        Returns:
+            str: The complete message, regardless of its length
+        """
+        return self.header + self.separator.join(self._fragments) + self.footer
+
+    def chunks(self) -> List[str]:
+        """
+        Split the message into ready-to-send chunks within the limit.
+
+        Chunks break between fragments; the header starts the first chunk
+        and the footer ends the last one. Fragments longer than the limit
+        are split at line breaks, or hard if a single line is too long.
+
+        Returns:
+            List of message texts, each at most limit long
+        """
+        chunks: List[str] = []
+        current: List[str] = []
+        length = 0
+        separator_length = telegram_length(self.separator)
+
+        def flush() -> None:
+            nonlocal current, length
+            if current:
+                chunks.append("".join(current))
+            current = []
+            length = 0
+
+        def push(piece: str, piece_length: int) -> None:
+            nonlocal length
+            current.append(piece)
+            length += piece_length
+
+        if self.header:
+            for piece in self._split(self.header):
+                if length and length + telegram_length(piece) > self.limit:
+                    flush()
+                push(piece, telegram_length(piece))
+
+        for index, fragment in enumerate(self._fragments):
+            separator = self.separator if index and current else ""
+            needed = telegram_length(separator) + telegram_length(fragment)
+            if length + needed > self.limit:
+                flush()
+                separator = ""
+                needed = telegram_length(fragment)
+            if needed > self.limit:
+                for piece in self._split(fragment):
+                    if length and length + telegram_length(piece) > self.limit:
+                        flush()
+                    push(piece, telegram_length(piece))
+                continue
+            if separator:
+                push(separator, separator_length)
+            push(fragment, telegram_length(fragment))
+
+        for piece in self._split(self.footer) if self.footer else ():
+            if length and length + telegram_length(piece) > self.limit:
+                flush()
+            push(piece, telegram_length(piece))
+
+        flush()
+        return chunks
+
+    def _split(self, text: str) -> List[str]:
+        """Cut a text into pieces within the limit, preferably at line breaks."""
+        if telegram_length(text) <= self.limit:
+            return [text]
+
+        pieces: List[str] = []
+        for line in text.splitlines(keepends=True):
+            while telegram_length(line) > self.limit:
+                cut = self._cut_index(line)
+                pieces.append(line[:cut])
+                line = line[cut:]
+            if pieces and telegram_length(pieces[-1]) + telegram_length(line) <= self.limit:
+                pieces[-1] += line
+            else:
+                pieces.append(line)
+        return pieces
+
+    def _cut_index(self, text: str) -> int:
+        """Get the largest prefix length of a text that fits the limit."""
+        length = 0
+        for index, char in enumerate(text):
+            length += 2 if ord(char) > 0xFFFF else 1
+            if length > self.limit:
+                return index
+        return len(text)
@@ -27,9 +27,14 @@ REMINDER_MESSAGE = "⚠️ Please participate in the poll! So far, less than {re
 # {total_votes} - The total number of votes received
 SUCCESS_MESSAGE = "Thank you for voting! 👍"
 
+# Final results message template, followed by one line per option
+# Available placeholders:
+# {title} - The poll title
+POLL_RESULTS_HEADER = "📊 The poll \"{title}\" has closed. Results:\n"
+
 # Poll settings
 POLL_SETTINGS = {
-    "is_anonymous": False,  # Set to True if you want anonymous polls
+    "is_anonymous": False,  # Keep False, answers to anonymous polls are never reported to the bot
     "allows_multiple_answers": False,  # Set to True if you want to allow multiple selections
 }
 
@@ -58,5 +63,30 @@ WEEKDAY_TRANSLATIONS = {
 }
 
 # Common message headers
-FREE_DAYS_HEADER = "Here are the free days in the next two weeks ({start_date} - {end_date}):\n"
-WEEKLY_OVERVIEW_HEADER = "Here's the weekly overview ({start_date}. - {end_date}.):\n" 
\ No newline at end of file
+# Available placeholders:
+# {period} - The look-ahead of the report, see FREE_DAYS_PERIODS
+FREE_DAYS_HEADER = "Here are the free days {period} ({start_date} - {end_date}):\n"
+NO_FREE_DAYS_TEXT = "No free days {period}."
+WEEKLY_OVERVIEW_HEADER = "Here's the weekly overview ({start_date}. - {end_date}.):\n"
+
+# Look-ahead of the free days report by number of days
+# Available placeholders in FREE_DAYS_PERIOD_DAYS:
+# {days} - Number of days, used for lengths not listed in FREE_DAYS_PERIODS
+FREE_DAYS_PERIODS = {
+    7: "in the next week",
+    14: "in the next two weeks",
+    21: "in the next three weeks",
+    28: "in the next four weeks"
+}
+FREE_DAYS_PERIOD_DAYS = "in the next {days} days"
+
+# Notice sent when the weekly overview changed after it was delivered
+CHANGED_EVENTS_HEADER = "Changes to the weekly overview ({start_date}. - {end_date}.):\n"
+CHANGED_EVENTS_LABELS = {
+    "added": "➕ New:",
+    "changed": "✏️ Changed:",
+    "removed": "➖ Cancelled:"
+}
+
+# Prepended to reports built from the last good data during a calendar outage
+STALE_DATA_NOTICE = "⚠️ The calendar is currently unreachable, data as of {fetched_at}.\n\n"
\ No newline at end of file
@@ -25,9 +25,14 @@ REMINDER_MESSAGE = "⚠️ Bitte an der Umfrage teilnehmen! Bisher haben weniger
 # Success message template
 SUCCESS_MESSAGE = "Danke für's abstimmen! 👍"
 
+# Final results message template, followed by one line per option
+# Available placeholders:
+# {title} - The poll title
+POLL_RESULTS_HEADER = "📊 Die Umfrage „{title}“ ist beendet. Ergebnis:\n"
+
 # Poll settings
 POLL_SETTINGS = {
-    "is_anonymous": False,  # Set to True if you want anonymous polls
+    "is_anonymous": False,  # Keep False, answers to anonymous polls are never reported to the bot
     "allows_multiple_answers": False,  # Set to True if you want to allow multiple selections
 }
 
@@ -56,5 +61,30 @@ WEEKDAY_TRANSLATIONS = {
 }
 
 # Common message headers
-FREE_DAYS_HEADER = "Hier sind die freien Tage in den nächsten zwei Wochen ({start_date} - {end_date}):\n"
-WEEKLY_OVERVIEW_HEADER = "Hier sind die geplanten Veranstaltungen für nächste Woche ({start_date} - {end_date}):\n"
\ No newline at end of file
+# Available placeholders:
+# {period} - The look-ahead of the report, see FREE_DAYS_PERIODS
+FREE_DAYS_HEADER = "Hier sind die freien Tage {period} ({start_date} - {end_date}):\n"
+NO_FREE_DAYS_TEXT = "Keine freien Tage {period}."
+WEEKLY_OVERVIEW_HEADER = "Hier sind die geplanten Veranstaltungen für nächste Woche ({start_date} - {end_date}):\n"
+
+# Look-ahead of the free days report by number of days
+# Available placeholders in FREE_DAYS_PERIOD_DAYS:
+# {days} - Number of days, used for lengths not listed in FREE_DAYS_PERIODS
+FREE_DAYS_PERIODS = {
+    7: "in der nächsten Woche",
+    14: "in den nächsten zwei Wochen",
+    21: "in den nächsten drei Wochen",
+    28: "in den nächsten vier Wochen"
+}
+FREE_DAYS_PERIOD_DAYS = "in den nächsten {days} Tagen"
+
+# Notice sent when the weekly overview changed after it was delivered
+CHANGED_EVENTS_HEADER = "Änderungen an den Veranstaltungen für nächste Woche ({start_date} - {end_date}):\n"
+CHANGED_EVENTS_LABELS = {
+    "added": "➕ Neu:",
+    "changed": "✏️ Geändert:",
+    "removed": "➖ Entfällt:"
+}
+
+# Prepended to reports built from the last good data during a calendar outage
+STALE_DATA_NOTICE = "⚠️ Der Kalender ist gerade nicht erreichbar, Stand: {fetched_at}.\n\n"
\ No newline at end of file
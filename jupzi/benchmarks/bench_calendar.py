@@ -0,0 +1,193 @@
+"""
+Benchmark of the calendar pipeline against the local CalDAV stand-in.
+
+Measures, per calendar size, the latency of
+  fetch   streaming the calendar-query REPORT of the whole period
+  parse   expanding the fetched resources into event records
+  format  rendering the weekly overview message chunks
+  job     the weekly overview and free dates jobs end to end
+          (fetch, expand, merge, render or mark, build), and the free
+          dates job through a free-busy-query
+
+Usage:
+    python -m benchmarks.bench_calendar --sizes 100,1000,10000,100000
+    python -m benchmarks.bench_calendar --cassette recorded/ --repeat 5
+    python -m benchmarks.bench_calendar --record recorded/ --url https://dav.example/cal/
+"""
+from datetime import date, datetime, timedelta
+from statistics import median
+from typing import Callable, Dict, List, Tuple
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from app.core.calendar.async_client import AsyncCalDAVClient
+from app.core.calendar.dav_xml import calendar_query
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.merge import fetch_parallel_async
+from app.core.calendar.occupancy import DayOccupancy
+from app.core.calendar.render import EventRenderCache
+from app.core.calendar.recurrence import expand_resource
+from app.core.calendar.timezones import LocalTimezone
+from app.utils.message_builder import MessageBuilder
+from benchmarks.caldav_server import (
+    StandInCalendar,
+    StandInServer,
+    generate_events,
+    load_cassette,
+    save_cassette
+)
+
+LOCAL = LocalTimezone('Europe/Berlin')
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+
+def event_start(record: EventRecord) -> datetime:
+    """Start of an event as a local datetime, the merge key."""
+    return LOCAL.start_of_day(record.start) if record.all_day else record.start
+
+def overview(records: List[EventRecord], cache: EventRenderCache) -> List[str]:
+    """Render records like CalendarService._build_week_overview."""
+    builder = MessageBuilder(header="Wochenübersicht\n", footer="\n", separator="\n\n")
+    for record in records:
+        builder.add(cache.render(record))
+    return builder.chunks()
+
+def free_days(records: List[EventRecord], start: datetime, days: int) -> List[date]:
+    """Compute free days like CalendarService._format_free_dates."""
+    occupancy = DayOccupancy(start.date(), days)
+    occupancy.mark_events(records)
+    return occupancy.free_days()
+
+def timed(function: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """Run a function several times and get its median latency in ms and its last result."""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - began) * 1000)
+    return median(samples), result
+
+async def fetch_resources(client: AsyncCalDAVClient, start: datetime, end: datetime) -> list:
+    return [resource async for resource in client.report(calendar_query(start, end))]
+
+def run_size(calendar: StandInCalendar, start: datetime, days: int, repeat: int) -> Dict[str, float]:
+    """Benchmark every stage against one calendar."""
+    end = start + timedelta(days=days)
+    results: Dict[str, float] = {'events': len(calendar)}
+
+    with StandInServer(calendar) as server:
+        loop = asyncio.new_event_loop()
+        client = AsyncCalDAVClient(server.calendar_url)
+        try:
+            results['fetch_ms'], resources = timed(
+                lambda: loop.run_until_complete(fetch_resources(client, start, end)), repeat
+            )
+
+            def parse() -> List[EventRecord]:
+                records = []
+                for resource in resources:
+                    records.extend(expand_resource(resource.calendar_data, start, end, resource.etag))
+                records.sort(key=event_start)
+                return records
+
+            results['parse_ms'], records = timed(parse, repeat)
+            results['occurrences'] = len(records)
+            results['format_cold_ms'], chunks = timed(lambda: overview(records, EventRenderCache()), repeat)
+            cache = EventRenderCache(max_entries=len(records) + 1)
+            overview(records, cache)
+            results['format_warm_ms'], _ = timed(lambda: overview(records, cache), repeat)
+            results['messages'] = len(chunks)
+
+            def overview_job() -> List[str]:
+                events = loop.run_until_complete(
+                    fetch_parallel_async(AsyncCalDAVClient.search, [client], start, end, event_start)
+                )
+                return overview(list(events), cache)
+
+            def free_dates_job() -> List[date]:
+                events = loop.run_until_complete(client.search(start, end))
+                return free_days(events, start, days)
+
+            def free_busy_job() -> List[date]:
+                occupancy = DayOccupancy(start.date(), days)
+                occupancy.mark_spans(loop.run_until_complete(client.free_busy(start, end)))
+                return occupancy.free_days()
+
+            results['overview_job_ms'], _ = timed(overview_job, repeat)
+            results['free_dates_job_ms'], _ = timed(free_dates_job, repeat)
+            results['free_busy_job_ms'], _ = timed(free_busy_job, repeat)
+        finally:
+            loop.run_until_complete(client.close())
+            loop.close()
+    return results
+
+def record(url: str, username: str, password: str, directory: str, start: datetime, end: datetime) -> int:
+    """Record the resources of a real calendar in a period as a cassette."""
+    async def fetch() -> list:
+        client = AsyncCalDAVClient(url, username, password)
+        try:
+            return await fetch_resources(client, start, end)
+        finally:
+            await client.close()
+
+    resources = asyncio.run(fetch())
+    return save_cassette(directory, (
+        (resource.href.rstrip('/').rsplit('/', 1)[-1], resource.calendar_data)
+        for resource in resources if resource.calendar_data
+    ))
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the calendar pipeline against a local CalDAV stand-in")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated numbers of synthetic events")
+    parser.add_argument('--cassette', help="Benchmark a recorded calendar instead of synthetic ones")
+    parser.add_argument('--days', type=int, default=28, help="Length of the benchmarked period in days")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per stage, the median is reported")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON lines")
+    parser.add_argument('--record', metavar='DIR', help="Record a real calendar into a cassette and exit")
+    parser.add_argument('--url', help="Calendar URL to record")
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    args = parser.parse_args(argv)
+
+    start = LOCAL.start_of_day(date.today())
+    if args.record:
+        if not args.url:
+            parser.error("--record needs --url")
+        count = record(args.url, args.username, args.password, args.record,
+                       start, start + timedelta(days=args.days))
+        print(f"Recorded {count} resources into {args.record}")
+        return 0
+
+    if args.cassette:
+        calendar = StandInCalendar()
+        calendar.put_many(load_cassette(args.cassette))
+        calendars = [calendar]
+    else:
+        calendars = []
+        for size in (int(value) for value in args.sizes.split(',')):
+            calendar = StandInCalendar()
+            calendar.put_many(generate_events(size, start.date(), args.days))
+            calendars.append(calendar)
+
+    columns = ('events', 'occurrences', 'messages', 'fetch_ms', 'parse_ms', 'format_cold_ms',
+               'format_warm_ms', 'overview_job_ms', 'free_dates_job_ms', 'free_busy_job_ms')
+    if not args.json:
+        print(' '.join(f"{column:>17}" for column in columns))
+    for calendar in calendars:
+        results = run_size(calendar, start, args.days, args.repeat)
+        if args.json:
+            print(json.dumps(results))
+        else:
+            print(' '.join(
+                f"{results[column]:>17.1f}" if column.endswith('_ms') else f"{results[column]:>17}"
+                for column in columns
+            ))
+        sys.stdout.flush()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
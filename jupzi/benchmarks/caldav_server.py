@@ -0,0 +1,484 @@
+"""
+Local CalDAV stand-in server for tests and benchmarks.
+
+Serves one calendar collection from memory, filled from a recorded
+cassette (a directory of .ics resources) or with synthetic events, and
+answers the requests the bot sends: PROPFIND (ctag, sync-token, etag
+listing), calendar-query, calendar-multiget, sync-collection and
+free-busy-query REPORTs, and GET. Multistatus responses are sent with
+chunked transfer encoding, so clients parse them while they stream in.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import random
+import zlib
+
+import icalendar
+import recurring_ical_events
+
+DAV_NS = "DAV:"
+CALDAV_NS = "urn:ietf:params:xml:ns:caldav"
+CALENDARSERVER_NS = "http://calendarserver.org/ns/"
+
+FOREVER = datetime.max.replace(tzinfo=timezone.utc)
+SYNC_TOKEN_PREFIX = "http://standin.invalid/sync/"
+
+# Multistatus responses are flushed in chunks of about this size
+FLUSH_SIZE = 64 * 1024
+
+def _utc(value: Union[date, datetime]) -> datetime:
+    """Get a DATE or DATE-TIME value as an aware UTC datetime."""
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time.min, tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def _parse_utc(value: str) -> datetime:
+    """Parse a CalDAV UTC timestamp like 20261019T000000Z."""
+    return datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+
+class Resource:
+    """One calendar object resource with its precomputed time span."""
+    __slots__ = ('name', 'ical', 'etag', 'start', 'end', 'recurring', 'revision')
+
+    def __init__(self, name: str, ical: str, revision: int):
+        self.name = name
+        self.ical = ical
+        self.etag = f'"{revision}-{zlib.crc32(ical.encode("utf-8")):08x}"'
+        self.revision = revision
+
+        calendar = icalendar.Calendar.from_ical(ical)
+        events = list(calendar.walk('VEVENT'))
+        self.recurring = any('RRULE' in event or 'RDATE' in event for event in events)
+        self.start = FOREVER
+        self.end = FOREVER
+        for event in events:
+            start = event.decoded('DTSTART')
+            if 'DTEND' in event:
+                end = event.decoded('DTEND')
+            elif 'DURATION' in event:
+                end = start + event.decoded('DURATION')
+            else:
+                end = start + timedelta(days=1) if not isinstance(start, datetime) else start
+            self.start = min(self.start, _utc(start))
+            self.end = FOREVER if self.recurring else max(_utc(end), self.start)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Check whether the resource may have occurrences in a period."""
+        return self.start < end and (self.end > start or self.start >= start)
+
+class StandInCalendar:
+    """
+    In-memory calendar collection with a change log for sync-collection.
+
+    Every change bumps the revision; the sync token is the revision, and
+    deleted resources are remembered so incremental syncs can report them.
+    """
+    def __init__(self, path: str = '/calendars/bench/events/'):
+        """
+        Initialize an empty calendar.
+
+        Args:
+            path: URL path of the collection, ending with a slash
+        """
+        self.path = path
+        self.revision = 0
+        self._resources: Dict[str, Resource] = {}
+        self._deleted: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    @property
+    def sync_token(self) -> str:
+        return f"{SYNC_TOKEN_PREFIX}{self.revision}"
+
+    def put(self, name: str, ical: str) -> Resource:
+        """
+        Create or replace a resource.
+
+        Args:
+            name: File name of the resource, e.g. <uid>.ics
+            ical: VCALENDAR text
+
+        Returns:
+            Resource: The stored resource
+        """
+        with self._lock:
+            self.revision += 1
+            resource = Resource(name, ical, self.revision)
+            self._resources[name] = resource
+            self._deleted.pop(name, None)
+            return resource
+
+    def put_many(self, resources: Iterable[Tuple[str, str]]) -> None:
+        """Store many (name, ical) resources."""
+        for name, ical in resources:
+            self.put(name, ical)
+
+    def delete(self, name: str) -> bool:
+        """
+        Delete a resource.
+
+        Args:
+            name: File name of the resource
+
+        Returns:
+            True if the resource existed
+        """
+        with self._lock:
+            if self._resources.pop(name, None) is None:
+                return False
+            self.revision += 1
+            self._deleted[name] = self.revision
+            return True
+
+    def get(self, name: str) -> Optional[Resource]:
+        """Get a resource by file name."""
+        return self._resources.get(name)
+
+    def resources(self) -> List[Resource]:
+        """Get a consistent list of all resources."""
+        with self._lock:
+            return list(self._resources.values())
+
+    def changes_since(self, revision: int) -> Tuple[List[Resource], List[str], int]:
+        """
+        Get the changes after a revision.
+
+        Args:
+            revision: Revision of the last sync, 0 for everything
+
+        Returns:
+            tuple: (changed resources, deleted names, current revision)
+        """
+        with self._lock:
+            changed = [r for r in self._resources.values() if r.revision > revision]
+            deleted = [name for name, rev in self._deleted.items() if rev > revision] if revision else []
+            return changed, deleted, self.revision
+
+    def href(self, name: str) -> str:
+        return self.path + name
+
+def load_cassette(directory: Union[str, Path]) -> List[Tuple[str, str]]:
+    """
+    Read a recorded calendar.
+
+    Args:
+        directory: Directory with one .ics file per calendar resource
+
+    Returns:
+        List of (name, ical) tuples
+    """
+    return [(path.name, path.read_text(encoding='utf-8')) for path in sorted(Path(directory).glob('*.ics'))]
+
+def save_cassette(directory: Union[str, Path], resources: Iterable[Tuple[str, str]]) -> int:
+    """
+    Record calendar resources as a cassette.
+
+    Args:
+        directory: Target directory, created if missing
+        resources: (name, ical) tuples
+
+    Returns:
+        int: Number of resources written
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for name, ical in resources:
+        (directory / name).write_text(ical, encoding='utf-8')
+        count += 1
+    return count
+
+TITLES = ["Pub Quiz", "Karaoke", "Kicker-Turnier", "Lesung", "Konzert", "Spieleabend", "Flohmarkt"]
+
+def generate_events(
+    count: int,
+    first_day: date,
+    days: int = 28,
+    recurring_ratio: float = 0.02,
+    all_day_ratio: float = 0.1,
+    seed: int = 0
+) -> Iterator[Tuple[str, str]]:
+    """
+    Generate a synthetic calendar.
+
+    Events are spread evenly over the period; a share of them are
+    all-day, multi-day or weekly recurring, and some titles carry the
+    "rauchfrei" marker, so every formatting branch is exercised.
+
+    Args:
+        count: Number of resources
+        first_day: First day of the period
+        days: Length of the period in days
+        recurring_ratio: Share of weekly recurring events
+        all_day_ratio: Share of all-day events
+        seed: Random seed, equal seeds give equal calendars
+
+    Yields:
+        tuple: (name, ical) of every resource
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        uid = f"bench-{index}"
+        day = first_day + timedelta(days=rng.randrange(days))
+        title = rng.choice(TITLES) + (", rauchfrei" if rng.random() < 0.3 else "")
+        lines = [
+            "BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//jupzi//standin//DE",
+            "BEGIN:VEVENT", f"UID:{uid}", "DTSTAMP:20260101T000000Z", "SEQUENCE:0",
+            f"SUMMARY:{title}", f"DESCRIPTION:Synthetisches Ereignis {index}",
+        ]
+        kind = rng.random()
+        if kind < all_day_ratio:
+            last = day + timedelta(days=rng.choice((1, 1, 1, 2, 3)))
+            lines += [f"DTSTART;VALUE=DATE:{day:%Y%m%d}", f"DTEND;VALUE=DATE:{last:%Y%m%d}"]
+        else:
+            start = datetime.combine(day, time(rng.randrange(10, 22), rng.choice((0, 30))))
+            end = start + timedelta(hours=rng.choice((1, 2, 3, 6)))
+            lines += [f"DTSTART:{start:%Y%m%dT%H%M%S}Z", f"DTEND:{end:%Y%m%dT%H%M%S}Z"]
+            if kind > 1 - recurring_ratio:
+                lines.append("RRULE:FREQ=WEEKLY;COUNT=12")
+        lines += ["END:VEVENT", "END:VCALENDAR", ""]
+        yield f"{uid}.ics", "\r\n".join(lines)
+
+def _response(href: str, etag: Optional[str] = None, ical: Optional[str] = None, status: int = 200) -> str:
+    """Render one <response> element."""
+    if status != 200:
+        return f"<D:response><D:href>{escape(href)}</D:href><D:status>HTTP/1.1 {status} Not Found</D:status></D:response>"
+    data = f"<C:calendar-data>{escape(ical)}</C:calendar-data>" if ical is not None else ""
+    return (
+        f"<D:response><D:href>{escape(href)}</D:href><D:propstat><D:prop>"
+        f"<D:getetag>{escape(etag)}</D:getetag>{data}"
+        "</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat></D:response>"
+    )
+
+class CalDAVHandler(BaseHTTPRequestHandler):
+    """Request handler of the stand-in server."""
+    protocol_version = 'HTTP/1.1'
+    server: 'StandInServer'
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep benchmark and test output clean."""
+
+    def do_GET(self) -> None:
+        resource = self.server.calendar.get(self._name())
+        if resource is None:
+            self._send(404, b'', 'text/plain')
+            return
+        self._send(200, resource.ical.encode('utf-8'), 'text/calendar; charset=utf-8', etag=resource.etag)
+
+    def do_PROPFIND(self) -> None:
+        self._read_body()
+        calendar = self.server.calendar
+        if self.headers.get('Depth', '0') == '0':
+            body = (
+                '<?xml version="1.0" encoding="utf-8"?>'
+                f'<D:multistatus xmlns:D="{DAV_NS}" xmlns:C="{CALDAV_NS}" xmlns:CS="{CALENDARSERVER_NS}">'
+                f'<D:response><D:href>{calendar.path}</D:href><D:propstat><D:prop>'
+                '<D:resourcetype><D:collection/><C:calendar/></D:resourcetype>'
+                '<D:displayname>Stand-in</D:displayname>'
+                f'<CS:getctag>{calendar.revision}</CS:getctag>'
+                f'<D:sync-token>{calendar.sync_token}</D:sync-token>'
+                '</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat></D:response>'
+                '</D:multistatus>'
+            )
+            self._send(207, body.encode('utf-8'), 'application/xml; charset=utf-8')
+            return
+        self._send_multistatus(
+            _response(calendar.href(r.name), r.etag) for r in calendar.resources()
+        )
+
+    def do_REPORT(self) -> None:
+        try:
+            root = ElementTree.fromstring(self._read_body())
+        except ElementTree.ParseError:
+            self._send(400, b'Malformed XML', 'text/plain')
+            return
+
+        calendar = self.server.calendar
+        wants_data = root.find(f'.//{{{CALDAV_NS}}}calendar-data') is not None
+        if root.tag == f'{{{CALDAV_NS}}}calendar-query':
+            start, end = self._time_range(root)
+            self._send_multistatus(
+                _response(calendar.href(r.name), r.etag, r.ical if wants_data else None)
+                for r in calendar.resources() if r.overlaps(start, end)
+            )
+        elif root.tag == f'{{{CALDAV_NS}}}calendar-multiget':
+            self._send_multistatus(self._multiget(root))
+        elif root.tag == f'{{{DAV_NS}}}sync-collection':
+            self._sync_collection(root, wants_data)
+        elif root.tag == f'{{{CALDAV_NS}}}free-busy-query':
+            start, end = self._time_range(root)
+            self._send(200, self._free_busy(start, end).encode('utf-8'), 'text/calendar; charset=utf-8')
+        else:
+            self._send(403, b'Unsupported report', 'text/plain')
+
+    def _multiget(self, root: ElementTree.Element) -> Iterator[str]:
+        calendar = self.server.calendar
+        for element in root.iter(f'{{{DAV_NS}}}href'):
+            href = (element.text or '').strip()
+            resource = calendar.get(href.rsplit('/', 1)[-1])
+            if resource is None:
+                yield _response(href, status=404)
+            else:
+                yield _response(href, resource.etag, resource.ical)
+
+    def _sync_collection(self, root: ElementTree.Element, wants_data: bool) -> None:
+        calendar = self.server.calendar
+        token = (root.findtext(f'{{{DAV_NS}}}sync-token') or '').strip()
+        revision = 0
+        if token:
+            if not token.startswith(SYNC_TOKEN_PREFIX) or not token[len(SYNC_TOKEN_PREFIX):].isdigit():
+                self._send(403, b'<D:error xmlns:D="DAV:"><D:valid-sync-token/></D:error>', 'application/xml')
+                return
+            revision = int(token[len(SYNC_TOKEN_PREFIX):])
+
+        changed, deleted, current = calendar.changes_since(revision)
+        responses = [
+            _response(calendar.href(r.name), r.etag, r.ical if wants_data else None) for r in changed
+        ]
+        responses += [_response(calendar.href(name), status=404) for name in deleted]
+        self._send_multistatus(responses, f"<D:sync-token>{SYNC_TOKEN_PREFIX}{current}</D:sync-token>")
+
+    def _free_busy(self, start: datetime, end: datetime) -> str:
+        """Build a VFREEBUSY answer from the events overlapping a period."""
+        lines = [
+            "BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//jupzi//standin//DE", "BEGIN:VFREEBUSY",
+            f"DTSTART:{start:%Y%m%dT%H%M%SZ}", f"DTEND:{end:%Y%m%dT%H%M%SZ}",
+        ]
+        for resource in self.server.calendar.resources():
+            if not resource.overlaps(start, end):
+                continue
+            calendar = icalendar.Calendar.from_ical(resource.ical)
+            for occurrence in recurring_ical_events.of(calendar).between(start, end):
+                busy_start = _utc(occurrence.decoded('DTSTART'))
+                busy_end = _utc(occurrence.decoded('DTEND')) if 'DTEND' in occurrence else busy_start
+                lines.append(f"FREEBUSY;FBTYPE=BUSY:{busy_start:%Y%m%dT%H%M%SZ}/{busy_end:%Y%m%dT%H%M%SZ}")
+        lines += ["END:VFREEBUSY", "END:VCALENDAR", ""]
+        return "\r\n".join(lines)
+
+    def _time_range(self, root: ElementTree.Element) -> Tuple[datetime, datetime]:
+        element = root.find(f'.//{{{CALDAV_NS}}}time-range')
+        if element is None:
+            return datetime.min.replace(tzinfo=timezone.utc), FOREVER
+        start = element.get('start')
+        end = element.get('end')
+        return (
+            _parse_utc(start) if start else datetime.min.replace(tzinfo=timezone.utc),
+            _parse_utc(end) if end else FOREVER
+        )
+
+    def _name(self) -> str:
+        return unquote(urlsplit(self.path).path).rsplit('/', 1)[-1]
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_multistatus(self, responses: Iterable[str], trailer: str = '') -> None:
+        """Send a multistatus document with chunked transfer encoding."""
+        self.send_response(207)
+        self.send_header('Content-Type', 'application/xml; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        buffer = [
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<D:multistatus xmlns:D="{DAV_NS}" xmlns:C="{CALDAV_NS}">'
+        ]
+        size = 0
+        for response in responses:
+            buffer.append(response)
+            size += len(response)
+            if size >= FLUSH_SIZE:
+                self._write_chunk(''.join(buffer).encode('utf-8'))
+                buffer, size = [], 0
+        buffer.append(f'{trailer}</D:multistatus>')
+        self._write_chunk(''.join(buffer).encode('utf-8'))
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f'{len(data):X}\r\n'.encode('ascii') + data + b'\r\n')
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    HTTP server serving a StandInCalendar on localhost.
+
+    Usable as a context manager, which runs it in a background thread.
+    """
+    daemon_threads = True
+
+    def __init__(self, calendar: Optional[StandInCalendar] = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Bind the server.
+
+        Args:
+            calendar: Calendar to serve, an empty one by default
+            host: Interface to listen on
+            port: Port to listen on, 0 for any free port
+        """
+        super().__init__((host, port), CalDAVHandler)
+        self.calendar = calendar or StandInCalendar()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def calendar_url(self) -> str:
+        """URL of the served calendar collection."""
+        return self.url + self.calendar.path
+
+    def __enter__(self) -> 'StandInServer':
+        self._thread = Thread(target=self.serve_forever, name='caldav-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a recorded or synthetic calendar over CalDAV")
+    parser.add_argument('--events', type=int, default=1000, help="Number of synthetic events")
+    parser.add_argument('--cassette', help="Directory of recorded .ics resources to serve instead")
+    parser.add_argument('--days', type=int, default=28, help="Days the synthetic events are spread over")
+    parser.add_argument('--port', type=int, default=5232)
+    args = parser.parse_args()
+
+    calendar = StandInCalendar()
+    if args.cassette:
+        calendar.put_many(load_cassette(args.cassette))
+    else:
+        calendar.put_many(generate_events(args.events, date.today(), args.days))
+    server = StandInServer(calendar, port=args.port)
+    print(f"Serving {len(calendar)} resources at {server.calendar_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,74 @@
+import pytest
+import requests
+from datetime import date, datetime, timedelta, timezone
+from app.core.calendar.dav_stream import stream_propfind, stream_report
+from app.core.calendar.dav_xml import (
+    MultistatusParser,
+    calendar_multiget,
+    calendar_query,
+    free_busy_query,
+    propfind_etags,
+    sync_collection
+)
+from app.core.calendar.freebusy import parse_busy_periods
+from benchmarks.caldav_server import StandInCalendar, StandInServer, generate_events
+
+FIRST_DAY = date(2026, 10, 19)
+START = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+class Client:
+    """The attributes of a caldav.DAVClient that dav_stream uses."""
+    def __init__(self):
+        self.session = requests.Session()
+        self.headers = {}
+        self.auth = None
+        self.username = None
+        self.password = None
+        self.timeout = 10
+        self.ssl_verify_cert = True
+
+@pytest.fixture
+def server():
+    calendar = StandInCalendar()
+    calendar.put_many(generate_events(300, FIRST_DAY, days=28))
+    with StandInServer(calendar) as server:
+        yield server
+
+def test_calendar_query_filters_by_time_range(server):
+    week = list(stream_report(Client(), server.calendar_url, calendar_query(START, START + timedelta(days=7))))
+    everything = list(stream_report(Client(), server.calendar_url, calendar_query(START, START + timedelta(days=60))))
+    assert 0 < len(week) < len(everything) == 300
+    assert all(resource.calendar_data.startswith("BEGIN:VCALENDAR") for resource in week)
+
+def test_multiget_and_etag_listing(server):
+    listed = {r.href: r.etag for r in stream_propfind(Client(), server.calendar_url, propfind_etags())}
+    assert len(listed) == 300
+
+    hrefs = sorted(listed)[:3] + [server.calendar_url + "missing.ics"]
+    resources = list(stream_report(Client(), server.calendar_url, calendar_multiget(hrefs), depth=None))
+    assert [r.status for r in resources] == [200, 200, 200, 404]
+    assert all(listed[r.href] == r.etag for r in resources[:3])
+
+def test_sync_collection_reports_changes_and_deletions(server):
+    parser = MultistatusParser()
+    assert len(list(stream_report(Client(), server.calendar_url, sync_collection(None), parser=parser))) == 300
+
+    calendar = server.calendar
+    name, ical = next(generate_events(1, FIRST_DAY, seed=1))
+    calendar.put(name, ical.replace("bench-0", "bench-new"))
+    calendar.put("bench-new.ics", ical.replace("bench-0", "bench-new"))
+    calendar.delete("bench-1.ics")
+
+    changes = list(stream_report(Client(), server.calendar_url, sync_collection(parser.sync_token)))
+    assert sorted((r.href.rsplit('/', 1)[-1], r.status) for r in changes) == [
+        ("bench-0.ics", 200), ("bench-1.ics", 404), ("bench-new.ics", 200)
+    ]
+
+def test_free_busy_query(server):
+    response = requests.request(
+        'REPORT', server.calendar_url, data=free_busy_query(START, START + timedelta(days=7)),
+        headers={'Depth': '1'}, timeout=10
+    )
+    assert response.status_code == 200
+    busy = parse_busy_periods(response.text, timezone.utc)
+    assert busy and all(start < START + timedelta(days=7) for start, _ in busy)
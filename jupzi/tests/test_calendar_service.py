@@ -0,0 +1,58 @@
+import pytest
+from datetime import timedelta
+from types import SimpleNamespace
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.resilience import StaleEvents
+from app.core.calendar.snapshot import write_snapshot
+from app.services.calendar import CalendarService
+from app.utils.calendar_utils import get_event_span, get_local_time, get_start_of_day
+
+TODAY = get_start_of_day(get_local_time().date())
+
+def event(uid, days):
+    start = TODAY + timedelta(days=days, hours=19)
+    return EventRecord(uid, start, start + timedelta(hours=3), False, title=uid)
+
+class FakeLoader:
+    """Stands in for loading a window from the calendars."""
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def __call__(self, start, end):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return [event('live', 1)]
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    path = tmp_path / 'calendar_snapshot.bin'
+    write_snapshot(path, [event('snapshot', 1)], get_event_span, (TODAY, TODAY + timedelta(days=21)))
+    service = CalendarService(SimpleNamespace(calendar_snapshot_path=str(path), caldav_retry_attempts=1))
+    service._load_window = FakeLoader()
+    # Reconcile and revalidation are run by the tests, not in the background
+    monkeypatch.setattr('app.services.calendar.threading.Thread', lambda **kwargs: SimpleNamespace(start=lambda: None))
+    service._load_events()
+    return service
+
+def titles(events):
+    return [record.title for record in events]
+
+def test_snapshot_is_served_while_the_reconcile_is_pending(service):
+    assert titles(service._fetch_events(TODAY, TODAY + timedelta(days=7))) == ['snapshot']
+    assert service._load_window.calls == 0
+
+def test_failed_reconcile_stops_serving_the_snapshot_as_fresh_data(service):
+    service._load_window.error = ConnectionError("calendar down")
+    service._reconcile()
+
+    # Every request tries the server again, the snapshot only stands in as stale data
+    events = service._fetch_events(TODAY, TODAY + timedelta(days=7))
+    assert isinstance(events, StaleEvents)
+    assert titles(events) == ['snapshot']
+    assert service._load_window.calls == 2
+
+    service._load_window.error = None
+    assert titles(service._fetch_events(TODAY, TODAY + timedelta(days=7))) == ['live']
+    assert service._snapshot is None
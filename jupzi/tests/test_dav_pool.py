@@ -0,0 +1,109 @@
+import pytest
+import threading
+from types import SimpleNamespace
+from app.core.calendar.dav_pool import DAVClientPool
+
+class FakeClient:
+    def __init__(self, url, username, password):
+        self.url = url
+        self.username = username
+        self.closed = False
+        self.healthy = True
+        self.on_options = None
+
+    def options(self, url):
+        if self.on_options:
+            self.on_options()
+        if not self.healthy:
+            raise ConnectionError("connection reset")
+        return SimpleNamespace(status=200)
+
+    def close(self):
+        self.closed = True
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def pool(clock):
+    return DAVClientPool(idle_timeout=600, health_check_interval=60, factory=FakeClient, clock=clock)
+
+def test_clients_are_reused_per_url_and_user(pool):
+    first = pool.get_client("https://dav.example", "bar", "secret")
+    assert pool.get_client("https://dav.example", "bar", "secret") is first
+    assert pool.get_client("https://dav.example", "stage", "secret") is not first
+    assert pool.stats()['created'] == 2
+    assert pool.stats()['reused'] == 1
+
+def test_idle_clients_are_evicted(pool, clock):
+    first = pool.get_client("https://dav.example", "bar", "secret")
+    pool.release_client(first)
+    clock.now = 601
+    assert pool.evict_idle() == 1
+    assert first.closed
+    assert pool.get_client("https://dav.example", "bar", "secret") is not first
+
+def test_unhealthy_client_is_replaced(pool, clock):
+    first = pool.get_client("https://dav.example", "bar", "secret")
+    pool.release_client(first)
+    first.healthy = False
+    clock.now = 120
+    second = pool.get_client("https://dav.example", "bar", "secret")
+    assert second is not first
+    assert first.closed
+    assert pool.stats()['unhealthy'] == 1
+
+def test_changed_password_creates_new_client(pool):
+    first = pool.get_client("https://dav.example", "bar", "secret")
+    pool.release_client(first)
+    assert pool.get_client("https://dav.example", "bar", "rotated") is not first
+    assert first.closed
+
+def test_checked_out_clients_are_not_evicted(pool, clock):
+    first = pool.get_client("https://dav.example", "bar", "secret")
+    clock.now = 1000
+    assert pool.evict_idle() == 0
+    assert not first.closed
+
+    # Idle time counts from the release, not from the checkout
+    pool.release_client(first)
+    clock.now = 1500
+    assert pool.evict_idle() == 0
+    clock.now = 1600
+    assert pool.evict_idle() == 1
+    assert first.closed
+
+def test_replaced_client_is_closed_after_its_release(pool):
+    first = pool.get_client("https://dav.example", "bar", "secret")
+    second = pool.get_client("https://dav.example", "bar", "rotated")
+    assert second is not first
+    assert not first.closed
+    pool.release_client(first)
+    assert first.closed
+
+def test_health_probe_runs_outside_the_pool_lock(pool, clock):
+    slow = pool.get_client("https://slow.example", "bar", "secret")
+    pool.release_client(slow)
+    clock.now = 120
+    checked_out = []
+
+    def probe():
+        # Another server is served while the probe is on the wire
+        other = threading.Thread(
+            target=lambda: checked_out.append(pool.get_client("https://fast.example", "bar", "secret"))
+        )
+        other.start()
+        other.join(timeout=5)
+        assert not other.is_alive()
+
+    slow.on_options = probe
+    assert pool.get_client("https://slow.example", "bar", "secret") is slow
+    assert len(checked_out) == 1
@@ -0,0 +1,87 @@
+import pytest
+from caldav.lib.error import ReportError
+from app.core.calendar.dav_stream import stream_report
+from app.core.calendar.dav_xml import MultistatusParser, calendar_multiget, sync_collection
+
+RESPONSE = b"""<?xml version="1.0" encoding="utf-8"?>
+<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
+%s
+  <D:sync-token>http://example.com/sync/%d</D:sync-token>
+</D:multistatus>
+"""
+
+EVENT = b"""  <D:response>
+    <D:href>/cal/%d.ics</D:href>
+    <D:propstat>
+      <D:prop><D:getetag>"%d"</D:getetag><C:calendar-data>BEGIN:VCALENDAR
+END:VCALENDAR</C:calendar-data></D:prop>
+      <D:status>HTTP/1.1 200 OK</D:status>
+    </D:propstat>
+  </D:response>"""
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+        self.chunks_read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), 100):
+            self.chunks_read += 1
+            yield self.body[i:i + 100]
+
+    def close(self):
+        self.closed = True
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self.response
+
+class FakeClient:
+    def __init__(self, response):
+        self.session = FakeSession(response)
+        self.headers = {'User-Agent': 'test'}
+        self.auth = None
+        self.username = 'bar'
+        self.password = 'secret'
+        self.timeout = 10
+        self.ssl_verify_cert = True
+
+def test_resources_are_yielded_while_streaming():
+    body = RESPONSE % (b"\n".join(EVENT % (i, i) for i in range(50)), 7)
+    client = FakeClient(FakeResponse(207, body))
+    parser = MultistatusParser()
+
+    resources = stream_report(client, "https://dav.example/cal/", sync_collection(None), parser=parser)
+    first = next(resources)
+    assert first.href == "https://dav.example/cal/0.ics"
+    assert client.session.response.chunks_read < len(body) // 100
+
+    assert len([first, *resources]) == 50
+    assert parser.sync_token == "http://example.com/sync/7"
+    assert client.session.response.closed
+
+    method, _, kwargs = client.session.calls[0]
+    assert method == 'REPORT'
+    assert kwargs['stream'] is True
+    assert kwargs['auth'] == ('bar', 'secret')
+    assert kwargs['headers']['Depth'] == '1'
+
+def test_non_multistatus_answer_raises():
+    client = FakeClient(FakeResponse(403, b"forbidden"))
+    with pytest.raises(ReportError):
+        list(stream_report(client, "https://dav.example/cal/", sync_collection("http://example.com/sync/1")))
+    assert client.session.response.closed
+
+def test_multiget_is_sent_without_depth():
+    client = FakeClient(FakeResponse(207, RESPONSE % (EVENT % (1, 1), 1)))
+    body = calendar_multiget(["https://dav.example/cal/1.ics"])
+    resources = list(stream_report(client, "https://dav.example/cal/", body, depth=None))
+    assert [resource.etag for resource in resources] == ['"1"']
+    assert 'Depth' not in client.session.calls[0][2]['headers']
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from app.core.calendar.dav_xml import MultistatusParser, calendar_multiget, calendar_query, free_busy_query, sync_collection
+
+MULTISTATUS = b"""<?xml version="1.0" encoding="utf-8"?>
+<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
+  <D:response>
+    <D:href>/cal/a.ics</D:href>
+    <D:propstat>
+      <D:prop>
+        <D:getetag>"1"</D:getetag>
+        <C:calendar-data>BEGIN:VCALENDAR
+END:VCALENDAR</C:calendar-data>
+      </D:prop>
+      <D:status>HTTP/1.1 200 OK</D:status>
+    </D:propstat>
+  </D:response>
+  <D:response>
+    <D:href>/cal/b.ics</D:href>
+    <D:status>HTTP/1.1 404 Not Found</D:status>
+  </D:response>
+  <D:sync-token>http://example.com/sync/2</D:sync-token>
+</D:multistatus>
+"""
+
+def parse_in_chunks(document, size):
+    parser = MultistatusParser()
+    resources = []
+    for i in range(0, len(document), size):
+        resources.extend(parser.feed(document[i:i + size]))
+    resources.extend(parser.close())
+    return parser, resources
+
+def test_resources_are_yielded_incrementally():
+    parser = MultistatusParser()
+    cut = MULTISTATUS.index(b'<D:response>', MULTISTATUS.index(b'</D:response>'))
+    first = list(parser.feed(MULTISTATUS[:cut]))
+    assert [r.href for r in first] == ['/cal/a.ics']
+    rest = list(parser.feed(MULTISTATUS[cut:])) + list(parser.close())
+    assert [r.href for r in rest] == ['/cal/b.ics']
+
+def test_parsed_fields():
+    parser, resources = parse_in_chunks(MULTISTATUS, 7)
+    first, second = resources
+    assert first.etag == '"1"'
+    assert first.calendar_data.startswith('BEGIN:VCALENDAR')
+    assert first.status == 200
+    assert second.status == 404
+    assert second.calendar_data is None
+    assert parser.sync_token == 'http://example.com/sync/2'
+
+def test_calendar_query_uses_utc_time_range():
+    body = calendar_query(
+        datetime(2026, 10, 19, tzinfo=timezone.utc),
+        datetime(2026, 10, 26, tzinfo=timezone.utc)
+    ).decode()
+    assert 'start="20261019T000000Z"' in body
+    assert 'end="20261026T000000Z"' in body
+    assert '<C:calendar-data/>' in body
+
+def test_free_busy_query_has_no_event_data():
+    body = free_busy_query(
+        datetime(2026, 10, 19, tzinfo=timezone.utc),
+        datetime(2026, 11, 2, tzinfo=timezone.utc)
+    ).decode()
+    assert body.count('<C:free-busy-query') == 1
+    assert 'end="20261102T000000Z"' in body
+    assert 'calendar-data' not in body
+
+def test_calendar_multiget_lists_paths():
+    body = calendar_multiget(["https://dav.example/cal/a.ics", "/cal/b&c.ics"]).decode()
+    assert '<D:href>/cal/a.ics</D:href><D:href>/cal/b&amp;c.ics</D:href>' in body
+    assert '<C:calendar-data/>' in body
+
+def test_sync_collection_without_bodies_lists_etags_only():
+    body = sync_collection(None, calendar_data=False).decode()
+    assert '<D:sync-token></D:sync-token>' in body
+    assert '<D:getetag/>' in body
+    assert 'calendar-data' not in body
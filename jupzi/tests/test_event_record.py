@@ -0,0 +1,49 @@
+import icalendar
+import pytz
+from datetime import date, datetime
+from app.core.calendar.event_record import EventRecord
+
+BERLIN = pytz.timezone('Europe/Berlin')
+
+def parse_vevent(body):
+    calendar = icalendar.Calendar.from_ical(
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:test\r\nBEGIN:VEVENT\r\n"
+        + body.replace("\n", "\r\n")
+        + "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+    return calendar.walk('VEVENT')[0]
+
+def test_timed_event_is_converted_to_local_time():
+    record = EventRecord.from_component(parse_vevent(
+        "UID:quiz-1\nDTSTART:20261019T170000Z\nDTEND:20261019T210000Z\n"
+        "SUMMARY:Quiz (rauchfrei)\nDESCRIPTION:Pub quiz\n"
+    ), BERLIN)
+    assert record.uid == 'quiz-1'
+    assert not record.all_day
+    assert record.start.hour == 19
+    assert record.end.hour == 23
+    assert record.start.utcoffset() == BERLIN.utcoffset(datetime(2026, 10, 19, 19))
+    assert record.smoking_free
+    assert record.description == 'Pub quiz'
+
+def test_floating_time_is_taken_as_local():
+    record = EventRecord.from_component(parse_vevent(
+        "UID:f\nDTSTART:20261019T190000\nDURATION:PT3H\nSUMMARY:Konzert\n"
+    ), BERLIN)
+    assert record.start.hour == 19
+    assert record.end.hour == 22
+    assert record.start.tzinfo is not None
+    assert not record.smoking_free
+
+def test_all_day_event_keeps_dates():
+    record = EventRecord.from_component(parse_vevent(
+        "UID:d\nDTSTART;VALUE=DATE:20261024\n"
+    ), BERLIN)
+    assert record.all_day
+    assert record.start == date(2026, 10, 24)
+    assert record.end == date(2026, 10, 25)
+    assert record.title is None
+
+def test_records_have_no_instance_dict():
+    record = EventRecord('u', date(2026, 1, 1), date(2026, 1, 2), True)
+    assert not hasattr(record, '__dict__')
@@ -0,0 +1,53 @@
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from app.core.calendar.event_store import EventStore
+
+BASE = datetime(2026, 10, 19, 12, 0)
+
+def make_event(event_id, hours_from_base, duration_hours=1):
+    start = BASE + timedelta(hours=hours_from_base)
+    return SimpleNamespace(id=event_id, start_time=start, end_time=start + timedelta(hours=duration_hours))
+
+@pytest.fixture
+def store():
+    store = EventStore()
+    for event_id, offset in [(1, 5), (2, 0), (3, 48), (4, 24), (5, 24)]:
+        store.add(make_event(event_id, offset))
+    return store
+
+def test_iteration_is_ordered_by_start(store):
+    assert [e.id for e in store] == [2, 1, 4, 5, 3]
+    assert len(store) == 5
+
+def test_get_and_remove(store):
+    assert store.get(4).id == 4
+    assert store.remove(4).id == 4
+    assert store.get(4) is None
+    assert store.remove(4) is None
+    assert 4 not in store
+    assert [e.id for e in store] == [2, 1, 5, 3]
+
+def test_add_replaces_existing_id(store):
+    store.add(make_event(3, -10))
+    assert len(store) == 5
+    assert [e.id for e in store][0] == 3
+
+def test_starting_between_is_inclusive(store):
+    events = store.starting_between(BASE + timedelta(hours=5), BASE + timedelta(hours=24))
+    assert [e.id for e in events] == [1, 4, 5]
+
+class UnsavedEvent:
+    """Hashed by identity, like an ORM object."""
+    def __init__(self, hours_from_base):
+        self.id = None
+        self.start_time = BASE + timedelta(hours=hours_from_base)
+
+def test_unsaved_events_are_kept_apart():
+    store = EventStore()
+    first, second = UnsavedEvent(1), UnsavedEvent(2)
+    store.add(first)
+    store.add(second)
+    assert list(store) == [first, second]
+    assert store.remove(first) is first
+    assert list(store) == [second]
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+from app.core.polls.expiry import ExpiryQueue
+
+NOW = datetime(2026, 10, 19, 12)
+
+def test_pops_only_due_keys_in_deadline_order():
+    queue = ExpiryQueue()
+    queue.schedule('late', NOW + timedelta(hours=1))
+    queue.schedule('second', NOW - timedelta(minutes=1))
+    queue.schedule('first', NOW - timedelta(minutes=5))
+    assert queue.pop_due(NOW) == ['first', 'second']
+    assert queue.pop_due(NOW) == []
+    assert queue.next_deadline() == NOW + timedelta(hours=1)
+    assert len(queue) == 1
+
+def test_rescheduled_deadlines_are_skipped():
+    queue = ExpiryQueue()
+    queue.schedule('moved', NOW - timedelta(minutes=1))
+    queue.schedule('moved', NOW + timedelta(minutes=10))
+    assert queue.next_deadline() == NOW + timedelta(minutes=10)
+    assert queue.pop_due(NOW) == []
+    assert queue.pop_due(NOW + timedelta(minutes=10)) == ['moved']
+    assert 'moved' not in queue and queue.next_deadline() is None
@@ -0,0 +1,196 @@
+import asyncio
+import pytest
+import threading
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from app.core.bot.bot import JupziBot
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.overview_diff import WeekOverview, keyed_fragments
+from app.core.scheduler.jobs import CalendarSyncJob, WeeklyOverviewJob
+from app.core.scheduler.scheduler import JobScheduler
+
+MONDAY = date(2026, 10, 19)
+
+def overview(*texts):
+    rendered = [(EventRecord(f'event-{i}', MONDAY, MONDAY, True), text) for i, text in enumerate(texts)]
+    return WeekOverview(MONDAY, keyed_fragments(rendered), list(texts))
+
+class FakeCalendarService:
+    def __init__(self):
+        self.overview = None
+
+    def get_config_value(self, key, default=None):
+        return default
+
+    async def get_week_overview_async(self):
+        return self.overview
+
+    def format_overview_changes(self, overview, diff):
+        return ["Änderungen: " + ", ".join(diff.changed)]
+
+class FakeTelegramService:
+    def __init__(self):
+        self.shown = {}
+        self.sent = []
+        self.failing = set()
+
+    async def send_messages(self, chunks):
+        messages = []
+        for text in chunks:
+            message_id = len(self.sent)
+            self.sent.append(text)
+            self.shown[message_id] = text
+            messages.append(SimpleNamespace(message_id=message_id))
+        return messages
+
+    async def send_message(self, text, chat_id=None):
+        return (await self.send_messages([text]))[0]
+
+    async def edit_message(self, message_id, text):
+        if message_id in self.failing:
+            raise ConnectionError("edit failed")
+        self.shown[message_id] = text
+
+def test_failed_edit_rolls_back_and_sends_a_notice():
+    calendar, telegram = FakeCalendarService(), FakeTelegramService()
+    job = WeeklyOverviewJob(calendar, telegram)
+    calendar.overview = overview('Quiz', 'Fest')
+    asyncio.run(job.execute())
+
+    telegram.failing.add(1)
+    calendar.overview = overview('Quiz um 20 Uhr', 'Fest am Sonntag')
+    asyncio.run(job.execute())
+
+    # The first message shows the delivered version again, next to the notice
+    assert telegram.shown == {0: 'Quiz', 1: 'Fest', 2: 'Änderungen: Quiz um 20 Uhr, Fest am Sonntag'}
+    assert job._shown_chunks == ['Quiz', 'Fest']
+    assert job._delivered is calendar.overview
+
+    # The next change brings every overview message up to date
+    telegram.failing.clear()
+    calendar.overview = overview('Quiz um 20 Uhr', 'Fest am Samstag')
+    asyncio.run(job.execute())
+    assert [telegram.shown[0], telegram.shown[1]] == ['Quiz um 20 Uhr', 'Fest am Samstag']
+    assert job._shown_chunks == ['Quiz um 20 Uhr', 'Fest am Samstag']
+    assert len(telegram.sent) == 3
+
+class FakePollingCalendarService:
+    def __init__(self, interval):
+        self.interval = interval
+        self.polled = threading.Event()
+
+    def poll_calendar(self):
+        self.polled.set()
+        return self.interval
+
+def test_calendar_sync_job_reschedules_itself(tmp_path):
+    scheduler = JobScheduler(SimpleNamespace(database_url=f"sqlite:///{tmp_path / 'jobs.db'}"))
+    calendar = FakePollingCalendarService(interval=120)
+    job = CalendarSyncJob(calendar, scheduler)
+    scheduler.start()
+    try:
+        scheduler.add_interval_job(job.job_id, job.execute, 300)
+        assert calendar.polled.wait(5)
+        for _ in range(50):
+            if '0:02:00' in scheduler.get_job(job.job_id)['trigger']:
+                break
+            time.sleep(0.1)
+        assert '0:02:00' in scheduler.get_job(job.job_id)['trigger']
+    finally:
+        scheduler.stop()
+
+class FakePollService:
+    def __init__(self, expired):
+        self.expired = expired
+        self.cleaned_up = False
+
+    def add_expiry_listener(self, listener):
+        pass
+
+    def next_expiry(self):
+        return datetime.utcnow() - timedelta(seconds=1) if self.expired else None
+
+    def close_expired_polls(self):
+        closed, self.expired = self.expired, []
+        return closed
+
+    def format_poll_results(self, poll):
+        return f"Ergebnis {poll.id}"
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+class FakeScheduler:
+    def __init__(self):
+        self.jobs = {}
+        self.loop = None
+
+    def set_event_loop(self, loop):
+        self.loop = loop
+
+    def add_interval_job(self, job_id, func, seconds):
+        self.jobs[job_id] = seconds
+
+    def stop(self):
+        pass
+
+def scheduled_bot(tmp_path, expired):
+    bot = JupziBot(SimpleNamespace(state_file_path=str(tmp_path / 'state.json')))
+    bot.scheduler = FakeScheduler()
+    bot.services = {
+        'calendar': SimpleNamespace(get_poll_interval=lambda: 300),
+        'poll': FakePollService(expired),
+        'telegram': FakeTelegramService()
+    }
+    return bot
+
+def test_poll_expiry_job_runs_on_the_bot_loop(tmp_path):
+    poll = SimpleNamespace(id=7, message_id=None, chat_id=1)
+    bot = scheduled_bot(tmp_path, [poll])
+
+    async def run():
+        bot.schedule_jobs()
+        assert bot.scheduler.loop is asyncio.get_running_loop()
+        task = bot._expiry_task
+        for _ in range(50):
+            if bot.services['telegram'].sent:
+                break
+            await asyncio.sleep(0.01)
+        bot.stop()
+        await asyncio.sleep(0)
+        return task
+
+    task = asyncio.run(run())
+    assert bot.services['telegram'].sent == ['Ergebnis 7']
+    assert task.cancelled()
+    # Stopping the bot writes the buffered votes
+    assert bot.services['poll'].cleaned_up
+    assert list(bot.scheduler.jobs) == ['calendar-sync']
+
+def test_jobs_need_the_bot_loop(tmp_path):
+    bot = scheduled_bot(tmp_path, [])
+    with pytest.raises(RuntimeError):
+        bot.schedule_jobs()
+    assert bot.scheduler.jobs == {} and bot._expiry_task is None
+
+def test_coroutine_jobs_run_on_the_given_loop(tmp_path):
+    scheduler = JobScheduler(SimpleNamespace(database_url=f"sqlite:///{tmp_path / 'jobs.db'}"))
+    loops = []
+
+    async def job():
+        loops.append(asyncio.get_running_loop())
+
+    async def run():
+        scheduler.set_event_loop(asyncio.get_running_loop())
+        scheduler.start()
+        scheduler.add_interval_job('job', job, 300)
+        for _ in range(100):
+            if loops:
+                break
+            await asyncio.sleep(0.05)
+        scheduler.stop()
+        return asyncio.get_running_loop()
+
+    loop = asyncio.run(run())
+    assert loops == [loop]
@@ -0,0 +1,45 @@
+import asyncio
+import time
+import pytz
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from operator import attrgetter
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.merge import fetch_parallel, fetch_parallel_async, merge_by_start
+
+BERLIN = pytz.timezone('Europe/Berlin')
+MONDAY = BERLIN.localize(datetime(2026, 10, 19))
+start_key = attrgetter('start')
+
+def event(uid, hours):
+    start = MONDAY + timedelta(hours=hours)
+    return EventRecord(uid, start, start + timedelta(hours=2), False)
+
+CALENDARS = {
+    'bar': [event('bar-2', 30), event('bar-1', 6)],
+    'stage': [event('stage-1', 20), event('stage-2', 44)],
+    'private': [event('private-1', 1)],
+}
+
+def test_streams_are_merged_in_start_order():
+    merged = merge_by_start([[event('a', 1), event('a', 5)], [], [event('b', 3)]], start_key)
+    assert [record.start.hour for record in merged] == [1, 3, 5]
+
+def test_calendars_are_fetched_in_parallel():
+    def fetch(name, start, end):
+        time.sleep(0.2)
+        return CALENDARS[name]
+
+    began = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(CALENDARS)) as executor:
+        merged = list(fetch_parallel(executor, fetch, list(CALENDARS), MONDAY, MONDAY + timedelta(days=7), start_key))
+    assert time.monotonic() - began < 0.4
+    assert [record.uid for record in merged] == ['private-1', 'bar-1', 'stage-1', 'bar-2', 'stage-2']
+
+def test_async_fetch_merges_calendars():
+    async def fetch(name, start, end):
+        await asyncio.sleep(0.01)
+        return CALENDARS[name]
+
+    merged = asyncio.run(fetch_parallel_async(fetch, list(CALENDARS), MONDAY, MONDAY + timedelta(days=7), start_key))
+    assert [record.uid for record in merged] == ['private-1', 'bar-1', 'stage-1', 'bar-2', 'stage-2']
@@ -0,0 +1,30 @@
+from app.utils.message_builder import MessageBuilder, telegram_length
+
+def test_build_joins_fragments_once():
+    builder = MessageBuilder(header="Header\n", footer="\nFooter", separator="\n\n")
+    builder.add("one").add("two")
+    assert len(builder) == 2
+    assert builder.build() == "Header\none\n\ntwo\nFooter"
+    assert builder.chunks() == [builder.build()]
+
+def test_chunks_break_between_fragments():
+    builder = MessageBuilder(header="H\n", footer="\nF", separator="\n\n", limit=20)
+    for fragment in ["a" * 8, "b" * 8, "c" * 8]:
+        builder.add(fragment)
+    chunks = builder.chunks()
+    assert chunks == ["H\n" + "a" * 8 + "\n\n" + "b" * 8, "c" * 8 + "\nF"]
+    assert all(len(chunk) <= 20 for chunk in chunks)
+
+def test_oversized_fragment_is_split_at_lines():
+    builder = MessageBuilder(limit=10)
+    builder.add("12345\n6789\n" + "x" * 25)
+    chunks = builder.chunks()
+    assert "".join(chunks) == builder.build()
+    assert chunks[0] == "12345\n"
+    assert all(len(chunk) <= 10 for chunk in chunks)
+
+def test_length_counts_utf16_units():
+    assert telegram_length("ä") == 1
+    assert telegram_length("🃏") == 2
+    builder = MessageBuilder(limit=4).add("🃏🃏").add("🃏")
+    assert builder.chunks() == ["🃏🃏", "🃏"]
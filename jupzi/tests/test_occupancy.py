@@ -0,0 +1,56 @@
+import pytz
+from datetime import date, datetime, timedelta
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.freebusy import parse_busy_periods
+from app.core.calendar.occupancy import DayOccupancy
+
+BERLIN = pytz.timezone('Europe/Berlin')
+FIRST = date(2026, 10, 19)
+
+def timed(start, end):
+    return EventRecord('t', BERLIN.localize(start), BERLIN.localize(end), False)
+
+def all_day(start, end):
+    return EventRecord('d', start, end, True)
+
+def test_multi_day_events_block_every_day():
+    occupancy = DayOccupancy(FIRST, 7)
+    occupancy.mark_event(all_day(date(2026, 10, 20), date(2026, 10, 23)))
+    assert occupancy.free_days() == [date(2026, 10, 19), date(2026, 10, 23), date(2026, 10, 24), date(2026, 10, 25)]
+
+def test_timed_event_past_midnight_blocks_next_day():
+    occupancy = DayOccupancy(FIRST, 3)
+    occupancy.mark_event(timed(datetime(2026, 10, 19, 22), datetime(2026, 10, 20, 3)))
+    assert occupancy.free_days() == [date(2026, 10, 21)]
+
+def test_event_ending_at_midnight_keeps_next_day_free():
+    occupancy = DayOccupancy(FIRST, 2)
+    occupancy.mark_event(timed(datetime(2026, 10, 19, 20), datetime(2026, 10, 20, 0)))
+    assert occupancy.free_days() == [date(2026, 10, 20)]
+
+def test_spans_are_clipped_to_the_range():
+    occupancy = DayOccupancy(FIRST, 3)
+    occupancy.mark(FIRST - timedelta(days=10), FIRST + timedelta(days=1))
+    occupancy.mark(FIRST + timedelta(days=2), FIRST + timedelta(days=100))
+    assert occupancy.free_days() == [date(2026, 10, 20)]
+    assert occupancy.is_free(FIRST + timedelta(days=50))
+
+def test_long_horizon():
+    occupancy = DayOccupancy(FIRST, 366)
+    occupancy.mark(FIRST, FIRST + timedelta(days=200))
+    occupancy.mark(FIRST + timedelta(days=200), FIRST + timedelta(days=365))
+    assert occupancy.free_days() == [FIRST + timedelta(days=365)]
+    assert occupancy.free_days(FIRST, FIRST + timedelta(days=100)) == []
+
+def test_busy_periods_mark_local_days():
+    busy = parse_busy_periods(
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:test\r\nBEGIN:VFREEBUSY\r\n"
+        "FREEBUSY;FBTYPE=BUSY:20261019T170000Z/20261019T210000Z,20261020T220000Z/PT3H\r\n"
+        "FREEBUSY;FBTYPE=FREE:20261022T100000Z/20261022T120000Z\r\n"
+        "END:VFREEBUSY\r\nEND:VCALENDAR\r\n",
+        BERLIN
+    )
+    assert busy[0][0].hour == 19
+    occupancy = DayOccupancy(FIRST, 4)
+    occupancy.mark_spans(busy)
+    assert occupancy.free_days() == [date(2026, 10, 20), date(2026, 10, 22)]
@@ -0,0 +1,35 @@
+from datetime import date, datetime
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.overview_diff import WeekOverview, changed_chunks, diff_overviews, keyed_fragments
+
+MONDAY = date(2026, 10, 19)
+
+def record(uid, day=19, recurrence_id=None):
+    return EventRecord(uid, date(2026, 10, day), date(2026, 10, day + 1), True, recurrence_id=recurrence_id)
+
+def overview(*rendered):
+    return WeekOverview(MONDAY, keyed_fragments(rendered), [])
+
+def test_unchanged_week_has_empty_diff():
+    previous = overview((record('quiz'), 'Quiz'), (record('fest'), 'Fest'))
+    current = overview((record('quiz'), 'Quiz'), (record('fest'), 'Fest'))
+    assert diff_overviews(previous, current).is_empty()
+
+def test_added_changed_and_removed_blocks():
+    previous = overview((record('quiz'), 'Quiz'), (record('fest'), 'Fest'))
+    current = overview((record('quiz', 20), 'Quiz am Dienstag'), (record('lesung'), 'Lesung'))
+    diff = diff_overviews(previous, current)
+    assert (diff.added, diff.changed, diff.removed) == (['Lesung'], ['Quiz am Dienstag'], ['Fest'])
+
+def test_recurring_instances_and_duplicates_are_kept_apart():
+    first, second = datetime(2026, 10, 19, 19), datetime(2026, 10, 21, 19)
+    fragments = keyed_fragments([
+        (record('quiz', recurrence_id=first), 'Montag'),
+        (record('quiz', recurrence_id=second), 'Mittwoch'),
+        (record('fest'), 'Fest'),
+        (record('fest'), 'Fest'),
+    ])
+    assert list(fragments.values()) == ['Montag', 'Mittwoch', 'Fest', 'Fest']
+
+def test_only_differing_chunks_are_edited():
+    assert list(changed_chunks(['a', 'b', 'c'], ['a', 'B', 'c'])) == [(1, 'B')]
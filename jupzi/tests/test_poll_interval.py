@@ -0,0 +1,27 @@
+import pytest
+from app.core.scheduler.poll_interval import AdaptivePollInterval
+
+def test_quiet_polls_back_off_up_to_maximum():
+    interval = AdaptivePollInterval(initial=300, minimum=60, maximum=1000)
+    assert [interval.record(False) for _ in range(3)] == [600, 1000, 1000]
+
+def test_changes_drop_to_minimum():
+    interval = AdaptivePollInterval(initial=300, minimum=60, maximum=3600)
+    interval.record(False)
+    assert interval.record(True) == 60
+    assert interval.record(False) == 120
+    assert interval.current == 120
+
+def test_history_and_stats():
+    clock = iter(range(100)).__next__
+    interval = AdaptivePollInterval(initial=60, minimum=60, maximum=3600, history_size=3, clock=clock)
+    for changed in (True, False, False, True):
+        interval.record(changed)
+    assert [(r.polled_at, r.changed, r.next_interval) for r in interval.history()] == [
+        (1, False, 120), (2, False, 240), (3, True, 60)
+    ]
+    assert interval.stats() == {'polls': 3, 'changes': 1, 'change_rate': 1 / 3, 'interval': 60}
+
+def test_invalid_bounds_are_rejected():
+    with pytest.raises(ValueError):
+        AdaptivePollInterval(initial=300, minimum=600, maximum=60)
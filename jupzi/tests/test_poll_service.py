@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from app.models.polls import Poll, PollResponse
+from app.services.poll import PollService
+from app.services.telegram import TelegramService
+from app.utils.database import Database
+
+@pytest.fixture
+def config(tmp_path):
+    config = SimpleNamespace(database_url=f"sqlite:///{tmp_path / 'polls.db'}", poll_vote_flush_interval=60)
+    Database(config).create_tables()
+    return config
+
+@pytest.fixture
+def service(config):
+    service = PollService(config)
+    service.initialize()
+    yield service
+    service.cleanup()
+
+@pytest.fixture
+def poll(service):
+    return service.create_poll("Plenum", ["Ja", "Nein", "Vielleicht"], creator_id=1)
+
+def option_ids(poll):
+    return [option.id for option in poll.options]
+
+def sent(service, poll, telegram_poll_id='tg-1'):
+    poll.telegram_poll_id = telegram_poll_id
+    service.save_poll_message(poll)
+    return telegram_poll_id
+
+def responses(service):
+    with service._db.get_session() as session:
+        return {row.user_id: row.response for row in session.query(PollResponse)}
+
+def test_changed_vote_moves_between_counts(service, poll):
+    yes, no, maybe = option_ids(poll)
+    assert service.add_vote(poll.id, yes, 10)
+    assert service.add_vote(poll.id, yes, 11)
+    assert service.change_vote(poll.id, no, 10)
+    assert service.get_poll_results(poll.id) == {"Ja": 1, "Nein": 1, "Vielleicht": 0}
+    assert [option.vote_count for option in poll.options] == [1, 1, 0]
+    assert service.retract_vote(poll.id, 11)
+    assert service.get_poll_results(poll.id) == {"Ja": 0, "Nein": 1, "Vielleicht": 0}
+
+def test_votes_are_kept_in_the_voter_index_only(service, poll):
+    yes, no, maybe = option_ids(poll)
+    assert service.add_vote(poll.id, yes, 10)
+    assert service.change_vote(poll.id, maybe, 10)
+    assert poll.votes == []
+    assert [vote.option_id for vote in service._voters[poll.id][10]] == [maybe]
+    service.flush_votes()
+
+    reloaded = PollService(service.config)
+    reloaded.initialize()
+    try:
+        assert reloaded.get_poll_results(poll.id) == {"Ja": 0, "Nein": 0, "Vielleicht": 1}
+        assert reloaded.get_poll(poll.id).votes == []
+    finally:
+        reloaded.cleanup()
+
+def test_new_polls_report_their_answers(poll):
+    assert poll.is_anonymous is False
+
+def test_telegram_answers_add_change_and_retract_votes(service, poll):
+    telegram_poll_id = sent(service, poll)
+    assert service.apply_telegram_answer(telegram_poll_id, 10, [0], 'anna')
+    assert service.apply_telegram_answer(telegram_poll_id, 11, [0], 'ben')
+    assert service.get_poll_results(poll.id) == {"Ja": 2, "Nein": 0, "Vielleicht": 0}
+
+    assert service.apply_telegram_answer(telegram_poll_id, 10, [2], 'anna')
+    assert service.get_poll_results(poll.id) == {"Ja": 1, "Nein": 0, "Vielleicht": 1}
+
+    assert service.apply_telegram_answer(telegram_poll_id, 11, [], 'ben')
+    assert service.get_poll_results(poll.id) == {"Ja": 0, "Nein": 0, "Vielleicht": 1}
+    service.flush_votes()
+    assert responses(service) == {10: "Vielleicht"}
+
+def test_answers_to_unknown_polls_are_ignored(service, poll):
+    sent(service, poll)
+    service.flush_votes()
+    assert not service.apply_telegram_answer('unknown', 10, [0], 'anna')
+    assert not service.apply_telegram_answer('tg-1', 10, [3], 'anna')
+    assert service.get_poll_results(poll.id) == {"Ja": 0, "Nein": 0, "Vielleicht": 0}
+    assert service.flush_votes() == 0
+
+def test_closed_polls_are_dropped_once_written(service, poll):
+    telegram_poll_id = sent(service, poll)
+    yes, no, maybe = option_ids(poll)
+    assert service.add_vote(poll.id, no, 10)
+
+    assert service.close_expired_polls(datetime.utcnow() + timedelta(days=1)) == [poll]
+    # The results stay available from the closed poll itself
+    assert service.format_poll_results(poll).endswith("Ja: 0\nNein: 1\nVielleicht: 0\n")
+    assert service.get_poll(poll.id) is poll
+
+    service.flush_votes()
+    assert service.get_poll(poll.id) is None
+    assert service.get_poll_by_telegram_id(telegram_poll_id) is None
+    assert (service._tallies, service._voters, service._telegram_polls) == ({}, {}, {})
+    with service._db.get_session() as session:
+        assert session.get(Poll, poll.id).is_closed
+
+class RecordingPollService:
+    def __init__(self):
+        self.answers = []
+
+    def apply_telegram_answer(self, telegram_poll_id, user_id, option_indices, username=None):
+        self.answers.append((telegram_poll_id, user_id, option_indices, username))
+        return True
+
+def poll_answer(user, option_ids):
+    return SimpleNamespace(poll_answer=SimpleNamespace(poll_id='tg-1', user=user, option_ids=option_ids))
+
+def test_poll_answer_updates_are_passed_to_the_poll_service():
+    telegram, polls = TelegramService(SimpleNamespace()), RecordingPollService()
+    telegram.set_poll_service(polls)
+    asyncio.run(telegram._handle_poll_answer(poll_answer(SimpleNamespace(id=10, username='anna'), (1,)), None))
+    asyncio.run(telegram._handle_poll_answer(poll_answer(SimpleNamespace(id=10, username='anna'), ()), None))
+    # Answers given on behalf of a chat carry no user
+    asyncio.run(telegram._handle_poll_answer(poll_answer(None, (0,)), None))
+    assert polls.answers == [('tg-1', 10, [1], 'anna'), ('tg-1', 10, [], 'anna')]
@@ -0,0 +1,58 @@
+import pytest
+import pytz
+from datetime import datetime, timedelta
+from app.core.calendar.recurrence import RecurrenceExpander
+
+BERLIN = pytz.timezone('Europe/Berlin')
+MONDAY = BERLIN.localize(datetime(2026, 10, 19))
+
+WEEKLY_QUIZ = (
+    "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:test\r\n"
+    "BEGIN:VEVENT\r\nUID:quiz\r\nSEQUENCE:{sequence}\r\n"
+    "DTSTART:20261006T170000Z\r\nDTEND:20261006T200000Z\r\n"
+    "RRULE:FREQ=WEEKLY\r\nEXDATE:20261027T170000Z\r\nSUMMARY:{title}\r\n"
+    "END:VEVENT\r\nEND:VCALENDAR\r\n"
+)
+
+@pytest.fixture
+def expander():
+    expander = RecurrenceExpander()
+    expander.add_master('quiz', 0, WEEKLY_QUIZ.format(sequence=0, title='Quiz'))
+    return expander
+
+def test_occurrences_are_expanded_locally(expander):
+    occurrences = expander.expand('quiz', 0, MONDAY, MONDAY + timedelta(days=21))
+    assert [record.start.day for record in occurrences] == [20, 3]
+    assert occurrences[0].start.hour == 19
+
+def test_expansions_are_cached_per_window(expander):
+    week = (MONDAY, MONDAY + timedelta(days=7))
+    first = expander.expand('quiz', 0, *week)
+    assert expander.expand('quiz', 0, *week) == first
+    expander.expand('quiz', 0, MONDAY, MONDAY + timedelta(days=14))
+    stats = expander.stats()
+    assert (stats['hits'], stats['misses'], stats['parsed']) == (1, 2, 1)
+
+def test_new_sequence_replaces_master_and_expansions(expander):
+    week = (MONDAY, MONDAY + timedelta(days=7))
+    expander.expand('quiz', 0, *week)
+    expander.add_master('quiz', 1, WEEKLY_QUIZ.format(sequence=1, title='Pub Quiz'))
+    assert not expander.has_master('quiz', 0)
+    assert expander.expand('quiz', 1, *week)[0].title == 'Pub Quiz'
+    assert expander.stats()['expansions'] == 1
+    with pytest.raises(KeyError):
+        expander.expand('quiz', 0, *week)
+
+def test_invalidate_forgets_master(expander):
+    expander.expand('quiz', 0, MONDAY, MONDAY + timedelta(days=7))
+    expander.invalidate('quiz')
+    assert not expander.has_master('quiz', 0)
+    assert expander.stats()['expansions'] == 0
+
+def test_large_occurrence_sets_are_streamed_not_cached():
+    expander = RecurrenceExpander(max_cached_occurrences=10)
+    expander.add_master('quiz', 0, WEEKLY_QUIZ.format(sequence=0, title='Quiz'))
+    occurrences = expander.iter_expand('quiz', 0, MONDAY, MONDAY + timedelta(days=3650))
+    assert next(occurrences).start.day == 20
+    assert sum(1 for _ in occurrences) > 500
+    assert expander.stats()['expansions'] == 0
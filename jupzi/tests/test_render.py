@@ -0,0 +1,52 @@
+import pytest
+import pytz
+from datetime import date, datetime
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.render import EventRenderCache, normalize_title, render_event
+
+BERLIN = pytz.timezone('Europe/Berlin')
+
+def quiz(etag='"1"', title='Pub Quiz (rauchfrei), mit Preisen'):
+    return EventRecord(
+        'quiz', BERLIN.localize(datetime(2026, 10, 23, 19)), BERLIN.localize(datetime(2026, 10, 23, 23)),
+        False, title, None, True, recurrence_id=datetime(2026, 10, 23, 17), etag=etag
+    )
+
+@pytest.mark.parametrize('title, expected', [
+    ('Konzert (rauchfrei)', 'Konzert'),
+    ('Konzert [Rauchfrei]', 'Konzert'),
+    ('RAUCHFREI: Lesung', 'Lesung'),
+    ('Konzert - rauchfrei', 'Konzert'),
+    ('{rauchfrei} Friday Jam, danach Party', 'Friday Jam'),
+    ('(rauchfrei), Jam Session', 'Jam Session'),
+])
+def test_smoking_free_marker_is_removed(title, expected):
+    assert normalize_title(title, True) == expected
+
+def test_event_is_rendered_in_german():
+    date_text, text = render_event(quiz())
+    assert date_text == 'Freitag 23.10.'
+    assert text == (
+        "  🗓  Freitag 23.10.\n"
+        "  🕖  19:00 - 23:00\n"
+        "  🃏  Pub Quiz\n"
+        "  🫧  Keine Beschreibung vorhanden.\n"
+        "  🪩  Rauchfrei"
+    )
+
+def test_multi_day_all_day_event():
+    record = EventRecord('fest', date(2026, 10, 24), date(2026, 10, 27), True, 'Festival')
+    assert "  🕖  Ganztägig bis einschließlich 26.10.\n" in render_event(record)[1]
+    assert "  🪩  Rauchkneipe" in render_event(record)[1]
+
+def test_fragments_are_cached_per_etag():
+    cache = EventRenderCache()
+    first = cache.render(quiz())
+    assert cache.render(quiz()) is first
+    assert 'Quiz Night' in cache.render(quiz(etag='"2"', title='Quiz Night (rauchfrei)'))
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'fragments': 2}
+
+def test_records_without_etag_are_not_cached():
+    cache = EventRenderCache()
+    cache.render(quiz(etag=None))
+    assert cache.stats()['fragments'] == 0
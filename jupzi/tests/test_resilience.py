@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from app.core.calendar.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    retry,
+    retry_async
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def failing():
+    raise ConnectionError("server down")
+
+def test_circuit_opens_after_threshold_and_probes_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == [] and breaker.retry_after() == 30
+
+    clock.now = 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
+
+def test_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    clock.now = 10
+    assert breaker.allow()
+    # Only one probe goes through while it is running
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.retry_after() == 10
+
+def test_cancelled_probe_lets_the_next_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    clock.now = 10
+
+    async def cancel_probe():
+        started = asyncio.Event()
+
+        async def hanging():
+            started.set()
+            await asyncio.sleep(60)
+
+        probe = asyncio.create_task(breaker.call_async(hanging))
+        await started.wait()
+        assert not breaker.allow()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(cancel_probe())
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
+
+def test_backoff_is_jittered_within_capped_window():
+    assert backoff_delay(0, 0.5, 8, rng=lambda: 0.5) == 0.25
+    assert backoff_delay(3, 0.5, 8, rng=lambda: 0.999) < 4
+    assert backoff_delay(10, 0.5, 8, rng=lambda: 0.5) == 4
+
+def test_retry_until_success():
+    attempts, sleeps = [], []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("timeout")
+        return 'ok'
+
+    assert retry(flaky, attempts=3, sleep=sleeps.append) == 'ok'
+    assert len(sleeps) == 2
+
+def test_retry_gives_up_and_skips_other_errors():
+    with pytest.raises(ConnectionError):
+        retry(failing, attempts=2, sleep=lambda delay: None)
+
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad data")
+
+    with pytest.raises(ValueError):
+        retry(broken, attempts=3, retry_on=(ConnectionError,), sleep=lambda delay: None)
+    assert attempts == [1]
+
+def test_retry_async():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ConnectionError("timeout")
+        return 'ok'
+
+    assert asyncio.run(retry_async(flaky, attempts=2, base_delay=0)) == 'ok'
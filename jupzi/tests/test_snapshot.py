@@ -0,0 +1,52 @@
+import pytest
+from datetime import date, datetime, timedelta
+from app.core.calendar.event_record import EventRecord
+from app.core.calendar.snapshot import CalendarSnapshot, write_snapshot
+from app.core.calendar.timezones import LocalTimezone
+
+BERLIN = LocalTimezone('Europe/Berlin')
+MONDAY = BERLIN.localize(datetime(2026, 10, 19))
+
+def span(record):
+    if record.all_day:
+        return BERLIN.start_of_day(record.start), BERLIN.start_of_day(record.end)
+    return record.start, record.end
+
+@pytest.fixture
+def snapshot(tmp_path):
+    records = [
+        EventRecord('quiz', MONDAY + timedelta(hours=19), MONDAY + timedelta(hours=22), False,
+                    title='Pub Quiz', recurrence_id=MONDAY + timedelta(hours=19), etag='"1"'),
+        EventRecord('fest', date(2026, 10, 23), date(2026, 10, 26), True,
+                    title='Fest, rauchfrei', smoking_free=True),
+        EventRecord('late', MONDAY + timedelta(days=12), MONDAY + timedelta(days=12, hours=2), False,
+                    description='Ünïcödé 🃏'),
+    ]
+    path = tmp_path / 'calendar_snapshot.bin'
+    assert write_snapshot(path, reversed(records), span, (MONDAY, MONDAY + timedelta(days=21))) == 3
+    snapshot = CalendarSnapshot(path, BERLIN.tz)
+    yield snapshot
+    snapshot.close()
+
+def test_records_round_trip(snapshot):
+    quiz, fest, late = snapshot.between(MONDAY, MONDAY + timedelta(days=21))
+    assert (quiz.uid, quiz.title, quiz.etag, quiz.start) == ('quiz', 'Pub Quiz', '"1"', MONDAY + timedelta(hours=19))
+    assert quiz.recurrence_id == MONDAY + timedelta(hours=19)
+    assert (fest.all_day, fest.start, fest.end, fest.smoking_free) == (True, date(2026, 10, 23), date(2026, 10, 26), True)
+    assert fest.description is None
+    assert late.description == 'Ünïcödé 🃏'
+
+def test_overlap_queries_include_long_events(snapshot):
+    saturday = BERLIN.start_of_day(date(2026, 10, 24))
+    assert [r.uid for r in snapshot.between(saturday, saturday + timedelta(days=1))] == ['fest']
+    assert snapshot.between(MONDAY + timedelta(hours=22), MONDAY + timedelta(days=1)) == []
+
+def test_window_is_kept(snapshot):
+    assert snapshot.covers(MONDAY, MONDAY + timedelta(days=7))
+    assert not snapshot.covers(MONDAY - timedelta(days=1), MONDAY + timedelta(days=7))
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / 'broken.bin'
+    path.write_bytes(b'not a snapshot' * 10)
+    with pytest.raises(ValueError):
+        CalendarSnapshot(path, BERLIN.tz)
@@ -0,0 +1,205 @@
+import pytest
+import requests
+import threading
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from sqlalchemy import text
+from types import SimpleNamespace
+import app
+from app.core.calendar.sync import CalendarSync
+from app.models.calendar_events import CalendarEvent, CalendarSyncState
+from app.utils.database import Database
+from benchmarks.caldav_server import StandInCalendar, StandInServer, generate_events
+
+FIRST_DAY = date(2026, 10, 19)
+
+class RecordingSession(requests.Session):
+    """HTTP session that remembers the method and body of every request."""
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, kwargs.get('data') or b''))
+        return super().request(method, url, **kwargs)
+
+    def reports(self, kind):
+        return [body for method, body in self.requests if method == 'REPORT' and kind in body]
+
+class FakeClient:
+    """The attributes of a caldav.DAVClient that the sync engine uses."""
+    def __init__(self):
+        self.session = RecordingSession()
+        self.headers = {}
+        self.auth = None
+        self.username = None
+        self.password = None
+        self.timeout = 10
+        self.ssl_verify_cert = True
+
+class FakeCalendar:
+    """A caldav.Calendar backed by the stand-in server, its ctag is the revision."""
+    def __init__(self, server):
+        self.server = server
+        self.url = server.calendar_url
+        self.client = FakeClient()
+
+    def get_property(self, prop):
+        return str(self.server.calendar.revision)
+
+    def event_by_url(self, href):
+        resource = self.server.calendar.get(href.rsplit('/', 1)[-1])
+        return SimpleNamespace(data=resource.ical)
+
+@pytest.fixture
+def server():
+    calendar = StandInCalendar()
+    calendar.put_many(generate_events(5, FIRST_DAY, recurring_ratio=0))
+    with StandInServer(calendar) as server:
+        yield server
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(SimpleNamespace(database_url=f"sqlite:///{tmp_path / 'mirror.db'}"))
+    db.create_tables()
+    return db
+
+@pytest.fixture
+def calendar(server):
+    return FakeCalendar(server)
+
+def mirrored(db):
+    with db.get_session() as session:
+        return dict(session.query(CalendarEvent.href, CalendarEvent.title))
+
+def rename(server, name, title):
+    resource = server.calendar.get(name)
+    old_title = next(line for line in resource.ical.split("\r\n") if line.startswith("SUMMARY:"))
+    server.calendar.put(name, resource.ical.replace(old_title, f"SUMMARY:{title}"))
+
+def test_unchanged_ctag_skips_the_fetch(calendar, db):
+    sync = CalendarSync(calendar, db)
+    assert sync.sync()
+    assert len(mirrored(db)) == 5
+
+    calendar.client.session.requests.clear()
+    assert not sync.sync()
+    assert calendar.client.session.requests == []
+
+def test_sync_token_applies_additions_changes_and_deletions(server, calendar, db):
+    sync = CalendarSync(calendar, db)
+    sync.sync()
+    name, ical = next(generate_events(1, FIRST_DAY, seed=1))
+    server.calendar.put("new.ics", ical.replace("bench-0", "bench-new"))
+    rename(server, "bench-1.ics", "Umbenannt")
+    server.calendar.delete("bench-2.ics")
+
+    calendar.client.session.requests.clear()
+    assert sync.sync()
+
+    titles = {href.rsplit('/', 1)[-1]: title for href, title in mirrored(db).items()}
+    assert "new.ics" in titles and "bench-2.ics" not in titles
+    assert titles["bench-1.ics"] == "Umbenannt"
+    assert len(titles) == 5
+    # One incremental REPORT carrying the token of the first sync
+    reports = calendar.client.session.reports(b"sync-collection")
+    assert len(reports) == 1 and b"/sync/5<" in reports[0]
+
+def test_rejected_sync_token_falls_back_to_full_refresh(server, calendar, db):
+    sync = CalendarSync(calendar, db)
+    sync.sync()
+    with db.get_session() as session:
+        session.query(CalendarSyncState).one().sync_token = "http://standin.invalid/sync/expired"
+    rename(server, "bench-3.ics", "Nach Neustart")
+    server.calendar.delete("bench-4.ics")
+
+    assert sync.sync()
+
+    titles = {href.rsplit('/', 1)[-1]: title for href, title in mirrored(db).items()}
+    assert titles["bench-3.ics"] == "Nach Neustart"
+    assert "bench-4.ics" not in titles
+    # The unchanged events were not downloaded again
+    assert len(calendar.client.session.reports(b"calendar-multiget")) == 1
+    with db.get_session() as session:
+        assert session.query(CalendarSyncState).one().sync_token == server.calendar.sync_token
+
+def test_multiget_requests_are_split_into_batches(server, calendar, db):
+    sync = CalendarSync(calendar, db, multiget_batch_size=2)
+    sync.sync()
+    for index in range(5):
+        rename(server, f"bench-{index}.ics", f"Neu {index}")
+
+    calendar.client.session.requests.clear()
+    assert sync.sync(full=True)
+
+    batches = calendar.client.session.reports(b"calendar-multiget")
+    assert [batch.count(b"<D:href>") for batch in batches] == [2, 2, 1]
+    assert sorted(mirrored(db).values()) == [f"Neu {index}" for index in range(5)]
+
+def test_concurrent_syncs_apply_a_change_once(server, calendar, db):
+    sync = CalendarSync(calendar, db)
+    sync.sync()
+    rename(server, "bench-1.ics", "Gleichzeitig")
+    server.calendar.put("new.ics", next(generate_events(1, FIRST_DAY, seed=1))[1].replace("bench-0", "bench-new"))
+
+    calendar.client.session.requests.clear()
+    results, errors = [], []
+    start = threading.Barrier(2)
+
+    def run():
+        start.wait()
+        try:
+            results.append(sync.sync())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert errors == []
+    # The second sync waits and then finds the ctag unchanged
+    assert sorted(results) == [False, True]
+    assert len(calendar.client.session.reports(b"sync-collection")) == 1
+    titles = {href.rsplit('/', 1)[-1]: title for href, title in mirrored(db).items()}
+    assert titles["bench-1.ics"] == "Gleichzeitig" and "new.ics" in titles
+
+def migrate(url, revision):
+    config = AlembicConfig()
+    config.set_main_option('script_location', str(Path(app.__file__).parent / 'database' / 'migrations'))
+    config.set_main_option('sqlalchemy.url', url)
+    command.upgrade(config, revision)
+    return config
+
+def test_sync_into_a_migrated_database(tmp_path, calendar):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    migrate(url, 'e9342aeb5a83')
+    db = Database(SimpleNamespace(database_url=url))
+    with db.engine.begin() as connection:
+        connection.execute(text("INSERT INTO jobs (id, name, type, status) VALUES (1, 'Import', 'calendar', 'done')"))
+        connection.execute(text(
+            "INSERT INTO calendar_events (job_id, event_date, event_summary, event_location) "
+            "VALUES (1, '2026-10-01', 'Altes Konzert', 'Saal')"
+        ))
+    # The mirror needs the columns added up to the event sequence
+    config = migrate(url, '7d2e4a6c8b13')
+
+    with db.get_session() as session:
+        legacy = session.query(CalendarEvent).filter(CalendarEvent.href.is_(None)).one()
+        assert (legacy.title, legacy.location, legacy.start_time) == ('Altes Konzert', 'Saal', datetime(2026, 10, 1))
+
+    resource = calendar.server.calendar.get("bench-0.ics")
+    calendar.server.calendar.put("bench-0.ics", resource.ical.replace("\r\nSUMMARY:", "\r\nLOCATION:Keller\r\nSUMMARY:"))
+    sync = CalendarSync(calendar, db)
+    assert sync.sync()
+    assert len(mirrored(db)) == 6
+    with db.get_session() as session:
+        assert session.query(CalendarEvent.location).filter(CalendarEvent.href.endswith("bench-0.ics")).scalar() == 'Keller'
+
+    command.downgrade(config, 'e9342aeb5a83')
+    with db.engine.connect() as connection:
+        assert connection.execute(text("SELECT event_summary, event_location FROM calendar_events")).all() == [('Altes Konzert', 'Saal')]
@@ -0,0 +1,27 @@
+import pytest
+from app.core.polls.tally import VoteTally
+
+def test_rebuild_from_raw_votes():
+    tally = VoteTally.from_votes([1, 2, 3], [1, 3, 3])
+    assert tally.counts() == {1: 1, 2: 0, 3: 2}
+    assert tally.total == 3
+
+def test_votes_changes_and_retractions():
+    tally = VoteTally([1, 2])
+    assert tally.add(1) == 1
+    assert tally.add(1) == 2
+    assert tally.move(1, 2) == (1, 1)
+    assert tally.counts() == {1: 1, 2: 1}
+    assert tally.remove(2) == 0
+    assert tally.total == 1
+
+def test_invalid_updates_leave_counts_untouched():
+    tally = VoteTally.from_votes([1, 2], [1])
+    with pytest.raises(KeyError):
+        tally.add(9)
+    with pytest.raises(ValueError):
+        tally.remove(2)
+    with pytest.raises(KeyError):
+        tally.move(1, 9)
+    assert tally.counts() == {1: 1, 2: 0}
+    assert 1 in tally and 9 not in tally
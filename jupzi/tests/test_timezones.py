@@ -0,0 +1,36 @@
+import pytest
+from datetime import date, datetime, timezone
+from app.core.calendar.timezones import LocalTimezone, get_timezone
+
+@pytest.mark.parametrize('backend', ['zoneinfo', 'pytz'])
+def test_zones_are_resolved_once(backend):
+    assert get_timezone('Europe/Berlin', backend) is get_timezone('Europe/Berlin', backend)
+
+@pytest.mark.parametrize('backend', ['zoneinfo', 'pytz'])
+def test_localize_handles_dst(backend):
+    local = LocalTimezone('Europe/Berlin', backend)
+    summer = local.localize(datetime(2026, 7, 1, 12))
+    winter = local.localize(datetime(2026, 12, 1, 12))
+    assert summer.utcoffset().total_seconds() == 7200
+    assert winter.utcoffset().total_seconds() == 3600
+    aware = local.localize(datetime(2026, 7, 1, 10, tzinfo=timezone.utc))
+    assert aware.hour == 12
+
+@pytest.mark.parametrize('backend', ['zoneinfo', 'pytz'])
+def test_localize_many_matches_localize(backend):
+    local = LocalTimezone('Europe/Berlin', backend)
+    values = [
+        datetime(2026, 3, 29, 1), datetime(2026, 3, 29, 3),
+        datetime(2026, 3, 29, 1), datetime(2026, 10, 25, 12, tzinfo=timezone.utc)
+    ]
+    localized = local.localize_many(values)
+    assert localized == [local.localize(value) for value in values]
+    assert [value.tzinfo is not None for value in localized] == [True] * 4
+    # Equal values are converted once
+    assert localized[0] is localized[2]
+
+def test_start_of_day_is_cached():
+    local = LocalTimezone('Europe/Berlin', max_days=2)
+    midnight = local.start_of_day(date(2026, 10, 25))
+    assert (midnight.hour, midnight.utcoffset().total_seconds()) == (0, 7200)
+    assert local.start_of_day(date(2026, 10, 25)) is midnight
@@ -0,0 +1,113 @@
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from app.core.calendar.window_cache import CalendarWindowCache
+
+DAY = datetime(2026, 10, 19)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def day(offset):
+    return DAY + timedelta(days=offset)
+
+def make_loader(calls):
+    def loader(start, end):
+        calls.append((start, end))
+        return [(day(i), day(i) + timedelta(hours=2)) for i in range(30) if start <= day(i) < end]
+    return loader
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cache(clock):
+    return CalendarWindowCache(
+        ttl=60,
+        span=lambda event: event,
+        widen=lambda start, end: (min(start, day(0)), max(end, day(21))),
+        clock=clock
+    )
+
+def test_sub_ranges_are_served_from_one_fetch(cache):
+    calls = []
+    loader = make_loader(calls)
+    assert len(cache.get(day(0), day(14), loader)) == 14
+    assert len(cache.get(day(7), day(14), loader)) == 7
+    assert calls == [(day(0), day(21))]
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+def test_ttl_expiry_refetches(cache, clock):
+    calls = []
+    loader = make_loader(calls)
+    cache.get(day(0), day(14), loader)
+    clock.now = 61
+    cache.get(day(0), day(14), loader)
+    assert len(calls) == 2
+
+def test_invalidate_refetches(cache):
+    calls = []
+    loader = make_loader(calls)
+    cache.get(day(0), day(14), loader)
+    cache.invalidate()
+    cache.get(day(0), day(14), loader)
+    assert len(calls) == 2
+    assert cache.stats()['invalidations'] == 1
+
+def test_concurrent_misses_share_one_fetch(cache):
+    calls = []
+    release = threading.Event()
+    results = []
+
+    def slow_loader(start, end):
+        calls.append((start, end))
+        release.wait(5)
+        return [(day(1), day(2))]
+
+    def worker():
+        results.append(cache.get(day(0), day(7), slow_loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()['coalesced'] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [[(day(1), day(2))]] * 4
+
+def test_failed_fetch_is_not_cached(cache):
+    def failing_loader(start, end):
+        raise RuntimeError("server down")
+
+    with pytest.raises(RuntimeError):
+        cache.get(day(0), day(7), failing_loader)
+    calls = []
+    cache.get(day(0), day(7), make_loader(calls))
+    assert len(calls) == 1
+
+def test_stale_serves_last_good_window(cache, clock):
+    loader = make_loader([])
+    assert cache.stale(day(0), day(7)) is None
+    cache.get(day(0), day(7), loader)
+
+    clock.now = 120
+    cache.invalidate()
+    events, age = cache.stale(day(0), day(7))
+    assert len(events) == 7 and age == 120
+
+    # Stale windows are never served as fresh
+    calls = []
+    cache.get(day(0), day(7), make_loader(calls))
+    assert calls == [(day(0), day(21))]
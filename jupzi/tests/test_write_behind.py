@@ -0,0 +1,76 @@
+import threading
+import pytest
+from app.core.polls.write_behind import WriteBehindBuffer
+
+def test_later_writes_replace_pending_ones():
+    batches = []
+    buffer = WriteBehindBuffer(batches.append)
+    buffer.put(('answer', 1, 10), [1])
+    buffer.put(('answer', 1, 10), [2])
+    buffer.put(('answer', 1, 11), [])
+    assert buffer.flush() == 2
+    assert batches == [{('answer', 1, 10): [2], ('answer', 1, 11): []}]
+    assert buffer.flush() == 0
+
+def test_failed_batch_is_queued_again_behind_newer_writes():
+    written, down = [], [True]
+
+    def writer(batch):
+        if down[0]:
+            raise ConnectionError("database down")
+        written.append(batch)
+
+    buffer = WriteBehindBuffer(writer)
+    buffer.put('a', 1)
+    buffer.put('b', 1)
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+    assert len(buffer) == 2
+
+    down[0] = False
+    buffer.put('a', 2)
+    buffer.flush()
+    assert written == [{'a': 2, 'b': 1}]
+
+def test_size_threshold_flushes_in_background_and_stop_flushes_rest():
+    flushed = threading.Event()
+    batches = []
+
+    def writer(batch):
+        batches.append(batch)
+        flushed.set()
+
+    buffer = WriteBehindBuffer(writer, flush_interval=60, max_pending=3)
+    buffer.start()
+    for key in range(3):
+        buffer.put(key, key)
+    assert flushed.wait(5)
+    buffer.put('last', 0)
+    buffer.stop()
+    assert batches == [{0: 0, 1: 1, 2: 2}, {'last': 0}]
+
+def test_concurrent_flushes_write_one_batch_at_a_time():
+    batches, writing, release = [], threading.Event(), threading.Event()
+
+    def writer(batch):
+        batches.append(batch)
+        writing.set()
+        assert release.wait(5)
+
+    buffer = WriteBehindBuffer(writer)
+    buffer.put('a', 1)
+    first = threading.Thread(target=buffer.flush)
+    first.start()
+    assert writing.wait(5)
+
+    # The newer value waits for the older batch instead of overtaking it
+    buffer.put('a', 2)
+    second = threading.Thread(target=buffer.flush)
+    second.start()
+    second.join(0.2)
+    assert batches == [{'a': 1}]
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert batches == [{'a': 1}, {'a': 2}]